@@ -0,0 +1,141 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2026, NetApp, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+""" Support functions for NetApp ansible modules
+
+    Collects call counts, bytes sent and received, and latencies for REST and ZAPI calls,
+    as well as the number of job polls and the time spent waiting between polls.
+    The counters are reported in the module result when the collect_metrics feature flag is set.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import re
+import threading
+
+# upper bounds in seconds for the latency histogram buckets, slower calls are counted in +Inf
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+UUID_RE = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+
+def get_endpoint(api):
+    ''' storage/volumes/<uuid>/snapshots?fields=name -> storage/volumes/{uuid}/snapshots
+        so that calls for different resources are counted together
+    '''
+    return UUID_RE.sub('{uuid}', api.split('?')[0].strip('/'))
+
+
+def get_size(data):
+    ''' number of bytes for a request or response body, a dict is measured as JSON '''
+    if data is None:
+        return 0
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    try:
+        return len(json.dumps(data))
+    except (TypeError, ValueError):
+        return 0
+
+
+def get_bucket(elapsed):
+    for bound in LATENCY_BUCKETS:
+        if elapsed <= bound:
+            return str(bound)
+    return '+Inf'
+
+
+class ApiMetrics(object):
+    ''' counters for the calls sent by a task, per API family (rest or zapi) and per endpoint
+        calls may be sent from several threads, updates are protected with a lock.
+    '''
+    def __init__(self):
+        self.enabled = False
+        self.module = None
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.families = {}
+        self.jobs = dict(waits=0, polls=0, sleep_time=0.0)
+
+    def configure(self, enabled, module):
+        ''' counters are reset when a new module starts collecting '''
+        self.enabled = enabled
+        if enabled and module is not self.module:
+            self.module = module
+            self.reset()
+
+    def _get_family(self, family):
+        if family not in self.families:
+            self.families[family] = dict(
+                calls=0, errors=0, cache_hits=0, bytes_out=0, bytes_in=0, elapsed=0.0,
+                latency_histogram=dict((bucket, 0) for bucket in [str(bound) for bound in LATENCY_BUCKETS] + ['+Inf']),
+                endpoints={})
+        return self.families[family]
+
+    def record_call(self, family, method, api, elapsed, bytes_out, bytes_in, error):
+        ''' method is None for ZAPI, api is the ZAPI name '''
+        key = get_endpoint(api) if method is None else '%s %s' % (method, get_endpoint(api))
+        with self.lock:
+            stats = self._get_family(family)
+            endpoint = stats['endpoints'].setdefault(key, dict(calls=0, errors=0, bytes_out=0, bytes_in=0, elapsed=0.0, max_elapsed=0.0))
+            for counters in stats, endpoint:
+                counters['calls'] += 1
+                counters['errors'] += 1 if error else 0
+                counters['bytes_out'] += bytes_out
+                counters['bytes_in'] += bytes_in
+                counters['elapsed'] += elapsed
+            endpoint['max_elapsed'] = max(endpoint['max_elapsed'], elapsed)
+            stats['latency_histogram'][get_bucket(elapsed)] += 1
+
+    def record_cache_hit(self, family):
+        with self.lock:
+            self._get_family(family)['cache_hits'] += 1
+
+    def record_job_wait(self, polls, sleep_time):
+        with self.lock:
+            self.jobs['waits'] += 1
+            self.jobs['polls'] += polls
+            self.jobs['sleep_time'] += sleep_time
+
+    def report(self):
+        ''' return a copy of the counters, with times rounded to the millisecond '''
+        def round_times(counters):
+            return dict((key, round(value, 3) if key in ('elapsed', 'max_elapsed', 'sleep_time') else value) for key, value in counters.items())
+
+        with self.lock:
+            report = {}
+            for family, stats in self.families.items():
+                report[family] = round_times(stats)
+                report[family]['latency_histogram'] = dict(stats['latency_histogram'])
+                report[family]['endpoints'] = dict((key, round_times(endpoint)) for key, endpoint in stats['endpoints'].items())
+            report['jobs'] = round_times(self.jobs)
+        return report
@@ -36,13 +36,23 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import base64
+from collections import deque
+import errno
+import io
 import json
 import logging
 import os
+import select
 import ssl
+import threading
 import time
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils._text import to_native
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.parse import urlparse
+from ansible_collections.netapp.ontap.plugins.module_utils import metrics
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_cache
+from ansible_collections.netapp.ontap.plugins.module_utils import tracing
 
 try:
     from ansible.module_utils.ansible_release import __version__ as ANSIBLE_VERSION
@@ -114,7 +124,16 @@ ERROR_MSG = dict(
 )
 
 LOG = logging.getLogger(__name__)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.ansible', 'netapp_ontap_cache')
 LOG_FILE = '/tmp/ontap_apis.log'
+# one requests session per host, shared by all OntapRestAPI instances
+REST_SESSIONS = {}
+# one kept-alive HTTP connection per host and credentials, shared by all OntapZAPICx instances
+ZAPI_CONNECTIONS = {}
+# REST and ZAPI call counters for the current task, only updated when collect_metrics is set
+METRICS = metrics.ApiMetrics()
+# spans for REST and ZAPI calls and module phases, only recorded when trace_spans_file is set
+TRACER = tracing.SpanTracer()
 ZAPI_DEPRECATION_MESSAGE = "The 'netapp-lib' library is no longer maintained. Proceed at your own risk.  "\
                            "While the original deprecation date has been deferred due to continued consumer usage and feedback,  "\
                            "ONTAPI (ZAPI) are considered legacy.  "\
@@ -247,7 +266,25 @@ def get_feature(module, feature_name):
         svm_allowable_protocols_zapi=['cifs', 'fcp', 'iscsi', 'nvme', 'nfs', 'ndmp', 'http'],
         max_files_change_threshold=1,           # percentage of increase/decrease required to trigger a modify action
         warn_or_fail_on_fabricpool_backend_change='fail',
-        no_cserver_ems=False                    # when True, don't attempt to find cserver and don't send cserver EMS
+        no_cserver_ems=False,                   # when True, don't attempt to find cserver and don't send cserver EMS
+        rest_session=True,                      # when true, reuse a pooled requests session for all REST calls to a host
+        rest_keep_alive=True,                   # when false, ask ONTAP to close the connection after each REST call
+        rest_pool_maxsize=10,                   # maximum number of connections kept open in the pool for a host
+        rest_max_retries=0,                     # number of retries on connection errors, for idempotent methods
+        zapi_keep_alive=True,                   # when true, reuse a kept-alive connection for all ZAPI calls to a host
+        debug_buffer_size=None,                 # number of REST debug records kept in memory, defaults to 100 with trace_apis, 0 otherwise
+        job_poll_policy='adaptive',             # adaptive: short first poll, then double the delay up to the increment.  fixed: always use increment
+                                                # long_poll: ONTAP holds each GET for the job until it completes or return_timeout expires
+        job_poll_initial_interval=0.1,          # first delay in seconds between two polls of a job status, with the adaptive policy
+        rest_cache_dir=None,                    # when set, cache REST GET responses in this directory, shared across tasks
+                                                # cached responses are only used once ONTAP accepted the credentials in the task
+        rest_cache_ttls={'cluster': 300, 'svm/svms': 300},    # TTL in seconds for each cached API, other APIs are not cached
+        ontap_version_cache_ttl=0,              # when > 0, persist the ONTAP version for this many seconds, later tasks skip the version probe
+        collect_metrics=False,                  # when true, report call counts, bytes, latencies, and job polls in a metrics dict in the module result
+        concurrent_jobs=False,                  # when true, some modules send independent asynchronous requests together, and poll their jobs together
+        trace_spans_file=None,                  # when set, append spans for REST and ZAPI calls, job waits, and module phases to this file, in OTLP/JSON format
+        lif_migrate_initial_interval=None,      # when set, first delay in seconds before checking a LIF migration, then double it up to 10 seconds
+        snapmirror_wait_initial_interval=None,  # when set, first delay in seconds before checking a SnapMirror state, then double it up to 10 or 30 seconds
     )
 
     if module.params['feature_flags'] is not None and feature_name in module.params['feature_flags']:
@@ -401,6 +438,8 @@ def setup_na_ontap_zapi(module, vserver=None, wrap_zapi=False, host_options=None
     if trace:
         logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG, format='%(asctime)s %(levelname)-8s %(message)s')
     wrap_zapi |= has_feature(module, 'always_wrap_zapi')
+    METRICS.configure(has_feature(module, 'collect_metrics'), module)
+    TRACER.configure(get_feature(module, 'trace_spans_file'), module)
     auth_method = set_auth_method(module, username, password, cert_filepath, key_filepath)
 
     if not HAS_NETAPP_LIB:
@@ -435,6 +474,16 @@ def setup_na_ontap_zapi(module, vserver=None, wrap_zapi=False, host_options=None
     return server
 
 
+def create_debug_buffer(module):
+    ''' debug records are only kept when trace_apis is set, or debug_buffer_size is greater than 0
+        older records are dropped, so that memory usage does not grow with the number of requests
+    '''
+    size = get_feature(module, 'debug_buffer_size')
+    if size is None:
+        size = 100 if has_feature(module, 'trace_apis') else 0
+    return deque(maxlen=max(size, 0))
+
+
 def is_zapi_connection_error(message):
     ''' return True if it is a connection issue '''
     # netapp-lib message may contain a tuple or a str!
@@ -536,10 +585,88 @@ def generate_result(changed, actions=None, modify=None, response=None, extra_res
         result['actions'] = actions
     if extra_responses:
         result.update(extra_responses)
+    return add_metrics(result)
+
+
+def add_metrics(result):
+    ''' add the metrics dict to a module result, when the collect_metrics feature flag is set '''
+    if METRICS.enabled:
+        result['metrics'] = METRICS.report()
     return result
 
 
 if HAS_NETAPP_LIB:
+    class ZAPIKeepAliveOpener(object):
+        ''' replacement for the urllib opener used by netapp-lib, keeping the HTTP/1.1 connection open between calls
+            connections are shared by all OntapZAPICx instances in the process, saving a TCP and TLS handshake per call.
+            Errors are reported as urllib errors, so that invoke_elem reports them in the same way.
+        '''
+        def __init__(self, key, create_context=None):
+            self.key = key
+            self.create_context = create_context
+
+        @staticmethod
+        def is_stale(connection):
+            ''' an idle connection is only readable if ONTAP closed it, or sent unexpected data '''
+            if connection.sock is None:
+                return False
+            try:
+                readable, dummy, dummy = select.select([connection.sock], [], [], 0)
+            except (OSError, ValueError, select.error):
+                return True
+            return bool(readable)
+
+        def get_connection(self, url, timeout):
+            connection = ZAPI_CONNECTIONS.get(self.key)
+            if connection is not None and self.is_stale(connection):
+                self.close_connection()
+                connection = None
+            if connection is not None:
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+            if url.scheme == 'https':
+                # without a certificate, use the default context, it may have been changed to skip certificate validation
+                context = self.create_context() if self.create_context else None
+                connection = http_client.HTTPSConnection(url.hostname, url.port, timeout=timeout, context=context)
+            else:
+                connection = http_client.HTTPConnection(url.hostname, url.port, timeout=timeout)
+            ZAPI_CONNECTIONS[self.key] = connection
+            return connection, False
+
+        def close_connection(self):
+            connection = ZAPI_CONNECTIONS.pop(self.key, None)
+            if connection is not None:
+                connection.close()
+
+        def open(self, request, timeout=None):
+            full_url = request.get_full_url()
+            url = urlparse(full_url)
+            while True:
+                connection, reused = self.get_connection(url, timeout)
+                try:
+                    connection.request('POST', url.path, body=request.data, headers=dict(request.header_items()))
+                except (http_client.HTTPException, IOError, OSError) as exc:
+                    self.close_connection()
+                    # ONTAP closed an idle connection, and the request could not be sent, send it again on a new connection
+                    if reused and getattr(exc, 'errno', None) in (errno.EPIPE, errno.ECONNRESET):
+                        continue
+                    raise zapi.urllib.error.URLError(exc)
+                try:
+                    response = connection.getresponse()
+                    body = response.read()
+                    break
+                except (http_client.HTTPException, IOError, OSError) as exc:
+                    # ONTAP may have received and processed the request, it is not safe to send it again
+                    self.close_connection()
+                    raise zapi.urllib.error.URLError(exc)
+            if response.will_close:
+                self.close_connection()
+            if response.status >= 400:
+                raise zapi.urllib.error.HTTPError(full_url, response.status, response.reason, response.msg, io.BytesIO(body))
+            return io.BytesIO(body)
+
     class OntapZAPICx(zapi.NaServer):
         ''' override zapi NaServer class to:
         - enable SSL certificate authentication
@@ -566,7 +693,7 @@ if HAS_NETAPP_LIB:
                 auth = '%s:%s' % (username, password)
                 self.base64_creds = base64.b64encode(auth.encode()).decode()
 
-        def _create_certificate_auth_handler(self):
+        def _create_certificate_context(self):
             try:
                 context = ssl.create_default_context()
             except AttributeError as exc:
@@ -580,7 +707,28 @@ if HAS_NETAPP_LIB:
             except IOError as exc:
                 self._fail_with_exc_info('Cannot load SSL certificate, check files exist.', exc)
 
-            return zapi.urllib.request.HTTPSHandler(context=context)
+            return context
+
+        def _create_certificate_auth_handler(self):
+            return zapi.urllib.request.HTTPSHandler(context=self._create_certificate_context())
+
+        def uses_proxy(self):
+            ''' urllib honors http_proxy, https_proxy, and no_proxy, a kept-alive connection does not '''
+            url = urlparse(self._get_url())
+            return url.scheme in zapi.urllib.request.getproxies() and not zapi.urllib.request.proxy_bypass(url.hostname)
+
+        def _build_opener(self):
+            ''' with classic basic authentication, urllib answers the 401 challenge, keep using it
+                keep using urllib as well when a proxy is configured for the host
+            '''
+            if not has_feature(self.module, 'zapi_keep_alive') or (self._auth_style == zapi.NaServer.STYLE_LOGIN_PASSWORD and self.base64_creds is None) \
+                    or self.uses_proxy():
+                return super(OntapZAPICx, self)._build_opener()
+            if self._auth_style == zapi.NaServer.STYLE_CERTIFICATE:
+                key = (self._get_url(), self.cert_filepath, self.key_filepath, self.validate_certs)
+                self._opener = ZAPIKeepAliveOpener(key, self._create_certificate_context)
+            else:
+                self._opener = ZAPIKeepAliveOpener((self._get_url(), None, None, None))
 
         def _fail_with_exc_info(self, arg0, exc):
             msg = arg0
@@ -630,8 +778,33 @@ if HAS_NETAPP_LIB:
                 request.add_header('Authorization', 'Basic %s' % self.base64_creds)
             return request, netapp_element
 
-        # as is from latest version of netapp-lib
+        @staticmethod
+        def record_metrics(start, na_element, request, response_xml, error):
+            ''' start is None when metrics are not collected '''
+            if start is not None:
+                METRICS.record_call('zapi', None, na_element.get_name(), time.time() - start,
+                                    metrics.get_size(request.data), metrics.get_size(response_xml), error)
+
         def invoke_elem(self, na_element, enable_tunneling=False):
+            """Invoke the API on the server, in a span when tracing is enabled."""
+            if not TRACER.enabled:
+                return self._invoke_elem(na_element, enable_tunneling)
+            name = na_element.get_name() if isinstance(na_element, zapi.NaElement) else None
+            with TRACER.span('ZAPI %s' % name, {'rpc.system': 'zapi', 'rpc.method': name}, kind=tracing.SPAN_KIND_CLIENT) as span:
+                sizes = {}
+                response_element = self._invoke_elem(na_element, enable_tunneling, sizes)
+                span.set_attributes({
+                    'ontap.bytes_out': sizes.get('bytes_out'),
+                    'ontap.bytes_in': sizes.get('bytes_in'),
+                    'ontap.num_records': response_element.get_child_content('num-records'),
+                    'zapi.status': response_element.get_attr('status'),
+                })
+                if response_element.get_attr('status') == 'failed':
+                    span.set_error(response_element.get_attr('reason'))
+            return response_element
+
+        # as is from latest version of netapp-lib, sizes is set to the number of bytes sent and received when present
+        def _invoke_elem(self, na_element, enable_tunneling=False, sizes=None):
             """Invoke the API on the server."""
             if not na_element or not isinstance(na_element, zapi.NaElement):
                 raise ValueError('NaElement must be supplied to invoke API')
@@ -645,14 +818,17 @@ if HAS_NETAPP_LIB:
             if not hasattr(self, '_opener') or not self._opener \
                     or self._refresh_conn:
                 self._build_opener()
+            start = time.time() if METRICS.enabled else None
             try:
                 if hasattr(self, '_timeout'):
                     response = self._opener.open(request, timeout=self._timeout)
                 else:
                     response = self._opener.open(request)
             except zapi.urllib.error.HTTPError as exc:
+                self.record_metrics(start, na_element, request, None, True)
                 raise zapi.NaApiError(exc.code, exc.reason)
             except zapi.urllib.error.URLError as exc:
+                self.record_metrics(start, na_element, request, None, True)
                 msg = 'URL error'
                 error = repr(exc)
                 try:
@@ -664,9 +840,13 @@ if HAS_NETAPP_LIB:
                     pass
                 raise zapi.NaApiError(msg, error)
             except Exception as exc:
+                self.record_metrics(start, na_element, request, None, True)
                 raise zapi.NaApiError('Unexpected error', repr(exc))
 
             response_xml = response.read()
+            self.record_metrics(start, na_element, request, response_xml, False)
+            if sizes is not None:
+                sizes.update(bytes_out=metrics.get_size(request.data), bytes_in=metrics.get_size(response_xml))
             response_element = self._get_result(response_xml)
 
             if self._trace:
@@ -677,9 +857,11 @@ if HAS_NETAPP_LIB:
 
 class OntapRestAPI(object):
     ''' wrapper to send requests to ONTAP REST APIs '''
-    def __init__(self, module, timeout=60, host_options=None):
+    def __init__(self, module, timeout=60, host_options=None, pool_maxsize=None):
         self.host_options = module.params if host_options is None else host_options
         self.module = module
+        # a module sending requests from several threads may need a larger pool than the rest_pool_maxsize default
+        self.pool_maxsize = pool_maxsize
         # either username/password or a certifcate with/without a key are used for authentication
         self.username = self.host_options.get('username')
         self.password = self.host_options.get('password')
@@ -705,13 +887,27 @@ class OntapRestAPI(object):
             valid=False
         )
         self.errors = []
-        self.debug_logs = []
+        self.debug_logs = create_debug_buffer(module)
+        # requests may be sent from several threads, each thread sees the headers for its own last response
+        self._thread_data = threading.local()
         self.auth_method = set_auth_method(self.module, self.username, self.password, self.cert_filepath, self.key_filepath)
         self.check_required_library()
+        self.use_session = has_feature(module, 'rest_session')
+        self.keep_alive = has_feature(module, 'rest_keep_alive')
+        cache_dir = get_feature(module, 'rest_cache_dir')
+        self.cache = rest_cache.RestResponseCache(cache_dir, self.url, self.get_cache_identity(), get_feature(module, 'rest_cache_ttls')) if cache_dir else None
+        # a cached response does not check the credentials, so the cache is only used once a request was authenticated
+        self.authenticated = False
+        version_cache_ttl = get_feature(module, 'ontap_version_cache_ttl')
+        self.version_cache = rest_cache.OntapVersionCache(cache_dir or DEFAULT_CACHE_DIR, version_cache_ttl) if version_cache_ttl > 0 else None
+        # set when the version is read from the cache, rather than from the cluster
+        self.cached_cluster_uuid = None
         if has_feature(module, 'trace_apis'):
             logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG, format='%(asctime)s %(levelname)-8s %(message)s')
         self.log_headers = has_feature(module, 'trace_headers')
         self.log_auth_args = has_feature(module, 'trace_auth_args')
+        METRICS.configure(has_feature(module, 'collect_metrics'), module)
+        TRACER.configure(get_feature(module, 'trace_spans_file'), module)
 
         # Initialize Lambda proxy if configured
         self.lambda_proxy = None
@@ -774,6 +970,21 @@ class OntapRestAPI(object):
         if not HAS_REQUESTS:
             self.module.fail_json(msg=missing_required_lib('requests'))
 
+    def get_session(self):
+        ''' return the requests session for this host, creating it if needed
+            connections are kept alive and reused across calls, saving a TCP and TLS handshake per call
+        '''
+        session = REST_SESSIONS.get(self.url)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                    pool_maxsize=max(get_feature(self.module, 'rest_pool_maxsize'), self.pool_maxsize or 0),
+                                                    max_retries=get_feature(self.module, 'rest_max_retries'))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            REST_SESSIONS[self.url] = session
+        return session
+
     def build_headers(self, accept=None, vserver_name=None, vserver_uuid=None):
         headers = {'X-Dot-Client-App': CLIENT_APP_VERSION % self.module._name}
         # accept is used to turn on/off HAL linking
@@ -786,12 +997,71 @@ class OntapRestAPI(object):
             headers['X-Dot-SVM-UUID'] = vserver_uuid
         return headers
 
+    def process_response_for_caches(self, method, api, params, headers, status_code, json_dict, error_details):
+        ''' update the response and version caches after a request was sent to ONTAP '''
+        if status_code is not None and status_code not in (401, 403):
+            self.authenticated = True
+        if self.cache is not None:
+            self.update_cache(method, api, params, headers, status_code, json_dict, error_details)
+        self.check_version_cache(method, api, status_code, json_dict)
+
+    def update_cache(self, method, api, params, headers, status_code, json_dict, error_details):
+        ''' save a successful GET response, or invalidate the collection after a POST, PATCH, or DELETE '''
+        if method == 'GET' and status_code == 200 and not error_details:
+            self.cache.put(api, params, headers, status_code, json_dict)
+        elif method in ('POST', 'PATCH', 'DELETE'):
+            self.cache.invalidate(api)
+
+    def get_cache_identity(self):
+        return self.username or self.cert_filepath
+
+    def check_version_cache(self, method, api, status_code, json_dict):
+        ''' forget the cached version when the credentials are rejected, or when the URL now reaches another cluster
+            so that the next task probes the cluster again
+        '''
+        if self.cached_cluster_uuid is None:
+            return
+        uuid = json_dict.get('uuid') if method == 'GET' and api.strip('/') == 'cluster' and isinstance(json_dict, dict) else None
+        if status_code in (401, 403) or uuid not in (None, self.cached_cluster_uuid):
+            self.log_debug('cached', 'removing ONTAP version for %s' % self.url)
+            self.version_cache.invalidate(self.url, self.get_cache_identity())
+            self.cached_cluster_uuid = None
+
     def send_request(self, method, api, params, json=None, headers=None, files=None):
         ''' send http request and process reponse, including error conditions '''
+        if not TRACER.enabled:
+            return self._send_request_or_get_cached(method, api, params, json, headers, files)
+        attributes = {'http.request.method': method, 'url.path': api, 'ontap.bytes_out': metrics.get_size(json)}
+        with TRACER.span('%s %s' % (method, metrics.get_endpoint(api)), attributes, kind=tracing.SPAN_KIND_CLIENT) as span:
+            sizes = {}
+            status_code, json_dict, error_details = self._send_request_or_get_cached(method, api, params, json, headers, files, sizes)
+            span.set_attributes({
+                'http.response.status_code': status_code,
+                'ontap.bytes_in': sizes.get('bytes_in'),
+                'ontap.num_records': json_dict.get('num_records') if isinstance(json_dict, dict) else None,
+            })
+            if error_details:
+                span.set_error(error_details)
+        return status_code, json_dict, error_details
+
+    def _send_request_or_get_cached(self, method, api, params, json, headers, files, sizes=None):
+        if self.cache is not None and method == 'GET' and self.authenticated:
+            cached = self.cache.get(api, params, headers)
+            if cached is not None:
+                if METRICS.enabled:
+                    METRICS.record_cache_hit('rest')
+                if self.is_debug_enabled():
+                    self.log_debug('cached', repr(dict(method=method, api=api, params=params)))
+                return cached
+
         if self.lambda_proxy:
+            start = time.time() if METRICS.enabled else None
             status_code, json_dict, error_details = self.lambda_proxy._send_request(method, api, params, json, headers, files)
+            if start is not None:
+                METRICS.record_call('rest', method, api, time.time() - start, metrics.get_size(json), metrics.get_size(json_dict), error_details)
             self.log_debug("proxy:", status_code)
             self.log_debug("json_dict:", json_dict)
+            self.process_response_for_caches(method, api, params, headers, status_code, json_dict, error_details)
             return status_code, json_dict, error_details
 
         def get_auth_args():
@@ -821,17 +1091,21 @@ class OntapRestAPI(object):
             return kwargs
 
         url = self.url + api
-        status_code, json_dict, error_details = self._send_request(method, url, params, json, headers, files, get_auth_args())
+        status_code, json_dict, error_details = self._send_request(method, url, params, json, headers, files, get_auth_args(), sizes)
+        self.process_response_for_caches(method, api, params, headers, status_code, json_dict, error_details)
 
         return status_code, json_dict, error_details
 
-    def _send_request(self, method, url, params, json, headers, files, auth_args):
+    def _send_request(self, method, url, params, json, headers, files, auth_args, sizes=None):
         status_code = None
         json_dict = None
         json_error = None
         error_details = None
+        self.last_response_headers = None
         if headers is None:
             headers = self.build_headers()
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
 
         # Handles authentication headers from auth_args
         if 'headers' in auth_args:
@@ -859,14 +1133,19 @@ class OntapRestAPI(object):
                 return None, None
             return json, json.get('error')
 
-        self.log_debug('sending', repr(dict(method=method, url=url, verify=self.verify, params=params,
-                                            timeout=self.timeout, json=json,
-                                            headers=headers if self.log_headers else 'redacted',
-                                            auth_args=auth_args if self.log_auth_args else 'redacted')))
+        if self.is_debug_enabled():
+            self.log_debug('sending', repr(dict(method=method, url=url, verify=self.verify, params=params,
+                                                timeout=self.timeout, json=json,
+                                                headers=headers if self.log_headers else 'redacted',
+                                                auth_args=auth_args if self.log_auth_args else 'redacted')))
+        start = time.time() if METRICS.enabled else None
+        response = None
         try:
-            response = requests.request(method, url, verify=self.verify, params=params,
-                                        timeout=self.timeout, json=json, headers=headers, files=files, **auth_args)
+            request = self.get_session().request if self.use_session else requests.request
+            response = request(method, url, verify=self.verify, params=params,
+                               timeout=self.timeout, json=json, headers=headers, files=files, **auth_args)
             status_code = response.status_code
+            self.last_response_headers = response.headers
             self.log_debug(status_code, response.content)
             # If the response was successful, no Exception will be raised
             response.raise_for_status()
@@ -898,6 +1177,11 @@ class OntapRestAPI(object):
                 json_dict['Allow'] = response.headers.get('Allow')
             if response.headers.get('Content-Type', '').startswith("multipart/form-data"):
                 json_dict['text'] = response.text
+        if start is not None:
+            METRICS.record_call('rest', method, url[len(self.url):] if url.startswith(self.url) else url, time.time() - start,
+                                metrics.get_size(json), metrics.get_size(getattr(response, 'content', None)), error_details)
+        if sizes is not None and response is not None:
+            sizes['bytes_in'] = metrics.get_size(getattr(response, 'content', None))
         return status_code, json_dict, error_details
 
     def _is_job_done(self, job_json, job_state, job_error, timed_out):
@@ -939,7 +1223,62 @@ class OntapRestAPI(object):
             done = True
         return done, message, error
 
+    @property
+    def last_response_headers(self):
+        return getattr(self._thread_data, 'last_response_headers', None)
+
+    @last_response_headers.setter
+    def last_response_headers(self, headers):
+        self._thread_data.last_response_headers = headers
+
+    def get_retry_after(self):
+        ''' return the delay in seconds requested by ONTAP in the Retry-After header of the last response, or None '''
+        try:
+            return max(float(self.last_response_headers.get('Retry-After')), 0)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def get_capped_retry_after(self, increment, remaining):
+        ''' return the Retry-After delay, capped to increment and to the remaining time, or None
+            a zero delay would poll in a tight loop without ever reaching the timeout, so it is ignored
+        '''
+        delay = self.get_retry_after()
+        if delay is None:
+            return None
+        return min(delay, increment, max(remaining, 0)) or None
+
+    def get_job_poll_intervals(self, increment):
+        ''' yield the delays between two polls of a job status
+            adaptive: start with a short delay, then double it until it reaches increment
+            fixed: always use increment
+            long_poll: same as adaptive, only used when ONTAP does not hold the request
+        '''
+        policy = get_feature(self.module, 'job_poll_policy')
+        if policy not in ('adaptive', 'fixed', 'long_poll'):
+            self.module.fail_json(msg="Error: unexpected value for feature flag job_poll_policy, expecting adaptive, fixed, or long_poll, got: %s" % policy)
+        interval = increment if policy == 'fixed' else min(get_feature(self.module, 'job_poll_initial_interval'), increment)
+        while True:
+            yield interval
+            interval = min(interval * 2, increment)
+
     def wait_on_job(self, job, timeout=600, increment=60):
+        if not TRACER.enabled:
+            return self._wait_on_job(job, timeout, increment)
+        job_uuid = job.get('uuid') if isinstance(job, dict) else None
+        with TRACER.span('wait_on_job', {'ontap.job_uuid': job_uuid, 'ontap.job_timeout': timeout}) as span:
+            message, error = self._wait_on_job(job, timeout, increment)
+            if error:
+                span.set_error(error)
+        return message, error
+
+    def get_job_long_poll_query(self, remaining):
+        ''' ask ONTAP to hold the GET request until the job completes, or return_timeout expires
+            ONTAP accepts up to 120 seconds, and the response must be received before the HTTP request times out
+        '''
+        return_timeout = int(min(remaining, 120, self.timeout - 5))
+        return {'return_timeout': max(return_timeout, 1), 'fields': 'state,message,code,error'}
+
+    def _wait_on_job(self, job, timeout, increment):
         try:
             url = job['_links']['self']['href'].split('api/')[1]
         except Exception as err:
@@ -961,9 +1300,23 @@ class OntapRestAPI(object):
         retries = 0
         max_retries = 3
         done = False
+        polls = 0
+        slept = 0
+        intervals = self.get_job_poll_intervals(increment)
+        long_poll = get_feature(self.module, 'job_poll_policy') == 'long_poll'
         while not done:
-            # Will run every <increment> seconds for <timeout> seconds
-            job_json, job_error = self.get(url, None)
+            # Will run every <increment> seconds, or with an increasing delay up to <increment> seconds, for <timeout> seconds
+            # With long_poll, ONTAP waits for the job to complete before answering, and the elapsed time is used for the timeout
+            query = self.get_job_long_poll_query(timeout - runtime) if long_poll else None
+            start = time.time() if long_poll else None
+            job_json, job_error = self.get(url, query)
+            polls += 1
+            held = False
+            if long_poll:
+                elapsed = time.time() - start
+                runtime += elapsed
+                # if the request returned early with a running job, ONTAP did not hold it, fall back to sleeping
+                held = elapsed >= query['return_timeout'] / 2.0
             job_state = job_json.get('state', None) if job_json else None
             # ignore error if status is provided in the job
             if job_error and job_state is None:
@@ -977,8 +1330,20 @@ class OntapRestAPI(object):
                 retries = 0
                 done, message, error = self._is_job_done(job_json, job_state, job_error, runtime >= timeout)
             if not done:
-                time.sleep(increment)
-                runtime += increment
+                # honor Retry-After if ONTAP is asking us to back off, but never sleep past the increment or the timeout
+                delay = self.get_capped_retry_after(increment, timeout - runtime)
+                if retries:
+                    # the job status could not be read, give ONTAP as much time to recover as with the fixed policy
+                    delay = max(delay or 0, increment)
+                elif delay is None and held:
+                    continue
+                elif delay is None:
+                    delay = next(intervals)
+                time.sleep(delay)
+                runtime += delay
+                slept += delay
+        if METRICS.enabled:
+            METRICS.record_job_wait(polls, slept)
         return message, error
 
     def get(self, api, params=None, headers=None):
@@ -1093,11 +1458,20 @@ class OntapRestAPI(object):
         # and we need the version as some REST options are not available in earlier versions
         method = 'GET'
         api = 'cluster'
+        fields = ['version', 'uuid'] if self.version_cache is not None else ['version']
         if should_use_lambda(self.module):
-            params = {'fields': 'version'}
+            params = {'fields': ','.join(fields)}
         else:
-            params = {'fields': ['version']}
-        status_code, message, error = self.send_request(method, api, params=params)
+            params = {'fields': fields}
+        message = self.version_cache.get(self.url, self.get_cache_identity()) if self.version_cache is not None else None
+        if message is not None:
+            self.log_debug('cached', 'ONTAP version for %s' % self.url)
+            status_code, error = 200, None
+            self.cached_cluster_uuid = message.get('uuid')
+        else:
+            status_code, message, error = self.send_request(method, api, params=params)
+            if self.version_cache is not None and status_code == 200 and not error:
+                self.version_cache.put(self.url, message, self.get_cache_identity())
         try:
             if error and 'are available in precluster.' in error.get('message', ''):
                 # in precluster mode, version is not available :(
@@ -1220,6 +1594,10 @@ class OntapRestAPI(object):
         LOG.debug("%s: %s", status_code, content)
         self.debug_logs.append((status_code, content))
 
+    def is_debug_enabled(self):
+        ''' to skip formatting debug records that would be discarded '''
+        return bool(self.debug_logs.maxlen) or LOG.isEnabledFor(logging.DEBUG)
+
     def write_to_file(self, tag, data=None, filepath=None, append=True):
         '''
         This function is only for debug purposes, all calls to write_to_file should be removed
@@ -1271,7 +1649,7 @@ class AwsLambda(OntapRestAPI):
         self.module = module
         self.lambda_config = lambda_config
         self.lambda_client = None
-        self.debug_logs = []
+        self.debug_logs = create_debug_buffer(module)
         # Use provided hostname or fall back to module parameter
         self.target_hostname = hostname or module.params.get('hostname')
 
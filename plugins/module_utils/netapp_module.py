@@ -31,7 +31,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-from copy import deepcopy
+from collections import Counter
 import re
 import traceback
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
@@ -40,6 +40,11 @@ ZAPI_ONLY_DEPRECATION_MESSAGE = "This module only supports ZAPI and is deprecate
                                 "After upgrading to ONTAP 9.14 and beyond, ONTAPI (ZAPI) remains active for 30 days.  "\
                                 "If no calls are detected, it will be automatically disabled but can be re-enabled via CLI command."
 
+# tags used in hashable keys, so that a dict, a list, or a tuple is never equal to a plain tuple
+_DICT_TAG = object()
+_LIST_TAG = object()
+_TUPLE_TAG = object()
+
 
 def cmp(obj1, obj2):
     """
@@ -63,6 +68,51 @@ def cmp(obj1, obj2):
     return (obj1 > obj2) - (obj1 < obj2)
 
 
+def get_hashable_key(item):
+    """
+    Return a hashable key for item, so that two items are equal if and only if their keys are equal.
+    dicts, lists, tuples, and sets are converted recursively, and tagged so that a list is not equal to a tuple.
+    Raises TypeError if an element is not hashable.
+    """
+    if isinstance(item, dict):
+        return (_DICT_TAG, frozenset((key, get_hashable_key(value)) for key, value in item.items()))
+    if isinstance(item, list):
+        return (_LIST_TAG, tuple(get_hashable_key(value) for value in item))
+    if isinstance(item, tuple):
+        return (_TUPLE_TAG, tuple(get_hashable_key(value) for value in item))
+    if isinstance(item, (set, frozenset)):
+        return frozenset(item)
+    hash(item)
+    return item
+
+
+def compare_lists_by_equality(current, desired):
+    """
+    Fallback for compare_lists, when the elements are not hashable.
+    :return: the desired elements not in current, and whether some current elements are not in desired
+    """
+    current_copy = list(current)
+    desired_copy = list(desired)
+
+    # get what in desired and not in current
+    desired_diff_list = []
+    for item in desired:
+        if item in current_copy:
+            current_copy.remove(item)
+        else:
+            desired_diff_list.append(item)
+
+    # get what in current but not in desired
+    current_diff_list = []
+    for item in current:
+        if item in desired_copy:
+            desired_copy.remove(item)
+        else:
+            current_diff_list.append(item)
+
+    return desired_diff_list, bool(current_diff_list)
+
+
 class NetAppModule(object):
     '''
     Common class for NetApp modules
@@ -232,26 +282,23 @@ class NetAppModule(object):
             :return: list of attributes to be modified
             :rtype: list
         '''
-        current_copy = deepcopy(current)
-        desired_copy = deepcopy(desired)
-
-        # get what in desired and not in current
-        desired_diff_list = []
-        for item in desired:
-            if item in current_copy:
-                current_copy.remove(item)
-            else:
-                desired_diff_list.append(item)
-
-        # get what in current but not in desired
-        current_diff_list = []
-        for item in current:
-            if item in desired_copy:
-                desired_copy.remove(item)
-            else:
-                current_diff_list.append(item)
-
-        if desired_diff_list or current_diff_list:
+        try:
+            # count each distinct element in current, then match desired elements against these counts
+            current_counts = Counter(get_hashable_key(item) for item in current)
+            desired_diff_list = []
+            for item in desired:
+                key = get_hashable_key(item)
+                if current_counts[key] > 0:
+                    current_counts[key] -= 1
+                else:
+                    desired_diff_list.append(item)
+            # get what in current but not in desired
+            has_current_diff = any(count > 0 for count in current_counts.values())
+        except TypeError:
+            # some element cannot be converted to a hashable key, compare elements one by one
+            desired_diff_list, has_current_diff = compare_lists_by_equality(current, desired)
+
+        if desired_diff_list or has_current_diff:
             # there are changes
             return desired_diff_list if get_list_diff else desired
         else:
@@ -0,0 +1,231 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2026, NetApp, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" Support functions for NetApp ansible modules
+
+    Provides an on-disk cache for REST GET responses, shared by all the tasks and workers running on the controller.
+    Entries expire after a TTL configured per API, and the entries for a collection are invalidated
+    when a POST, PATCH, or DELETE request is sent to this collection.
+
+    Provides an on-disk cache for the ONTAP version, so that modules can skip the version probe.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    # Windows
+    HAS_FCNTL = False
+
+# headers that do not change the contents of a response
+IGNORED_HEADERS = ('X-Dot-Client-App', 'Connection', 'Authorization')
+
+
+def get_collection(api):
+    ''' storage/volumes/uuid/snapshots -> storage/volumes, cluster -> cluster '''
+    return '/'.join(api.strip('/').split('?')[0].split('/')[:2])
+
+
+class LockedJsonFile(object):
+    ''' a JSON file shared by concurrent processes
+        the file is locked while it is read or updated, and replaced atomically.
+    '''
+    def __init__(self, cache_dir, name):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, name)
+
+    def _open_lock(self, exclusive):
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir, 0o700)
+        lock_file = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return lock_file
+
+    def _read(self):
+        try:
+            with open(self.path) as cache_file:
+                contents = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return {}
+        return contents if isinstance(contents, dict) else {}
+
+    def _write(self, contents):
+        # write to a temporary file, then rename it, so that the file is always complete
+        handle, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.ontap_cache_')
+        try:
+            with os.fdopen(handle, 'w') as cache_file:
+                json.dump(contents, cache_file)
+            os.rename(temp_path, self.path)
+        except (IOError, OSError, TypeError, ValueError):
+            os.remove(temp_path)
+            raise
+
+    def read(self):
+        lock_file = self._open_lock(exclusive=False)
+        try:
+            return self._read()
+        finally:
+            os.close(lock_file)
+
+    def update(self, update_function):
+        lock_file = self._open_lock(exclusive=True)
+        try:
+            contents = self._read()
+            update_function(contents)
+            self._write(contents)
+        finally:
+            os.close(lock_file)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class RestResponseCache(object):
+    ''' cache REST GET responses in a JSON file, one file per cluster
+        ttls is a dict associating an api to a TTL in seconds, only the responses for these APIs are cached.
+        Any IO or format error disables the cache for the current request, the request is sent to ONTAP.
+        identity is the username or the client certificate, entries are not shared across identities.
+    '''
+    def __init__(self, cache_dir, url, identity, ttls):
+        self.ttls = ttls or {}
+        self.identity = identity
+        self.file = LockedJsonFile(cache_dir, 'ontap_rest_cache_%s.json' % hashlib.sha256(url.encode('utf-8')).hexdigest()[:16])
+        self.path = self.file.path
+
+    def get_ttl(self, api):
+        return self.ttls.get(api.strip('/'), 0)
+
+    def get_key(self, api, params, headers):
+        headers = dict((key, value) for key, value in (headers or {}).items() if key not in IGNORED_HEADERS)
+        key = json.dumps([self.identity, api.strip('/'), params, headers], sort_keys=True, default=str)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, api, params, headers):
+        ''' return (status_code, json_dict, None) from the cache, or None if not found or expired '''
+        if not HAS_FCNTL or self.get_ttl(api) <= 0:
+            return None
+        try:
+            contents = self.file.read()
+        except (IOError, OSError):
+            return None
+        entry = contents.get(get_collection(api), {}).get(self.get_key(api, params, headers))
+        if entry is None or entry.get('expires', 0) < time.time():
+            return None
+        return entry['status_code'], entry['json'], None
+
+    def put(self, api, params, headers, status_code, json_dict):
+        ttl = self.get_ttl(api)
+        if not HAS_FCNTL or ttl <= 0:
+            return
+
+        def add_entry(contents):
+            now = time.time()
+            entries = contents.setdefault(get_collection(api), {})
+            # drop expired entries, so that the file does not grow forever
+            for key in [key for key, entry in entries.items() if entry.get('expires', 0) < now]:
+                del entries[key]
+            entries[self.get_key(api, params, headers)] = dict(expires=now + ttl, status_code=status_code, json=json_dict)
+
+        try:
+            self.file.update(add_entry)
+        except (IOError, OSError, TypeError, ValueError):
+            pass
+
+    def invalidate(self, api):
+        ''' remove all entries for the collection api belongs to '''
+        if not HAS_FCNTL or not os.path.exists(self.path):
+            return
+        try:
+            self.file.update(lambda contents: contents.pop(get_collection(api), None))
+        except (IOError, OSError, TypeError, ValueError):
+            # do not leave stale entries behind
+            self.file.remove()
+
+
+class OntapVersionCache(object):
+    ''' persist the ONTAP version reported by GET cluster, so that later tasks can skip the probe
+        entries are indexed by URL and identity (username or certificate), and record the cluster UUID.
+        An entry is only written or refreshed by a probe for its own URL and identity.
+    '''
+    def __init__(self, cache_dir, ttl):
+        self.ttl = ttl
+        self.file = LockedJsonFile(cache_dir, 'ontap_version_cache.json')
+
+    @staticmethod
+    def get_key(url, identity):
+        # the probe also checks the user is authorized, so an entry is only valid for the same credentials
+        return json.dumps([url, identity])
+
+    def get(self, url, identity=None):
+        ''' return the GET cluster response with version and uuid, or None if not found or expired '''
+        if not HAS_FCNTL or self.ttl <= 0:
+            return None
+        try:
+            entry = self.file.read().get(self.get_key(url, identity))
+        except (IOError, OSError):
+            return None
+        if not isinstance(entry, dict) or entry.get('expires', 0) < time.time():
+            return None
+        return dict(version=entry.get('version'), uuid=entry.get('uuid'))
+
+    def put(self, url, message, identity=None):
+        if not HAS_FCNTL or self.ttl <= 0 or not message.get('uuid') or not isinstance(message.get('version'), dict):
+            return
+
+        def add_entry(contents):
+            now = time.time()
+            for key in [key for key, entry in contents.items() if not isinstance(entry, dict) or entry.get('expires', 0) < now]:
+                del contents[key]
+            contents[self.get_key(url, identity)] = dict(expires=now + self.ttl, uuid=message['uuid'], version=message['version'])
+
+        try:
+            self.file.update(add_entry)
+        except (IOError, OSError, TypeError, ValueError):
+            pass
+
+    def invalidate(self, url, identity=None):
+        ''' remove the entry for url and identity, when the credentials are rejected or the URL reaches another cluster '''
+        if not HAS_FCNTL or not os.path.exists(self.file.path):
+            return
+        try:
+            self.file.update(lambda contents: contents.pop(self.get_key(url, identity), None))
+        except (IOError, OSError, TypeError, ValueError):
+            # do not leave a stale entry behind
+            self.file.remove()
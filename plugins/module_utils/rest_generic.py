@@ -34,8 +34,18 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import re
+import time
+from ansible.module_utils.six.moves.urllib.parse import quote
 import ansible_collections.netapp.ontap.plugins.module_utils.rest_response_helpers as rrh
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    HAS_FUTURES = True
+except ImportError:
+    # python 2.7
+    HAS_FUTURES = False
+
 
 def build_query_with_fields(query, fields):
     ''' for GET requests'''
@@ -46,6 +56,19 @@ def build_query_with_fields(query, fields):
     return query
 
 
+def get_fields_for_options(parameters, fields_map, base_fields=None):
+    ''' return the minimal fields projection for a GET request, as a comma separated string
+        fields_map associates an option name with the list of REST fields used to report its current value.
+        Only the fields for the options set in parameters are requested, in addition to base_fields.
+        The result is sorted, so that identical projections yield identical queries.
+    '''
+    fields = set(base_fields or [])
+    for option, option_fields in fields_map.items():
+        if parameters.get(option) is not None:
+            fields.update(option_fields)
+    return ','.join(sorted(fields))
+
+
 def build_query_with_timeout(query, timeout):
     ''' for POST, PATCH, DELETE requests'''
     params = {} if query else None
@@ -67,17 +90,72 @@ def get_one_record(rest_api, api, query=None, fields=None):
     return record, error
 
 
-def get_0_or_more_records(rest_api, api, query=None, fields=None):
+def get_0_or_more_records(rest_api, api, query=None, fields=None, max_records=None):
+    ''' return all records for api, reading all pages, or None if there is no record '''
     query = build_query_with_fields(query, fields)
-    response, error = rest_api.get(api, query)
-    records, error = rrh.check_for_0_or_more_records(api, response, error)
-    return records, error
+    records = []
+    for record, error in get_paged_records(rest_api, api, query, max_records=max_records):
+        if error:
+            return None, error
+        records.append(record)
+    return records or None, None
+
+
+def split_values_for_query(values, max_length=2048):
+    ''' split a list of values into chunks, so that value1|value2|... does not exceed max_length characters once URL encoded
+        a single value longer than max_length is kept in its own chunk
+    '''
+    chunk, length = [], 0
+    for value in values:
+        # 3 characters for %7C, the encoded | separator
+        value_length = len(quote(str(value), safe='')) + 3
+        if chunk and length + value_length > max_length:
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(value)
+        length += value_length
+    if chunk:
+        yield chunk
+
+
+def get_value_for_key(record, key):
+    ''' return the value for a dotted key, eg node.name, or None '''
+    for field in key.split('.'):
+        record = record.get(field) if isinstance(record, dict) else None
+    return record
+
+
+def get_records_by_keys(rest_api, api, key, values, query=None, fields=None, max_length=2048, unique=False):
+    ''' fetch all records matching any of the values for key, using key=value1|value2|... OR-queries
+        values are split in chunks to keep the URL short enough, and all pages are read for each chunk.
+        key can be a dotted name, eg node.name.
+        when unique is True, several records with the same value for key are reported as an error, rather than the last one being kept.
+        returns a dict indexed by the value of key in each record, and None, or None and an error
+    '''
+    query = dict(query) if query else {}
+    if fields is not None:
+        query['fields'] = fields if key in fields.split(',') else '%s,%s' % (fields, key)
+    records = {}
+    for chunk in split_values_for_query(values, max_length):
+        chunk_query = dict(query)
+        chunk_query[key] = '|'.join(str(value) for value in chunk)
+        for page, error in get_pages(rest_api, api, chunk_query):
+            page_records, error = rrh.check_for_0_or_more_records(api, page, error)
+            if error:
+                return None, error
+            for record in page_records or []:
+                value = get_value_for_key(record, key)
+                if unique and value in records:
+                    return None, 'calling: %s: found more than one record with %s: %s.' % (api, key, value)
+                records[value] = record
+    return records, None
 
 
 def post_async(rest_api, api, body, query=None, timeout=30, job_timeout=30, headers=None, raw_error=False, files=None):
     # see delete_async for async and sync operations and status codes
     response, error = rest_api.post(api, body=body, params=build_query_with_timeout(query, timeout), headers=headers, files=files)
     # limit the polling interval to something between 5 seconds and 60 seconds
+    # with the adaptive job_poll_policy, this is the ceiling for the delay between two polls
     increment = min(max(job_timeout / 6, 5), 60)
     response, error = rrh.check_for_error_and_job_results(api, response, error, rest_api, increment=increment, timeout=job_timeout, raw_error=raw_error)
     return response, error
@@ -99,3 +177,121 @@ def delete_async(rest_api, api, uuid, query=None, body=None, timeout=30, job_tim
     increment = min(max(job_timeout / 6, 5), 60)
     response, error = rrh.check_for_error_and_job_results(api, response, error, rest_api, increment=increment, timeout=job_timeout, raw_error=raw_error)
     return response, error
+
+
+def get_next_api(response):
+    ''' return the api to fetch the next page of records, or None if this is the last page '''
+    try:
+        return response['_links']['next']['href'].replace('/api', '')
+    except (AttributeError, KeyError, TypeError):
+        return None
+
+
+def set_max_records(api, max_records):
+    ''' set or replace max_records in the query string of a next link '''
+    if re.search(r'[?&]max_records=\d+', api):
+        return re.sub(r'([?&])max_records=\d+', r'\g<1>max_records=%d' % max_records, api)
+    return '%s%smax_records=%d' % (api, '&' if '?' in api else '?', max_records)
+
+
+class MaxRecordsTuner(object):
+    ''' adjust max_records between pages, based on the latency and size observed for the previous page
+        so that a page takes about target_latency seconds to be returned, and is smaller than target_size bytes.
+        The value is at most doubled or halved from one page to the next.
+    '''
+    def __init__(self, max_records, target_latency=2.0, target_size=16 * 1024 * 1024, min_records=100, max_limit=10000):
+        self.max_records = max_records
+        self.target_latency = target_latency
+        self.target_size = target_size
+        self.min_records = min(min_records, max_records)
+        self.max_limit = max(max_limit, max_records)
+
+    def update(self, num_records, latency, size=None):
+        if num_records > 0 and latency > 0:
+            estimate = int(num_records * self.target_latency / latency)
+            if size:
+                estimate = min(estimate, int(num_records * self.target_size / size))
+            estimate = max(self.max_records // 2, min(estimate, self.max_records * 2))
+            self.max_records = max(self.min_records, min(estimate, self.max_limit))
+        return self.max_records
+
+
+def get_next_pages(rest_api, response, headers=None, prefetch=False, tuner=None):
+    ''' generator following the _links.next links, starting from response, which is the first page already read
+        yields (page, None) for each page, or (None, error) and stops on error.
+        prefetch: fetch the next page in a background thread while the caller is processing the current page.
+        tuner: a MaxRecordsTuner instance, to adjust max_records for the next page.
+    '''
+    def fetch(api):
+        start = time.time()
+        page, error = rest_api.get(api, headers=headers)
+        latency = time.time() - start
+        try:
+            size = int(rest_api.last_response_headers.get('Content-Length'))
+        except (AttributeError, TypeError, ValueError):
+            size = None
+        return page, error, latency, size
+
+    api = get_next_api(response)
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch and HAS_FUTURES and api else None
+    future = None
+    try:
+        while api:
+            page, error, latency, size = future.result() if future else fetch(api)
+            future = None
+            if error:
+                yield None, error
+                return
+            api = get_next_api(page)
+            if api and tuner is not None:
+                api = set_max_records(api, tuner.update(len(page.get('records', [])), latency, size))
+            if api and executor is not None:
+                future = executor.submit(fetch, api)
+            yield page, None
+    finally:
+        if executor is not None:
+            # if the caller stopped early, wait for the pending request to complete
+            executor.shutdown(wait=True)
+
+
+def get_pages(rest_api, api, query=None, headers=None, prefetch=False, tuner=None):
+    ''' generator reading the first page for api, then following the _links.next links
+        yields (page, None) for each page, or (None, error) and stops on error.
+    '''
+    response, error = rest_api.get(api, query, headers=headers)
+    if error:
+        yield None, error
+        return
+    yield response, None
+    for page, error in get_next_pages(rest_api, response, headers, prefetch, tuner):
+        yield page, error
+
+
+def get_paged_records(rest_api, api, query=None, fields=None, max_records=None, limit=None, counters=None, headers=None):
+    ''' generator reading all records for api, one page at a time, so that only the current page is kept in memory
+        yields (record, None) for each record, or (None, error) and stops on error.
+        max_records: number of records requested for each page, ONTAP uses its own default if not set.
+        limit: stop after this number of records, the remaining pages are not read.
+               The caller can also stop iterating at any time.
+        counters: an optional dict, updated with num_records and num_pages read so far.
+    '''
+    query = build_query_with_fields(dict(query) if query else None, fields)
+    if max_records is not None:
+        query = query or {}
+        query['max_records'] = max_records
+    if counters is None:
+        counters = {}
+    counters.update(num_records=0, num_pages=0)
+    if limit is not None and limit <= 0:
+        return
+    for page, error in get_pages(rest_api, api, query, headers):
+        records, error = rrh.check_for_0_or_more_records(api, page, error)
+        if error:
+            yield None, error
+            return
+        counters['num_pages'] += 1
+        for record in records or []:
+            counters['num_records'] += 1
+            yield record, None
+            if limit is not None and counters['num_records'] >= limit:
+                return
@@ -0,0 +1,150 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2026, NetApp, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+""" Support functions for NetApp ansible modules
+
+    Provides a job tracker, to send several asynchronous requests without waiting,
+    then wait for all the jobs with a single cluster/jobs?uuid=uuid1|uuid2|... query per poll.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
+import ansible_collections.netapp.ontap.plugins.module_utils.rest_response_helpers as rrh
+
+JOB_FIELDS = 'uuid,state,message,code,error'
+
+
+def get_jobs(response):
+    ''' return the list of jobs for an asynchronous response, a query based request returns a job for each matching record '''
+    if not isinstance(response, dict):
+        return []
+    if 'job' in response:
+        return [response['job']]
+    return list(response.get('jobs') or [])
+
+
+class JobTracker(object):
+    ''' send asynchronous POST, PATCH, or DELETE requests with return_timeout=0, and track their jobs
+        wait() polls all the pending jobs together, so that N operations do not pay N times the polling delay.
+        A query based PATCH or DELETE can return several jobs, each job is tracked as an operation with the same key.
+        Only operations that ONTAP can run in parallel should be submitted to the same tracker.
+    '''
+    def __init__(self, rest_api, timeout=600, increment=60):
+        self.rest_api = rest_api
+        self.timeout = timeout
+        self.increment = increment
+        self.operations = []
+
+    def submit(self, key, method, api, body=None, query=None, uuid=None):
+        ''' send the request, and return an error if the request failed
+            key identifies the operation in the results returned by wait()
+        '''
+        if uuid is not None:
+            api = '%s/%s' % (api, uuid)
+        params = dict(query or {}, return_timeout=0)
+        if method == 'POST':
+            response, error = self.rest_api.post(api, body, params=params)
+        elif method == 'PATCH':
+            response, error = self.rest_api.patch(api, body, params=params)
+        elif method == 'DELETE':
+            response, error = self.rest_api.delete(api, body=body, params=params)
+        else:
+            raise KeyError(method)
+        jobs = [] if error else get_jobs(response)
+        if len(jobs) > 1:
+            # each job reports its own response
+            operations = [dict(key=key, api=api, response=dict(response, job=job), error=None, job=job, done=False) for job in jobs]
+        else:
+            operations = [dict(key=key, api=api, response=response, error=rrh.api_error(api, error), job=jobs[0] if jobs else None, done=not jobs)]
+        self.operations.extend(operations)
+        return operations[0]['error']
+
+    def pending(self):
+        return [operation for operation in self.operations if not operation['done']]
+
+    def poll(self, timed_out):
+        ''' read the state of all pending jobs with a single query, return an error if the query failed '''
+        pending = self.pending()
+        records, error = rest_generic.get_records_by_keys(self.rest_api, 'cluster/jobs', 'uuid', [operation['job']['uuid'] for operation in pending],
+                                                          fields=JOB_FIELDS)
+        if error:
+            return error
+        for operation in pending:
+            job_json = records.get(operation['job']['uuid'])
+            if job_json is None and not timed_out:
+                # the job may not be visible yet
+                continue
+            done, message, error = self.rest_api._is_job_done(job_json, job_json.get('state') if job_json else None, None, timed_out)
+            if done:
+                operation['done'] = True
+                if error:
+                    operation['error'] = rrh.job_error(operation['response'], error)
+                else:
+                    operation['response']['job_response'] = message
+        return None
+
+    def wait(self):
+        ''' wait for all the jobs to complete, or the timeout to expire
+            return a list of (key, response, error) in submission order, with an entry for each job of a query based request
+        '''
+        runtime = 0
+        retries = 0
+        max_retries = 3
+        errors = []
+        intervals = self.rest_api.get_job_poll_intervals(self.increment)
+        while self.pending():
+            error = self.poll(runtime >= self.timeout)
+            if error:
+                errors.append(str(error))
+                retries += 1
+                if retries > max_retries:
+                    for operation in self.pending():
+                        operation['done'] = True
+                        operation['error'] = rrh.job_error(operation['response'], ' - '.join(errors))
+                    break
+            else:
+                retries = 0
+            if self.pending():
+                # honor Retry-After if ONTAP is asking us to back off, but never sleep past the increment or the timeout
+                delay = self.rest_api.get_capped_retry_after(self.increment, self.timeout - runtime)
+                if retries:
+                    # the job states could not be read, give ONTAP as much time to recover as with the fixed policy
+                    delay = max(delay or 0, self.increment)
+                elif delay is None:
+                    delay = next(intervals)
+                time.sleep(delay)
+                runtime += delay
+        return [(operation['key'], operation['response'], operation['error']) for operation in self.operations]
+
+    def get_errors(self):
+        ''' return a list of (key, error) for the failed operations '''
+        return [(key, error) for key, dummy, error in self.wait() if error]
@@ -34,7 +34,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-import ansible_collections.netapp.ontap.plugins.module_utils.rest_response_helpers as rrh
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
 
 
 def get_users(rest_api, parameters, fields=None):
@@ -44,6 +44,4 @@ def get_users(rest_api, parameters, fields=None):
         query[field] = parameters[field]
     if fields is not None:
         query['fields'] = fields
-    response, error = rest_api.get(api, query)
-    users, error = rrh.check_for_0_or_more_records(api, response, error)
-    return users, error
+    return rest_generic.get_0_or_more_records(rest_api, api, query)
@@ -0,0 +1,219 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2026, NetApp, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+""" Support functions for NetApp ansible modules
+
+    Records spans for REST and ZAPI calls, job waits, and module phases.
+    The spans for a task are appended to a file as one OTLP/JSON line when the module exits,
+    so that they can be loaded in a trace viewer.
+    When tracing is disabled, span() returns a shared no-op span.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import atexit
+import binascii
+import json
+import os
+import threading
+import time
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+
+
+def new_id(size):
+    return binascii.hexlify(os.urandom(size)).decode('ascii')
+
+
+def now_ns():
+    return int(time.time() * 1e9)
+
+
+def otlp_value(value):
+    ''' OTLP/JSON encodes 64-bit integers as strings '''
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def otlp_attributes(attributes):
+    return [{'key': key, 'value': otlp_value(value)} for key, value in sorted(attributes.items()) if value is not None]
+
+
+class NoopSpan(object):
+    ''' returned when tracing is disabled '''
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_attributes(self, attributes):
+        pass
+
+    def set_error(self, message):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Span(object):
+    ''' a timed operation, the parent is the current span in this thread when the span is entered '''
+    recording = True
+
+    def __init__(self, tracer, name, attributes=None, kind=SPAN_KIND_INTERNAL):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.span_id = new_id(8)
+        self.parent = None
+        self.error = None
+        self.start = None
+
+    def __enter__(self):
+        self.parent = self.tracer.push(self)
+        self.start = now_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # exit_json and fail_json raise SystemExit, this is not an error for the span
+        if exc_type is not None and not issubclass(exc_type, SystemExit) and self.error is None:
+            self.set_error(repr(exc_value))
+        self.tracer.pop(self)
+        self.tracer.add(self.to_otlp(now_ns()))
+        return False
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def set_error(self, message):
+        self.error = str(message)
+
+    def to_otlp(self, end):
+        span = dict(
+            traceId=self.tracer.trace_id,
+            spanId=self.span_id,
+            name=self.name,
+            kind=self.kind,
+            startTimeUnixNano=str(self.start),
+            endTimeUnixNano=str(end),
+            attributes=otlp_attributes(self.attributes),
+            status={} if self.error is None else dict(code=STATUS_CODE_ERROR, message=self.error),
+        )
+        if self.parent is not None:
+            span['parentSpanId'] = self.parent.span_id
+        return span
+
+
+class SpanTracer(object):
+    ''' collects the spans for a task, under a root span named after the module
+        spans may be recorded from several threads, each thread keeps its own stack of active spans.
+    '''
+    def __init__(self):
+        self.enabled = False
+        self.module = None
+        self.path = None
+        self.trace_id = None
+        self.root = None
+        self.spans = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.registered = False
+
+    def configure(self, path, module):
+        ''' start a new trace when a new module enables tracing '''
+        self.enabled = bool(path)
+        if not path or module is self.module:
+            return
+        self.flush()
+        self.module = module
+        self.path = path
+        self.trace_id = new_id(16)
+        self.root = Span(self, module._name, {'ansible.module': module._name, 'ansible.check_mode': module.check_mode})
+        self.root.start = now_ns()
+        if not self.registered:
+            atexit.register(self.flush)
+            self.registered = True
+
+    def span(self, name, attributes=None, kind=SPAN_KIND_INTERNAL):
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attributes, kind)
+
+    def get_stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def push(self, span):
+        ''' return the parent span '''
+        stack = self.get_stack()
+        parent = stack[-1] if stack else self.root
+        stack.append(span)
+        return parent
+
+    def pop(self, span):
+        stack = self.get_stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+
+    def add(self, otlp_span):
+        with self.lock:
+            self.spans.append(otlp_span)
+
+    def flush(self):
+        ''' close the root span, and append the trace to the file as a single OTLP/JSON line '''
+        if self.root is None:
+            return
+        with self.lock:
+            spans = [self.root.to_otlp(now_ns())] + self.spans
+            self.spans = []
+        request = dict(resourceSpans=[dict(
+            resource=dict(attributes=otlp_attributes({'service.name': 'netapp.ontap', 'ansible.module': self.module._name})),
+            scopeSpans=[dict(scope=dict(name='netapp.ontap'), spans=spans)],
+        )])
+        self.root = None
+        self.module = None
+        try:
+            with open(self.path, 'a') as trace_file:
+                trace_file.write(json.dumps(request) + '\n')
+        except (IOError, OSError, TypeError, ValueError):
+            # the module has already exited, there is no way to report the error
+            pass
@@ -49,6 +49,15 @@ options:
     type: int
     version_added: 21.7.0
 
+  parallelism:
+    description:
+    - Number of disks whose ownership is removed concurrently, with REST.
+    - With the default value of 1, disks are processed one after the other.
+    - Removal is attempted for all disks, and errors are reported for each disk.
+    default: 1
+    type: int
+    version_added: 23.7.0
+
 '''
 
 EXAMPLES = """
@@ -71,7 +80,13 @@ EXAMPLES = """
 """
 
 RETURN = """
-
+unassign_summary:
+  description:
+    - Number of disks whose ownership was to be removed, removed, or failed to be removed.
+    - Errors are reported for each disk that failed.
+  returned: when ownership is removed from disks
+  type: dict
+  sample: {"requested": 4, "removed": 3, "failed": 1, "errors": {"1.0.16": "disk is in use"}}
 """
 import traceback
 
@@ -82,6 +97,13 @@ from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp import OntapRestAPI
 import ansible_collections.netapp.ontap.plugins.module_utils.rest_response_helpers as rrh
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    HAS_FUTURES = True
+except ImportError:
+    # python 2.7
+    HAS_FUTURES = False
+
 
 class NetAppOntapDisks():
     ''' object initialize and class methods '''
@@ -92,7 +114,8 @@ class NetAppOntapDisks():
             node=dict(required=True, type='str'),
             disk_count=dict(required=False, type='int'),
             disk_type=dict(required=False, type='str', choices=['ATA', 'BSAS', 'FCAL', 'FSAS', 'LUN', 'MSATA', 'SAS', 'SSD', 'SSD_NVM', 'VMDISK', 'unknown']),
-            min_spares=dict(required=False, type='int')
+            min_spares=dict(required=False, type='int'),
+            parallelism=dict(required=False, type='int', default=1)
         ))
 
         self.module = AnsibleModule(
@@ -106,7 +129,14 @@ class NetAppOntapDisks():
         # If min_spares is not specified min_spares is 1 if SSD, min_spares is 2 for any other disk type.
         self.parameters['min_spares'] = 1 if self.parameters.get('disk_type') in ('SSD', 'SSD_NVM') else 2
 
-        self.rest_api = OntapRestAPI(self.module)
+        if self.parameters['parallelism'] < 1:
+            self.module.fail_json(msg='Error: parallelism must be greater than or equal to 1, got: %d.' % self.parameters['parallelism'])
+        if self.parameters['parallelism'] > 1 and not HAS_FUTURES:
+            self.module.warn('parallelism requires python 3, removing disk ownership one disk at a time.')
+            self.parameters['parallelism'] = 1
+        self.unassign_summary = None
+
+        self.rest_api = OntapRestAPI(self.module, pool_maxsize=self.parameters['parallelism'])
         self.use_rest = self.rest_api.is_rest()
 
         if not self.use_rest:
@@ -286,14 +316,7 @@ class NetAppOntapDisks():
         Disk autoassign must be turned off when removing ownership of a disk
         """
         if self.use_rest:
-            api = "private/cli/storage/disk/removeowner"
-            for disk in disks:  # api requires 1 disk to be removed at a time.
-                body = {
-                    'disk': disk['name']
-                }
-                dummy, error = self.rest_api.post(api, body)
-                if error:
-                    self.module.fail_json(msg=error)
+            self.disk_unassign_rest([disk['name'] for disk in disks])
 
         else:
             unassign_partitions = netapp_utils.zapi.NaElement('disk-sanown-remove-ownership')
@@ -309,8 +332,46 @@ class NetAppOntapDisks():
 
             except netapp_utils.zapi.NaApiError as error:
                 self.module.fail_json(msg='Error unassigning disks %s' % to_native(error))
+            self.unassign_summary = self.get_unassign_summary(disks, {})
             return True
 
+    def remove_disk_owner_rest(self, disk):
+        api = "private/cli/storage/disk/removeowner"
+        body = {
+            'disk': disk
+        }
+        dummy, error = self.rest_api.post(api, body)
+        return disk, error
+
+    def disk_unassign_rest(self, disks):
+        """
+        The api requires 1 disk to be removed at a time, up to parallelism disks are processed concurrently.
+        Removal is attempted for all disks, errors are reported for each disk.
+        """
+        parallelism = min(self.parameters['parallelism'], len(disks))
+        if parallelism > 1:
+            with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                results = list(executor.map(self.remove_disk_owner_rest, disks))
+        else:
+            results = [self.remove_disk_owner_rest(disk) for disk in disks]
+        errors = dict((disk, error) for disk, error in results if error)
+        self.unassign_summary = self.get_unassign_summary(disks, errors)
+        if errors:
+            details = ', '.join('%s: %s' % (disk, errors[disk]) for disk in disks if disk in errors)
+            self.module.fail_json(msg='Error removing ownership of %d of %d disks: %s' % (len(errors), len(disks), details),
+                                  unassign_summary=self.unassign_summary)
+
+    @staticmethod
+    def get_unassign_summary(disks, errors):
+        summary = {
+            'requested': len(disks),
+            'removed': len(disks) - len(errors),
+            'failed': len(errors)
+        }
+        if errors:
+            summary['errors'] = errors
+        return summary
+
     def apply(self):
         '''Apply action to disks'''
         changed = False
@@ -373,7 +434,10 @@ class NetAppOntapDisks():
                 self.disk_assign(needed_disks)
             changed = True
 
-        self.module.exit_json(changed=changed)
+        result = dict(changed=changed)
+        if self.unassign_summary is not None:
+            result['unassign_summary'] = self.unassign_summary
+        self.module.exit_json(**netapp_utils.add_metrics(result))
 
 
 def main():
@@ -234,6 +234,7 @@ import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_ut
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp import OntapRestAPI
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_jobs
 
 
 class NetAppOntapIgroup:
@@ -443,6 +444,7 @@ class NetAppOntapIgroup:
         api = "protocols/san/igroups/%s/%s" % (uuid, self.get_rest_name_for_option(option))
         if option == 'initiator_names' and self.rest_api.meets_rest_minimum_version(self.use_rest, 9, 9, 1):
             in_objects = self.parameters['initiator_objects']
+            names = set(names)
             records = [self.na_helper.filter_out_none_entries(item) for item in in_objects if item['name'] in names]
         else:
             records = [dict(name=name) for name in names]
@@ -450,13 +452,51 @@ class NetAppOntapIgroup:
         dummy, error = rest_generic.post_async(self.rest_api, api, body)
         self.fail_on_error(error)
 
+    def send_query_based_requests(self, requests):
+        """
+        A query based PATCH or DELETE returns a job for each matching record when ONTAP runs it asynchronously.
+        The requests are sent without waiting, and all their jobs are polled together.
+        :param requests: list of (method, api, body, query)
+        """
+        tracker = rest_jobs.JobTracker(self.rest_api, timeout=30, increment=5)
+        for method, api, body, query in requests:
+            self.fail_on_error(tracker.submit(api, method, api, body, query))
+        errors = [error for dummy, error in tracker.get_errors()]
+        if errors:
+            self.fail_on_error(' -- '.join(errors))
+
     def modify_initiators_rest(self, uuid, initiator_objects):
+        """
+        Initiators sharing the same comment are updated together, using a query based PATCH
+        """
+        api = "protocols/san/igroups/%s/initiators" % uuid
+        names_by_comment = {}
         for initiator in initiator_objects:
             if 'comment' in initiator:
-                api = "protocols/san/igroups/%s/initiators" % uuid
-                body = dict(comment=initiator['comment'])
-                dummy, error = rest_generic.patch_async(self.rest_api, api, initiator['name'], body)
-                self.fail_on_error(error)
+                names_by_comment.setdefault(initiator['comment'], []).append(initiator['name'])
+        requests = []
+        for comment, names in names_by_comment.items():
+            body = dict(comment=comment)
+            for chunk in rest_generic.split_values_for_query(names):
+                if len(chunk) == 1:
+                    dummy, error = rest_generic.patch_async(self.rest_api, api, chunk[0], body)
+                    self.fail_on_error(error)
+                else:
+                    requests.append(('PATCH', api, body, {'name': '|'.join(chunk)}))
+        self.send_query_based_requests(requests)
+
+    def get_membership_changes(self, option, current_names):
+        """
+        Compare current and desired initiators or igroups in a single pass
+        :return: names to add, names to remove
+        """
+        desired_names = self.parameters.get(option) or []
+        current_set = set(current_names)
+        desired_set = set(desired_names)
+        # don't add if initiator_names/igroups is empty string
+        names_to_add = [] if desired_names == [''] else [name for name in desired_names if name not in current_set]
+        names_to_remove = [name for name in current_names if name not in desired_set]
+        return names_to_add, names_to_remove
 
     def add_initiators_or_igroups(self, uuid, option, current_names):
         """
@@ -464,10 +504,7 @@ class NetAppOntapIgroup:
         :return: None
         """
         self.check_option_is_valid(option)
-        # don't add if initiator_names/igroups is empty string
-        if self.parameters.get(option) == [''] or self.parameters.get(option) is None:
-            return
-        names_to_add = [name for name in self.parameters[option] if name not in current_names]
+        names_to_add, dummy = self.get_membership_changes(option, current_names)
         if self.use_rest and names_to_add:
             self.add_initiators_or_igroups_rest(uuid, option, names_to_add)
         else:
@@ -481,18 +518,37 @@ class NetAppOntapIgroup:
         dummy, error = rest_generic.delete_async(self.rest_api, api, name_or_uuid, query=query)
         self.fail_on_error(error)
 
+    def delete_initiators_or_igroups_rest(self, uuid, option, names_or_uuids):
+        """
+        Remove several initiators or igroups using a query based DELETE, rather than one DELETE for each of them
+        """
+        self.check_option_is_valid(option)
+        api = "protocols/san/igroups/%s/%s" % (uuid, self.get_rest_name_for_option(option))
+        # initiators do not have a uuid
+        key = 'name' if option == 'initiator_names' else 'uuid'
+        requests = []
+        for chunk in rest_generic.split_values_for_query(names_or_uuids):
+            if len(chunk) == 1:
+                self.delete_initiator_or_igroup_rest(uuid, option, chunk[0])
+                continue
+            query = {key: '|'.join(chunk)}
+            if self.parameters['force_remove_initiator']:
+                query['allow_delete_while_mapped'] = True
+            requests.append(('DELETE', api, None, query))
+        self.send_query_based_requests(requests)
+
     def remove_initiators_or_igroups(self, uuid, option, current_names, mapping):
         """
         Removes current names from igroup unless they are still desired
         :return: None
         """
         self.check_option_is_valid(option)
-        for name in current_names:
-            if name not in self.parameters.get(option, list()):
-                if self.use_rest:
-                    self.delete_initiator_or_igroup_rest(uuid, option, mapping[name])
-                else:
-                    self.modify_initiator(name, 'igroup-remove')
+        dummy, names_to_remove = self.get_membership_changes(option, current_names)
+        if self.use_rest and names_to_remove:
+            self.delete_initiators_or_igroups_rest(uuid, option, [mapping[name] for name in names_to_remove])
+        elif not self.use_rest:
+            for name in names_to_remove:
+                self.modify_initiator(name, 'igroup-remove')
 
     def modify_initiator(self, initiator, zapi):
         """
@@ -373,27 +373,11 @@ ontap_info:
 '''
 
 import codecs
-import copy
 import traceback
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_bytes, to_native, to_text
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 
-IMPORT_ERRORS = []
-try:
-    import xmltodict
-    HAS_XMLTODICT = True
-except ImportError as exc:
-    HAS_XMLTODICT = False
-    IMPORT_ERRORS.append(str(exc))
-
-try:
-    import json
-    HAS_JSON = True
-except ImportError as exc:
-    HAS_JSON = False
-    IMPORT_ERRORS.append(str(exc))
-
 HAS_NETAPP_LIB = netapp_utils.has_netapp_lib()
 
 
@@ -430,10 +414,6 @@ class NetAppONTAPGatherInfo:
 
         if not HAS_NETAPP_LIB:
             self.module.fail_json(msg=netapp_utils.netapp_lib_is_required())
-        if not HAS_XMLTODICT:
-            self.module.fail_json(msg="the python xmltodict module is required.  Import error: %s" % str(IMPORT_ERRORS))
-        if not HAS_JSON:
-            self.module.fail_json(msg="the python json module is required.  Import error: %s" % str(IMPORT_ERRORS))
 
         self.max_records = str(self.module.params['max_records'])
         volume_move_target_aggr_info = self.module.params.get('volume_move_target_aggr_info', dict())
@@ -1440,12 +1420,12 @@ class NetAppONTAPGatherInfo:
             self.module.fail_json(msg="Error calling API %s: %s" %
                                   (api, to_native(error)), exception=traceback.format_exc())
 
-    def call_api(self, call, attributes_list_tag='attributes-list', query=None, fail_on_error=True):
-        '''Main method to run an API call'''
+    def get_next_pages(self, call, attributes_list_tag='attributes-list', query=None, fail_on_error=True):
+        '''Run an API call, and follow next-tag to get all records.
+           Yields (page, None) for each page as it is received, so that records can be converted and released one page at a time.
+           On error, yields (None, error_message) and stops.'''
 
         api_call = netapp_utils.zapi.NaElement(call)
-        initial_result = None
-        result = None
 
         if query:
             for key, val in query.items():
@@ -1457,9 +1437,9 @@ class NetAppONTAPGatherInfo:
         if self.query is not None:
             api_call.translate_struct(self.query)
         try:
-            initial_result = self.server.invoke_successfully(api_call, enable_tunneling=True)
-            next_tag = initial_result.get_child_by_name('next-tag')
-            result = copy.copy(initial_result)
+            result = self.server.invoke_successfully(api_call, enable_tunneling=True)
+            next_tag = result.get_child_content('next-tag')
+            yield result, None
 
             while next_tag:
                 next_tag_call = netapp_utils.zapi.NaElement(call)
@@ -1467,25 +1447,18 @@ class NetAppONTAPGatherInfo:
                     for key, val in query.items():
                         next_tag_call.add_new_child(key, val)
 
-                next_tag_call.add_new_child("tag", next_tag.get_content(), True)
-                next_result = self.server.invoke_successfully(next_tag_call, enable_tunneling=True)
+                next_tag_call.add_new_child("tag", next_tag, True)
+                result = self.server.invoke_successfully(next_tag_call, enable_tunneling=True)
 
-                next_tag = next_result.get_child_by_name('next-tag')
+                next_tag = result.get_child_content('next-tag')
                 if attributes_list_tag is None:
                     self.module.fail_json(msg="Error calling API %s: %s" %
                                           (api_call.to_string(), "'next-tag' is not expected for this API"))
-
-                result_attr = result.get_child_by_name(attributes_list_tag)
-                new_records = next_result.get_child_by_name(attributes_list_tag)
-                if new_records:
-                    for record in new_records.get_children():
-                        result_attr.add_child_elem(record)
-
-            return result, None
+                yield result, None
 
         except netapp_utils.zapi.NaApiError as error:
             if call in ['security-key-manager-key-get-iter']:
-                return result, None
+                return
             kind, error_message = netapp_utils.classify_zapi_exception(error)
             if kind == 'missing_vserver_api_error':
                 # for missing_vserver_api_error, the API is already in error_message
@@ -1494,7 +1467,7 @@ class NetAppONTAPGatherInfo:
                 error_message = "Error calling API %s: %s" % (call, error_message)
             if self.error_flags[kind] and fail_on_error:
                 self.module.fail_json(msg=error_message, exception=traceback.format_exc())
-            return None, error_message
+            yield None, error_message
 
     def get_ifgrp_info(self):
         '''Method to get network port ifgroups info'''
@@ -1519,72 +1492,68 @@ class NetAppONTAPGatherInfo:
             tmp = self.get_generic_get_iter('net-port-ifgrp-get', key_fields=('node', 'ifgrp-name'),
                                             attribute='net-ifgrp-info', query=query,
                                             attributes_list_tag='attributes')
-            net_ifgrp_info = net_ifgrp_info.copy()
             net_ifgrp_info.update(tmp)
         return net_ifgrp_info
 
     def get_generic_get_iter(self, call, attribute=None, key_fields=None, query=None, attributes_list_tag='attributes-list', fail_on_error=True):
         '''Method to run a generic get-iter call'''
 
-        generic_call, error = self.call_api(call, attributes_list_tag, query, fail_on_error=fail_on_error)
-
-        if error is not None:
-            return {'error': error}
+        out = None
+        iteration = 0
+        # records are converted page by page, each page is released before the next one is read
+        for page, error in self.get_next_pages(call, attributes_list_tag, query, fail_on_error=fail_on_error):
+            if error is not None:
+                return {'error': error}
 
-        if generic_call is None:
-            return None
+            if attributes_list_tag is None:
+                attributes_list = page
+            else:
+                attributes_list = page.get_child_by_name(attributes_list_tag)
 
-        if attributes_list_tag is None:
-            attributes_list = generic_call
-        else:
-            attributes_list = generic_call.get_child_by_name(attributes_list_tag)
+            if attributes_list is None:
+                continue
 
-        if attributes_list is None:
-            return None
+            if out is None:
+                out = [] if key_fields is None else {}
 
-        if key_fields is None:
-            out = []
-        else:
-            out = {}
+            for child in attributes_list.get_children():
+                iteration += 1
+                dic = {_local_name(child): zapi_to_dict(child)}
 
-        iteration = 0
-        for child in attributes_list.get_children():
-            iteration += 1
-            dic = xmltodict.parse(child.to_string(), xml_attribs=False)
-
-            if attribute is not None:
-                try:
-                    dic = dic[attribute]
-                except KeyError as exc:
-                    error_message = 'Error: attribute %s not found for %s, got: %s' % (str(exc), call, dic)
-                    self.module.fail_json(msg=error_message, exception=traceback.format_exc())
-
-            info = json.loads(json.dumps(dic))
-            if self.translate_keys:
-                info = convert_keys(info)
-            if isinstance(key_fields, str):
-                try:
-                    unique_key = _finditem(dic, key_fields)
-                except KeyError as exc:
-                    error_message = 'Error: key %s not found for %s, got: %s' % (str(exc), call, repr(info))
-                    if self.error_flags['key_error']:
-                        self.module.fail_json(msg=error_message, exception=traceback.format_exc())
-                    unique_key = 'Error_%d_key_not_found_%s' % (iteration, exc.args[0])
-            elif isinstance(key_fields, tuple):
-                try:
-                    unique_key = ':'.join([_finditem(dic, el) for el in key_fields])
-                except KeyError as exc:
-                    error_message = 'Error: key %s not found for %s, got: %s' % (str(exc), call, repr(info))
-                    if self.error_flags['key_error']:
+                if attribute is not None:
+                    try:
+                        dic = dic[attribute]
+                    except KeyError as exc:
+                        error_message = 'Error: attribute %s not found for %s, got: %s' % (str(exc), call, dic)
                         self.module.fail_json(msg=error_message, exception=traceback.format_exc())
-                    unique_key = 'Error_%d_key_not_found_%s' % (iteration, exc.args[0])
-            else:
-                unique_key = None
-            if unique_key is not None:
-                out = out.copy()
-                out.update({unique_key: info})
-            else:
-                out.append(info)
+
+                # convert_keys builds a new structure, dic is left untouched for _finditem
+                info = convert_keys(dic) if self.translate_keys else dic
+                if isinstance(key_fields, str):
+                    try:
+                        unique_key = _finditem(dic, key_fields)
+                    except KeyError as exc:
+                        error_message = 'Error: key %s not found for %s, got: %s' % (str(exc), call, repr(info))
+                        if self.error_flags['key_error']:
+                            self.module.fail_json(msg=error_message, exception=traceback.format_exc())
+                        unique_key = 'Error_%d_key_not_found_%s' % (iteration, exc.args[0])
+                elif isinstance(key_fields, tuple):
+                    try:
+                        unique_key = ':'.join([_finditem(dic, el) for el in key_fields])
+                    except KeyError as exc:
+                        error_message = 'Error: key %s not found for %s, got: %s' % (str(exc), call, repr(info))
+                        if self.error_flags['key_error']:
+                            self.module.fail_json(msg=error_message, exception=traceback.format_exc())
+                        unique_key = 'Error_%d_key_not_found_%s' % (iteration, exc.args[0])
+                else:
+                    unique_key = None
+                if unique_key is not None:
+                    out[unique_key] = info
+                else:
+                    out.append(info)
+
+        if out is None:
+            return None
 
         if attributes_list_tag is None and key_fields is None:
             if len(out) == 1:
@@ -1760,7 +1729,7 @@ class NetAppONTAPGatherInfo:
             results['state'] = self.module.params['state']
             results['warnings'] = "option 'state' is deprecated."
             self.module.warn("option 'state' is deprecated.")
-        self.module.exit_json(**results)
+        self.module.exit_json(**netapp_utils.add_metrics(results))
 
 
 # https://stackoverflow.com/questions/14962485/finding-a-key-recursively-in-a-dictionary
@@ -1799,6 +1768,37 @@ def _finditem(obj, keys):
     raise KeyError(str(keys))
 
 
+def _local_name(na_element):
+    ''' tag name without the XML namespace, if any '''
+    return na_element.get_name().rpartition('}')[2]
+
+
+def zapi_to_dict(na_element):
+    ''' convert a ZAPI element into plain python objects, in a single pass and without serializing the element:
+        - None or a string for a leaf element,
+        - a dict for an element with children, the value is a list when a tag is repeated.
+        This matches what xmltodict.parse(na_element.to_string(), xml_attribs=False) returns.
+    '''
+    children = na_element.get_children()
+    text = na_element.get_content()
+    text = text.strip() if text else None
+    if not children:
+        return text or None
+    out = {}
+    for child in children:
+        key = _local_name(child)
+        value = zapi_to_dict(child)
+        if key not in out:
+            out[key] = value
+        elif isinstance(out[key], list):
+            out[key].append(value)
+        else:
+            out[key] = [out[key], value]
+    if text:
+        out['#text'] = text
+    return out
+
+
 def convert_keys(d_param):
     '''Method to convert hyphen to underscore'''
 
@@ -32,7 +32,7 @@ options:
   interface_name:
     description:
       - Specifies the logical interface (LIF) name.
-    required: true
+      - Required, unless migrate_interfaces is set.
     type: str
 
   home_node:
@@ -279,6 +279,34 @@ options:
     type: int
     version_added: 22.1.0
 
+  migrate_interfaces:
+    description:
+      - List of IP interfaces to migrate, for instance to evacuate a node.
+      - Each interface is migrated to current_node, and current_port if set.
+      - The new locations are confirmed with a single query for all interfaces.
+      - When interface_name is not set, the module only migrates these interfaces, and state must be present.
+      - vserver and ipspace, when set, are used to look up the interfaces.
+      - The module fails if several interfaces share the same name, for instance in different SVMs when vserver is not set.
+      - Only supported with REST.
+    type: list
+    elements: dict
+    version_added: 23.7.0
+    suboptions:
+      interface_name:
+        description:
+          - The name of the interface.
+        type: str
+        required: true
+      current_node:
+        description:
+          - The node the interface is migrated to.
+        type: str
+        required: true
+      current_port:
+        description:
+          - The port the interface is migrated to.
+        type: str
+
   lambda_config:
     description:
       - Configuration parameters for AWS Lambda proxy functionality.
@@ -303,6 +331,9 @@ options:
 notes:
   - REST support requires ONTAP 9.7 or later.
   - Support check_mode.
+  - With REST, the migration of an interface is checked every 10 seconds, for up to 120 seconds.
+  - With the feature flag C(lif_migrate_initial_interval), the first check happens after this delay in seconds,
+    and the delay is doubled up to 10 seconds.
   - Supports AWS Lambda proxy functionality when using REST. See README for example usage.
 '''
 
@@ -419,10 +450,30 @@ EXAMPLES = '''
     hostname: "{{ netapp_hostname }}"
     username: "{{ netapp_username }}"
     password: "{{ netapp_password }}"
+
+- name: Migrate several interfaces to node2
+  netapp.ontap.na_ontap_interface:
+    vserver: svm1
+    migrate_interfaces:
+      - interface_name: data1
+        current_node: node2
+      - interface_name: data2
+        current_node: node2
+        current_port: e0d
+    feature_flags:
+      lif_migrate_initial_interval: 0.2
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
 '''
 
 RETURN = """
-
+migrated_interfaces:
+  description: Names of the interfaces in migrate_interfaces that were not already at the desired location.
+  returned: when migrate_interfaces is set
+  type: list
+  elements: str
+  sample: ["data1", "data2"]
 """
 
 import time
@@ -438,6 +489,9 @@ FAILOVER_POLICIES = ['disabled', 'system-defined', 'local-only', 'sfo-partner-on
 FAILOVER_SCOPES = ['home_port_only', 'default', 'home_node_only', 'sfo_partners_only', 'broadcast_domain_only']
 REST_UNSUPPORTED_OPTIONS = ['is_ipv4_link_local']
 REST_IGNORABLE_OPTIONS = ['failover_group', 'force_subnet_association', 'listen_for_dns_query']
+# delay between two checks of the interface location, and total wait time, in seconds, when migrating an interface
+MIGRATE_POLL_INCREMENT = 10
+MIGRATE_TIMEOUT = 120
 
 
 class NetAppOntapInterface:
@@ -449,7 +503,7 @@ class NetAppOntapInterface:
         self.argument_spec.update(dict(
             state=dict(required=False, choices=[
                 'present', 'absent'], default='present'),
-            interface_name=dict(required=True, type='str'),
+            interface_name=dict(required=False, type='str'),
             interface_type=dict(type='str', choices=['fc', 'ip']),
             ipspace=dict(type='str'),
             broadcast_domain=dict(type='str'),
@@ -484,6 +538,11 @@ class NetAppOntapInterface:
             ignore_zapi_options=dict(required=False, type='list', elements='str', default=['force_subnet_association'], choices=REST_IGNORABLE_OPTIONS),
             probe_port=dict(required=False, type='int'),
             fail_if_subnet_conflicts=dict(required=False, type='bool'),
+            migrate_interfaces=dict(required=False, type='list', elements='dict', options=dict(
+                interface_name=dict(required=True, type='str'),
+                current_node=dict(required=True, type='str'),
+                current_port=dict(required=False, type='str'),
+            )),
         ))
         self.argument_spec.update(netapp_utils.na_ontap_lambda_argument_spec())
 
@@ -500,10 +559,15 @@ class NetAppOntapInterface:
             required_if=[
                 ['use_lambda', True, ('lambda_config',)]
             ],
+            required_one_of=[
+                ['interface_name', 'migrate_interfaces'],
+            ],
             supports_check_mode=True
         )
         self.na_helper = NetAppModule()
         self.parameters = self.na_helper.set_parameters(self.module.params)
+        if self.parameters.get('migrate_interfaces') and self.parameters.get('interface_name') is None and self.parameters['state'] == 'absent':
+            self.module.fail_json(msg='Error: state: absent requires interface_name, migrate_interfaces only migrates interfaces.')
         self.rest_api = OntapRestAPI(self.module)
         unsupported_rest_properties = [key for key in REST_IGNORABLE_OPTIONS if key not in self.parameters['ignore_zapi_options']]
         unsupported_rest_properties.extend(REST_UNSUPPORTED_OPTIONS)
@@ -530,7 +594,7 @@ class NetAppOntapInterface:
         else:
             if self.parameters.get('use_lambda'):
                 self.module.fail_json(msg="Error: AWS Lambda proxy for ONTAP APIs is only supported with REST.")
-            for option in ('probe_port', 'fail_if_subnet_conflicts'):
+            for option in ('probe_port', 'fail_if_subnet_conflicts', 'migrate_interfaces'):
                 if self.parameters.get(option) is not None:
                     self.module.fail_json(msg='Error option %s requires REST.' % option)
             if 'vserver' not in self.parameters:
@@ -1305,14 +1369,26 @@ class NetAppOntapInterface:
             self.module.fail_json(msg='Error modifying interface %s: %s' % (self.parameters['interface_name'], to_native(error)),
                                   exception=traceback.format_exc())
 
+    def get_migrate_poll_intervals(self):
+        ''' yield the delays between two checks of the interface location
+            by default, always wait MIGRATE_POLL_INCREMENT seconds.
+            with lif_migrate_initial_interval, start with this delay, then double it up to MIGRATE_POLL_INCREMENT.
+        '''
+        interval = min(netapp_utils.get_feature(self.module, 'lif_migrate_initial_interval') or MIGRATE_POLL_INCREMENT, MIGRATE_POLL_INCREMENT)
+        waited = 0
+        while waited < MIGRATE_TIMEOUT:
+            yield interval
+            waited += interval
+            interval = min(interval * 2, MIGRATE_POLL_INCREMENT)
+
     def migrate_interface_rest(self, uuid, body):
         # curiously, we sometimes need to send the request twice (well, always in my experience)
         errors = []
         desired_node = self.na_helper.safe_get(body, ['location', 'node', 'name'])
         desired_port = self.na_helper.safe_get(body, ['location', 'port', 'name'])
-        for __ in range(12):
+        for interval in self.get_migrate_poll_intervals():
             self.modify_interface_rest(uuid, body)
-            time.sleep(10)
+            time.sleep(interval)
             node, port, error = self.get_node_port(uuid)
             if error is None and desired_node in [None, node] and desired_port in [None, port]:
                 return
@@ -1321,7 +1397,66 @@ class NetAppOntapInterface:
         if errors:
             self.module.fail_json(msg='Errors waiting for migration to complete: %s' % ' - '.join(errors))
         else:
-            self.module.warn('Failed to confirm interface is migrated after 120 seconds')
+            self.module.warn('Failed to confirm interface is migrated after %d seconds' % MIGRATE_TIMEOUT)
+
+    @staticmethod
+    def get_migrate_body(migration):
+        if migration.get('current_port') is not None:
+            return {'location': {'port': {'name': migration['current_port'], 'node': {'name': migration['current_node']}}}}
+        return {'location': {'node': {'name': migration['current_node']}}}
+
+    def is_migrated(self, record, migration):
+        node = self.na_helper.safe_get(record, ['location', 'node', 'name'])
+        port = self.na_helper.safe_get(record, ['location', 'port', 'name'])
+        return node == migration['current_node'] and migration.get('current_port') in (None, port)
+
+    def get_interfaces_by_keys_rest(self, key, values, fields):
+        query = {}
+        if 'vserver' in self.parameters:
+            query['svm.name'] = self.parameters['vserver']
+        if 'ipspace' in self.parameters:
+            query['ipspace.name'] = self.parameters['ipspace']
+        # without vserver, interfaces with the same name in different SVMs or IPspaces would be confused
+        return rest_generic.get_records_by_keys(self.rest_api, 'network/ip/interfaces', key, values, query, fields, unique=True)
+
+    def migrate_interfaces_rest(self):
+        ''' migrate all the interfaces in migrate_interfaces, and confirm their new locations with a single query
+            return the names of the interfaces that needed to be migrated
+        '''
+        migrations = dict((migration['interface_name'], migration) for migration in self.parameters['migrate_interfaces'])
+        records, error = self.get_interfaces_by_keys_rest('name', list(migrations), 'name,uuid,location,svm.name')
+        if error:
+            hint = '' if 'vserver' in self.parameters else '  Set vserver to select the interfaces.'
+            self.module.fail_json(msg='Error fetching interfaces to migrate: %s%s' % (to_native(error), hint))
+        missing = [name for name in migrations if name not in records]
+        if missing:
+            self.module.fail_json(msg='Error: interfaces to migrate not found: %s' % ', '.join(missing))
+        # uuid: (name, migration)
+        pending = dict((records[name]['uuid'], (name, migration)) for name, migration in migrations.items()
+                       if not self.is_migrated(records[name], migration))
+        migrated = [name for name, dummy in pending.values()]
+        if not pending or self.module.check_mode:
+            return migrated
+        errors = []
+        for interval in self.get_migrate_poll_intervals():
+            # as for a single interface, the request may need to be sent again
+            for uuid, (name, migration) in pending.items():
+                dummy, error = rest_generic.patch_async(self.rest_api, 'network/ip/interfaces', uuid, self.get_migrate_body(migration))
+                if error:
+                    self.module.fail_json(msg='Error migrating interface %s: %s' % (name, to_native(error)))
+            time.sleep(interval)
+            records, error = self.get_interfaces_by_keys_rest('uuid', list(pending), 'location')
+            if error is not None:
+                errors.append(str(error))
+                continue
+            pending = dict((uuid, value) for uuid, value in pending.items() if not self.is_migrated(records.get(uuid), value[1]))
+            if not pending:
+                return migrated
+        names = ', '.join(sorted(name for name, dummy in pending.values()))
+        if errors:
+            self.module.fail_json(msg='Errors waiting for migration to complete: %s' % ' - '.join(errors))
+        self.module.warn('Failed to confirm interfaces are migrated after %d seconds: %s' % (MIGRATE_TIMEOUT, names))
+        return migrated
 
     def modify_interface(self, modify, uuid=None, body=None):
         """
@@ -1448,6 +1583,19 @@ class NetAppOntapInterface:
 
     def apply(self):
         ''' calling all interface features '''
+        cd_action, modify, extra_responses = None, None, None
+        if self.parameters.get('interface_name') is not None:
+            cd_action, modify = self.apply_interface()
+        if self.parameters.get('migrate_interfaces'):
+            migrated = self.migrate_interfaces_rest()
+            if migrated:
+                self.na_helper.changed = True
+            extra_responses = {'migrated_interfaces': migrated}
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, extra_responses=extra_responses)
+        self.module.exit_json(**result)
+
+    def apply_interface(self):
+        ''' create, delete, modify, or migrate the interface named interface_name '''
         cd_action, modify, rename, current = self.get_action()
         # build the payloads even in check_mode, to perform validations
         uuid, body, migrate_body = self.build_rest_payloads(cd_action, modify, current)
@@ -1471,9 +1619,7 @@ class NetAppOntapInterface:
                 if self.parameters.get('interface_type') == 'fc' and self.use_rest and self.rest_api.meets_rest_minimum_version(self.use_rest, 9, 8, 0):
                     self.module.fail_json(msg="Error: cannot migrate FC interface")
                 self.migrate_interface_rest(uuid, migrate_body)
-
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
-        self.module.exit_json(**result)
+        return cd_action, modify
 
 
 def main():
@@ -547,24 +547,34 @@ class NetAppOntapLUN:
                 self.module.fail_json(msg="Error: 'flexvol_name' option is required when using ZAPI.")
         return rest_app
 
-    def get_luns(self, lun_path=None):
+    def get_lun_name_pattern(self, name):
+        """
+        Return a query pattern matching a LUN by name in a volume.
+        name is either a full path, or the last component of the path, as in /vol/volume/qtree/name.
+        """
+        return name if name.startswith('/') else '*/%s' % name
+
+    def get_luns(self, lun_path=None, name=None):
         """
         Return list of LUNs matching vserver and volume names.
+        When lun_path or name is set, the LUNs are filtered by ONTAP, rather than reading every LUN in the volume.
 
         :return: list of LUNs in XML format.
         :rtype: list
         """
         if self.use_rest:
-            return self.get_luns_rest(lun_path)
+            return self.get_luns_rest(lun_path, name)
         luns = []
         tag = None
 
         query_details = netapp_utils.zapi.NaElement('lun-info')
         query_details.add_new_child('vserver', self.parameters['vserver'])
         if lun_path is not None:
-            query_details.add_new_child('lun_path', lun_path)
+            query_details.add_new_child('path', lun_path)
         else:
             query_details.add_new_child('volume', self.parameters['flexvol_name'])
+            if name is not None:
+                query_details.add_new_child('path', self.get_lun_name_pattern(name))
         query = netapp_utils.zapi.NaElement('query')
         query.add_child_elem(query_details)
 
@@ -631,18 +641,24 @@ class NetAppOntapLUN:
         :return: lun record
         :rtype: XML for ZAPI, dict for REST, or None if not found
         """
-        if luns:
-            for lun in luns:
-                path = lun['path']
-                if lun_path is None:
-                    if name == path:
-                        return lun
-                    _rest, _splitter, found_name = path.rpartition('/')
-                    if found_name == name:
-                        return lun
-                elif lun_path == path:
-                    return lun
-        return None
+        luns_by_path, luns_by_name = self.index_luns(luns)
+        if lun_path is not None:
+            return luns_by_path.get(lun_path)
+        lun = luns_by_path.get(name)
+        return luns_by_name.get(name) if lun is None else lun
+
+    @staticmethod
+    def index_luns(luns):
+        """
+        Index LUN records by path, and by the last component of the path.
+        When several LUNs share the same name in different qtrees, the first one is kept.
+        """
+        luns_by_path, luns_by_name = {}, {}
+        for lun in luns or []:
+            path = lun['path']
+            luns_by_path.setdefault(path, lun)
+            luns_by_name.setdefault(path.rpartition('/')[2], lun)
+        return luns_by_path, luns_by_name
 
     def get_lun_by_name(self, name):
         """
@@ -683,7 +699,7 @@ class NetAppOntapLUN:
         """
         if self.asa_r2_system:
             return self.get_lun_by_name(name)
-        luns = self.get_luns(lun_path)
+        luns = self.get_luns(lun_path, name)
         lun = self.find_lun(luns, name, lun_path)
         if lun is not None:
             return self.get_lun_details(lun)
@@ -1053,7 +1069,7 @@ class NetAppOntapLUN:
                 warning = "Ignoring increase: requested size is too small: %s" % details
         return warning
 
-    def get_luns_rest(self, lun_path=None):
+    def get_luns_rest(self, lun_path=None, name=None):
         if lun_path is None and self.parameters.get('flexvol_name') is None:
             return []
         api = 'storage/luns'
@@ -1064,6 +1080,8 @@ class NetAppOntapLUN:
             query['name'] = lun_path
         else:
             query['location.volume.name'] = self.parameters['flexvol_name']
+            if name is not None:
+                query['name'] = self.get_lun_name_pattern(name)
             if self.parameters.get('qtree_name') is not None:
                 query['location.qtree.name'] = self.parameters['qtree_name']
         record, error = rest_generic.get_0_or_more_records(self.rest_api, api, query)
@@ -479,35 +479,37 @@ class NetAppOntapPorts:
         missing_ports = []
         # list of uuid information of each desired port should present in broadcast domain.
         desired_ports = []
+        # one query per node, for all the ports on this node
+        ports_by_node = {}
         for port in ports:
-            current = self.get_net_port_rest(port)
-            if current is None:
+            if ':' not in port:
+                error_msg = "Error: Invalid value specified for port: %s, provide port name as node_name:port_name" % port
+                self.module.fail_json(msg=error_msg)
+            node_name, port_name = port.split(':')
+            ports_by_node.setdefault(node_name, []).append(port_name)
+        records = {}
+        for node_name, port_names in ports_by_node.items():
+            records[node_name] = self.get_net_ports_rest(node_name, port_names)
+        for port in ports:
+            node_name, port_name = port.split(':')
+            record = records[node_name].get(port_name)
+            if record is None:
                 missing_ports.append(port)
             else:
-                desired_ports.append(current)
+                desired_ports.append({'uuid': record['uuid'], 'name': '%s:%s' % (record['node']['name'], record['name'])})
         # Error if any of provided ports are not found.
         if missing_ports and self.parameters['state'] == 'present':
             self.module.fail_json(msg='Error: ports: %s not found' % ', '.join(missing_ports))
         return desired_ports
 
-    def get_net_port_rest(self, port):
-        if ':' not in port:
-            error_msg = "Error: Invalid value specified for port: %s, provide port name as node_name:port_name" % port
-            self.module.fail_json(msg=error_msg)
-        node_name, port_name = port.split(':')
+    def get_net_ports_rest(self, node_name, port_names):
         api = 'network/ethernet/ports'
-        query = {
-            'name': port_name,
-            'node.name': node_name,
-        }
-        fields = 'name,uuid'
-        record, error = rest_generic.get_one_record(self.rest_api, api, query, fields)
+        query = {'node.name': node_name}
+        fields = 'name,uuid,node.name'
+        records, error = rest_generic.get_records_by_keys(self.rest_api, api, 'name', port_names, query, fields)
         if error:
             self.module.fail_json(msg=error)
-        if record:
-            current = {'uuid': record['uuid'], 'name': '%s:%s' % (record['node']['name'], record['name'])}
-            return current
-        return None
+        return records
 
     def ports_to_add_from_desired(self, ports):
         ports_to_add = []
@@ -522,20 +524,23 @@ class NetAppOntapPorts:
         missing_lifs = []
         # dict with each key is lif name, value contains lif type - fc or ip and uuid.
         desired_lifs = {}
-        record, record2, error, error2 = None, None, None, None
+        records, records2, error, error2 = {}, {}, None, None
+        if self.parameters.get('portset_type') in [None, 'mixed', 'iscsi']:
+            records, error = self.get_san_lifs_type(san_lifs, 'ip')
+        if self.parameters.get('portset_type') in [None, 'mixed', 'fcp']:
+            records2, error2 = self.get_san_lifs_type(san_lifs, 'fc')
         for lif in san_lifs:
-            if self.parameters.get('portset_type') in [None, 'mixed', 'iscsi']:
-                record, error = self.get_san_lif_type(lif, 'ip')
-            if self.parameters.get('portset_type') in [None, 'mixed', 'fcp']:
-                record2, error2 = self.get_san_lif_type(lif, 'fc')
-            if error is None and error2 is not None and record:
+            record = records.get(lif) if records else None
+            record2 = records2.get(lif) if records2 else None
+            lif_error, lif_error2 = error, error2
+            if lif_error is None and lif_error2 is not None and record:
                 # ignore error on fc if ip interface is found
-                error2 = None
-            if error2 is None and error is not None and record2:
+                lif_error2 = None
+            if lif_error2 is None and lif_error is not None and record2:
                 # ignore error on ip if fc interface is found
-                error = None
-            if error or error2:
-                errors = [to_native(err) for err in (error, error2) if err]
+                lif_error = None
+            if lif_error or lif_error2:
+                errors = [to_native(err) for err in (lif_error, lif_error2) if err]
                 self.module.fail_json(msg='Error fetching lifs details for %s: %s' % (lif, ' - '.join(errors)),
                                       exception=traceback.format_exc())
             if record:
@@ -550,11 +555,10 @@ class NetAppOntapPorts:
             self.module.fail_json(msg=error_msg)
         return desired_lifs
 
-    def get_san_lif_type(self, lif, portset_type):
+    def get_san_lifs_type(self, lifs, portset_type):
         api = 'network/%s/interfaces' % portset_type
-        query = {'name': lif, 'svm.name': self.parameters['vserver']}
-        record, error = rest_generic.get_one_record(self.rest_api, api, query)
-        return record, error
+        query = {'svm.name': self.parameters['vserver']}
+        return rest_generic.get_records_by_keys(self.rest_api, api, 'name', lifs, query, 'name,uuid')
 
     def apply(self):
         if self.parameters['resource_type'] == 'broadcast_domain':
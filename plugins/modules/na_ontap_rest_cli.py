@@ -153,6 +153,7 @@ import traceback
 from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp import OntapRestAPI
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
 
 
 class NetAppONTAPCommandREST():
@@ -213,27 +214,13 @@ class NetAppONTAPCommandREST():
             self.module.fail_json(msg='Error: %s' % error)
         return message
 
-    def get_next_records(self, api):
-        """
-            Gather next set of ONTAP information for the specified api
-            Input for REST APIs call : (api, data)
-            return gather_info
-        """
-
-        gather_info, error = self.rest_api.get(api)
-
-        if error:
-            self.module.fail_json(msg=error)
-
-        return gather_info
-
     def get_all_records(self, message):
         """ Iteratively get all records """
 
         # If the response contains a next link, we need to gather all records
-        while message.get('_links', {}).get('next'):
-            next_api = message['_links']['next']['href']
-            gathered_info = self.get_next_records(next_api.replace('/api', ''))
+        for gathered_info, error in rest_generic.get_next_pages(self.rest_api, message):
+            if error:
+                self.module.fail_json(msg=error)
 
             # Update the message with the gathered info
             message['_links'] = gathered_info.get('_links', {})
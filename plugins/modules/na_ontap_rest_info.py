@@ -320,6 +320,59 @@ options:
       - if false, HAL-encoded links are disabled in the REST calls.
     default: true
     type: bool
+  parallelism:
+    description:
+      - Number of subsets fetched concurrently, sharing a pool of connections to the cluster.
+      - With the default value of 1, subsets are fetched one after the other.
+      - Results are reported in the same order, and errors are reported as if subsets were fetched one after the other.
+    default: 1
+    type: int
+    version_added: 23.7.0
+  prefetch_next_page:
+    description:
+      - When a subset spans several pages, request the next page while the current page is being processed.
+      - When not set, pages are only prefetched with C(output_file), as writing a page to the file overlaps with reading the next one.
+    type: bool
+    version_added: 23.7.0
+  max_records_auto_tune:
+    description:
+      - When a subset spans several pages, adjust the number of records requested for each page, starting with C(max_records).
+      - The value is adjusted based on the latency and size of the previous page, targetting about 2 seconds and 16 MB per page.
+    default: false
+    type: bool
+    version_added: 23.7.0
+  output_file:
+    description:
+      - When set, records are written to this file page by page as they are fetched, rather than returned in I(ontap_info).
+      - For each subset returning records, I(ontap_info) only reports C(num_records) and C(output_file).
+      - Other subsets, for instance C(cluster), are still returned in I(ontap_info).
+      - This keeps memory usage flat on the controller, regardless of the number of records.
+      - The file is overwritten if it exists.
+    type: str
+    version_added: 23.7.0
+  output_format:
+    description:
+      - Format of I(output_file).
+      - ndjson - one JSON document per line, with a C(subset) key for the subset name, and a C(record) key for the record.
+    choices: ['ndjson']
+    default: ndjson
+    type: str
+    version_added: 23.7.0
+  continue_on_error:
+    description:
+      - When true, an error while fetching a subset does not fail the module.
+      - The error is reported in the subset, using an C(error) key, and other subsets are still fetched.
+      - I(subset_status) reports the status, elapsed time in seconds, and number of records for each subset.
+    default: false
+    type: bool
+    version_added: 23.7.0
+  subset_timeout:
+    description:
+      - Maximum time in seconds to fetch all the records for a subset.
+      - It is checked between pages, and is also used as the timeout for each REST call, when lower than 60 seconds.
+      - When the timeout is reached, the module fails, unless I(continue_on_error) is true.
+    type: int
+    version_added: 23.7.0
   lambda_config:
     description:
       - Configuration parameters for AWS Lambda proxy functionality.
@@ -344,6 +397,17 @@ options:
 '''
 
 EXAMPLES = '''
+- name: Write all volume and LUN records to a file, one JSON document per line
+  netapp.ontap.na_ontap_rest_info:
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
+    gather_subset:
+      - storage/volumes
+      - storage/luns
+    fields: '*'
+    output_file: /tmp/ontap_inventory.ndjson
+
 - name: Run ONTAP gather facts for vserver info
   netapp.ontap.na_ontap_rest_info:
     hostname: "{{ netapp_hostname }}"
@@ -465,15 +529,59 @@ EXAMPLES = '''
       - 'not authorized for that command'
 
 # reports: {"cluster/nodes": {"error": {"code": "6", "message": "not authorized for that command"}}
+
+- name: Gather all subsets, reporting errors rather than failing
+  netapp.ontap.na_ontap_rest_info:
+    gather_subset:
+      - all
+    continue_on_error: true
+    subset_timeout: 300
+
+# reports: "subset_status": {"cluster/nodes": {"status": "success", "elapsed": 0.253, "num_records": 2},
+#                            "support/ems/events": {"status": "timeout", "elapsed": 301.2, "error": "Error: ..."}, ...}
 '''
 
 import codecs
+import json
+import threading
+import time
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils._text import to_text, to_bytes
+from ansible.module_utils._text import to_native, to_text, to_bytes
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp import OntapRestAPI
-from ansible_collections.netapp.ontap.plugins.module_utils import rest_owning_resource, rest_vserver
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic, rest_owning_resource, rest_vserver
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    HAS_FUTURES = True
+except ImportError:
+    # python 2.7
+    HAS_FUTURES = False
+
+
+class DeferredFailure(Exception):
+    ''' carries fail_json arguments from a worker thread to the main thread '''
+    pass
+
+
+class NdjsonWriter(object):
+    ''' write records to a file, one JSON document per line
+        writes are serialized, as subsets may be fetched from several threads
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.afile = open(path, 'w')
+
+    def write(self, subset, records):
+        lines = ''.join(json.dumps({'subset': subset, 'record': record}) + '\n' for record in records)
+        with self.lock:
+            self.afile.write(lines)
+        return len(records)
+
+    def close(self):
+        self.afile.close()
 
 
 class NetAppONTAPGatherInfo(object):
@@ -495,6 +603,13 @@ class NetAppONTAPGatherInfo(object):
             owning_resource=dict(type='dict', required=False),
             ignore_api_errors=dict(type='list', elements='str', required=False),
             hal_linking=dict(required=False, type='bool', default=True),
+            parallelism=dict(required=False, type='int', default=1),
+            prefetch_next_page=dict(required=False, type='bool'),
+            max_records_auto_tune=dict(required=False, type='bool', default=False),
+            output_file=dict(required=False, type='str'),
+            output_format=dict(required=False, type='str', choices=['ndjson'], default='ndjson'),
+            continue_on_error=dict(required=False, type='bool', default=False),
+            subset_timeout=dict(required=False, type='int'),
         ))
         self.argument_spec.update(netapp_utils.na_ontap_lambda_argument_spec())
 
@@ -510,8 +625,22 @@ class NetAppONTAPGatherInfo(object):
         self.na_helper = NetAppModule()
         self.parameters = self.na_helper.set_parameters(self.module.params)
         self.fields = ''
-
-        self.rest_api = OntapRestAPI(self.module)
+        if self.parameters['parallelism'] < 1:
+            self.module.fail_json(msg='Error: parallelism must be greater than or equal to 1, got: %d.' % self.parameters['parallelism'])
+        if self.parameters['parallelism'] > 1 and not HAS_FUTURES:
+            self.module.warn('parallelism requires python 3, fetching subsets one at a time.')
+            self.parameters['parallelism'] = 1
+        if self.parameters.get('subset_timeout') is not None and self.parameters['subset_timeout'] < 1:
+            self.module.fail_json(msg='Error: subset_timeout must be greater than or equal to 1, got: %d.' % self.parameters['subset_timeout'])
+        # errors are raised rather than reported while subsets are fetched in worker threads, or with continue_on_error
+        self.defer_errors = False
+        # when output_file is set, records are written page by page
+        self.writer = None
+        # with continue_on_error, status, elapsed time, and number of records for each subset
+        self.subset_status = {}
+
+        timeout = min(self.parameters.get('subset_timeout') or 60, 60)
+        self.rest_api = OntapRestAPI(self.module, timeout=timeout, pool_maxsize=self.parameters['parallelism'])
         self.rest_api.fail_if_not_rest_minimum_version('na_ontap_rest_info', 9, 6, 0)
 
     def get_subset_info(self, gather_subset_info, default_fields=None):
@@ -568,7 +697,13 @@ class NetAppONTAPGatherInfo(object):
             # Fail the module if error occurs from REST APIs call
             if int(error.get('code', 0)) == 6:
                 error = "Error: %s user is not authorized to make %s api call" % (self.parameters.get('username'), api)
-        self.module.fail_json(msg=error)
+        self.fail_json(msg=error)
+
+    def fail_json(self, **kwargs):
+        ''' fail the module, or defer the failure to the main thread when fetching subsets in worker threads '''
+        if self.defer_errors:
+            raise DeferredFailure(kwargs)
+        self.module.fail_json(**kwargs)
 
     @staticmethod
     def strip_dacls(response):
@@ -600,22 +735,7 @@ class NetAppONTAPGatherInfo(object):
         dummy, error = self.rest_api.wait_on_job(post_return['job'], increment=5)
         if error:
             # TODO: Handle errors that are not errors
-            self.module.fail_json(msg="%s" % error)
-
-    def get_next_records(self, api):
-        """
-            Gather next set of ONTAP information for the specified api
-            Input for REST APIs call : (api, data)
-            return gather_subset_info
-        """
-
-        data = {}
-        gather_subset_info, error = self.rest_api.get(api, data)
-
-        if error:
-            self.module.fail_json(msg=error)
-
-        return gather_subset_info
+            self.fail_json(msg="%s" % error)
 
     def private_cli_fields(self, api):
         '''
@@ -810,24 +930,30 @@ class NetAppONTAPGatherInfo(object):
             self.add_naa_id(subset_info)
         return subset_info
 
-    def get_ontap_subset_info_all(self, subset, default_fields, get_ontap_subset_info):
-        """ Iteratively get all records for a subset """
+    def get_ontap_subset_info_all(self, subset, default_fields, get_ontap_subset_info, deadline=None):
+        """ Iteratively get all records for a subset
+            deadline: when set, stop fetching pages and report an error after this time
+        """
         try:
             # Verify whether the supported subset passed
             specified_subset = get_ontap_subset_info[subset]
         except KeyError:
-            self.module.fail_json(msg="Specified subset %s is not found, supported subsets are %s" %
-                                  (subset, list(get_ontap_subset_info.keys())))
+            self.fail_json(msg="Specified subset %s is not found, supported subsets are %s" %
+                           (subset, list(get_ontap_subset_info.keys())))
         if 'api_call' not in specified_subset:
             specified_subset['api_call'] = subset
         subset_info = self.get_subset_info(specified_subset, default_fields)
 
-        if subset_info is not None and isinstance(subset_info, dict) and '_links' in subset_info:
-            while subset_info['_links'].get('next'):
-                # Get all the set of records if next link found in subset_info for the specified subset
-                next_api = subset_info['_links']['next']['href']
-                gathered_subset_info = self.get_next_records(next_api.replace('/api', ''))
+        if (self.writer is not None and subset != 'private/cli/vserver/security/file-directory'
+                and isinstance(subset_info, dict) and isinstance(subset_info.get('records'), list)):
+            return self.write_subset_info_all(subset, subset_info, deadline)
 
+        if subset_info is not None and isinstance(subset_info, dict) and '_links' in subset_info:
+            # Get all the set of records if next link found in subset_info for the specified subset
+            # the next page is fetched while the current page is being processed
+            for gathered_subset_info, error in self.get_next_pages(subset, subset_info, deadline):
+                if error:
+                    self.fail_json(msg=error)
                 # Update the subset info for the specified subset
                 subset_info['_links'] = gathered_subset_info['_links']
                 subset_info['records'].extend(gathered_subset_info['records'])
@@ -839,6 +965,37 @@ class NetAppONTAPGatherInfo(object):
 
         return self.augment_subset_info(subset, subset_info)
 
+    def get_next_pages(self, subset, subset_info, deadline=None):
+        tuner = rest_generic.MaxRecordsTuner(self.parameters['max_records']) if self.parameters['max_records_auto_tune'] else None
+        prefetch = self.parameters.get('prefetch_next_page')
+        if prefetch is None:
+            prefetch = self.writer is not None
+        pages = rest_generic.get_next_pages(self.rest_api, subset_info, prefetch=prefetch, tuner=tuner)
+        if deadline is None:
+            return pages
+        return self.check_deadline(subset, pages, deadline)
+
+    def check_deadline(self, subset, pages, deadline):
+        ''' stop following the next links once the deadline is reached '''
+        try:
+            for page, error in pages:
+                yield page, error
+                if error is None and time.time() > deadline:
+                    self.fail_json(msg='Error: timeout after %d seconds while fetching %s.' % (self.parameters['subset_timeout'], subset),
+                                   subset_timeout=self.parameters['subset_timeout'])
+        finally:
+            pages.close()
+
+    def write_subset_info_all(self, subset, subset_info, deadline=None):
+        """ write records page by page to output_file, only keeping the current page (and the next one when prefetching) in memory """
+        num_records = self.writer.write(subset, self.augment_subset_info(subset, subset_info)['records'])
+        if '_links' in subset_info:
+            for page, error in self.get_next_pages(subset, subset_info, deadline):
+                if error:
+                    self.fail_json(msg=error)
+                num_records += self.writer.write(subset, self.augment_subset_info(subset, page)['records'])
+        return {'num_records': num_records, 'output_file': self.writer.path}
+
     def apply(self):
         """
         Perform pre-checks, call functions and exit
@@ -1075,14 +1232,30 @@ class NetAppONTAPGatherInfo(object):
                 self.module.fail_json(msg="Error: fields: %s, only one subset will be allowed." % self.parameters.get('fields'))
         converted_subsets = self.convert_subsets()
 
+        if self.parameters.get('output_file'):
+            try:
+                self.writer = NdjsonWriter(self.parameters['output_file'])
+            except (IOError, OSError) as exc:
+                self.module.fail_json(msg='Error: cannot open output_file %s: %s' % (self.parameters['output_file'], to_native(exc)))
         result_message = {}
-        for subset in converted_subsets:
-            subset, default_fields = subset if isinstance(subset, list) else (subset, None)
-            result_message[subset] = self.get_ontap_subset_info_all(subset, default_fields, get_ontap_subset_info)
+        try:
+            for subset, subset_info in self.get_subsets_info(converted_subsets, get_ontap_subset_info):
+                result_message[subset] = subset_info
+        finally:
+            if self.writer is not None:
+                self.writer.close()
         for subset in unsupported_subsets:
             result_message[subset] = '%s requires ONTAP %s' % (subset, get_ontap_subset_info[subset]['version'])
 
         results = {'changed': False}
+        if self.writer is not None:
+            results['output_file'] = self.writer.path
+        if self.parameters['continue_on_error']:
+            # same order as ontap_info
+            results['subset_status'] = dict((subset, self.subset_status[subset]) for subset in result_message if subset in self.subset_status)
+            failed_subsets = [subset for subset, status in results['subset_status'].items() if status['status'] != 'success']
+            if failed_subsets:
+                self.module.warn('Errors fetching subsets: %s.  See subset_status for details.' % ', '.join(failed_subsets))
         if self.parameters.get('state') is not None:
             results['state'] = self.parameters['state']
             results['warnings'] = "option 'state' is deprecated."
@@ -1090,7 +1263,59 @@ class NetAppONTAPGatherInfo(object):
             new_dict = dict((key.replace('/', '_'), value) for (key, value) in result_message.items())
             new_dict = dict((key.replace('-', '_'), value) for (key, value) in new_dict.items())
             result_message = new_dict
-        self.module.exit_json(ontap_info=result_message, **results)
+            if 'subset_status' in results:
+                results['subset_status'] = dict((key.replace('/', '_').replace('-', '_'), value) for (key, value) in results['subset_status'].items())
+        self.module.exit_json(ontap_info=result_message, **netapp_utils.add_metrics(results))
+
+    def get_subsets_info(self, converted_subsets, get_ontap_subset_info):
+        """ return a list of (subset, subset_info) tuples, in the same order as converted_subsets
+            with parallelism > 1, subsets are fetched concurrently and the first error in subset order is reported
+        """
+        def get_one_subset_info(subset):
+            subset, default_fields = subset if isinstance(subset, list) else (subset, None)
+            start = time.time()
+            deadline = start + self.parameters['subset_timeout'] if self.parameters.get('subset_timeout') else None
+            if not self.parameters['continue_on_error']:
+                return subset, self.get_ontap_subset_info_all(subset, default_fields, get_ontap_subset_info, deadline)
+            try:
+                subset_info = self.get_ontap_subset_info_all(subset, default_fields, get_ontap_subset_info, deadline)
+                status = 'error' if isinstance(subset_info, dict) and 'error' in subset_info else 'success'
+            except DeferredFailure as exc:
+                subset_info = {'error': exc.args[0]['msg']}
+                status = 'timeout' if 'subset_timeout' in exc.args[0] else 'error'
+            self.subset_status[subset] = self.get_subset_status(subset_info, status, start)
+            return subset, subset_info
+
+        parallelism = min(self.parameters['parallelism'], len(converted_subsets))
+        if parallelism <= 1:
+            self.defer_errors = self.parameters['continue_on_error']
+            try:
+                return [get_one_subset_info(subset) for subset in converted_subsets]
+            finally:
+                self.defer_errors = False
+
+        self.defer_errors = True
+        try:
+            with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                futures = [executor.submit(get_one_subset_info, subset) for subset in converted_subsets]
+        finally:
+            self.defer_errors = False
+        subsets_info = []
+        for future in futures:
+            try:
+                subsets_info.append(future.result())
+            except DeferredFailure as exc:
+                self.module.fail_json(**exc.args[0])
+        return subsets_info
+
+    @staticmethod
+    def get_subset_status(subset_info, status, start):
+        subset_status = {'status': status, 'elapsed': round(time.time() - start, 3)}
+        if status != 'success':
+            subset_status['error'] = subset_info['error']
+        elif isinstance(subset_info, dict) and 'num_records' in subset_info:
+            subset_status['num_records'] = subset_info['num_records']
+        return subset_status
 
     def subset_version_warning(self, get_ontap_subset_info):
         # If a user requests a subset that their version of ONTAP does not support give them a warning (but don't fail)
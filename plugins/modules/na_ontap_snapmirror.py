@@ -351,6 +351,29 @@ options:
       - Only supported with REST.
     type: bool
     default: true
+  wait_for_relationships:
+    description:
+      - Wait for several SnapMirror relationships to be idle or quiesced, for instance after quiescing them asynchronously.
+      - The states of all the relationships are checked with a single query.
+      - When set, the module only waits, and options used to manage a relationship cannot be used.
+      - transferring_time_out or quiesced_time_out sets how long to wait.
+      - Only supported with REST.
+    type: dict
+    version_added: 23.7.0
+    suboptions:
+      destination_paths:
+        description:
+          - The destination paths of the relationships.
+        type: list
+        elements: str
+        required: true
+      status:
+        description:
+          - idle - wait for any transfer to complete.
+          - quiesced - wait for the relationships to be quiesced or paused.
+        type: str
+        choices: ['idle', 'quiesced']
+        default: idle
 
   lambda_config:
     description:
@@ -384,6 +407,10 @@ notes:
   - ONTAP supports either username/password or a SSL certificate for authentication.
   - ElementSW only supports username/password for authentication.
   - Supports AWS Lambda proxy functionality when using REST. See README for example usage.
+  - The state of a relationship is checked every 30 seconds when waiting for a transfer, or every 10 seconds when waiting for a quiesce.
+  - With the feature flag C(snapmirror_wait_initial_interval), the first check happens after this delay in seconds,
+    and the delay is doubled up to 30 or 10 seconds.
+  - With REST, only the state and transfer state are fetched when waiting.
 '''
 
 EXAMPLES = """
@@ -550,9 +577,26 @@ EXAMPLES = """
     password: "{{ password }}"
     https: true
     validate_certs: false
+
+- name: Wait for many relationships to be quiesced
+  netapp.ontap.na_ontap_snapmirror:
+    wait_for_relationships:
+      destination_paths: "{{ dr_destination_paths }}"
+      status: quiesced
+    quiesced_time_out: 600
+    feature_flags:
+      snapmirror_wait_initial_interval: 1
+    hostname: "{{ destination_hostname }}"
+    username: "{{ username }}"
+    password: "{{ password }}"
 """
 
 RETURN = """
+relationships:
+  description: mirror state and transfer status for each destination path in wait_for_relationships.
+  returned: when wait_for_relationships is set
+  type: dict
+  sample: {"svm1:vol1": {"mirror_state": "paused", "status": "quiesced"}}
 """
 
 import re
@@ -565,6 +609,11 @@ from ansible_collections.netapp.ontap.plugins.module_utils.netapp_elementsw_modu
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
 
+# options used to manage a relationship, that cannot be combined with wait_for_relationships
+WAIT_EXCLUSIVE_OPTIONS = ['source_endpoint', 'destination_endpoint', 'source_vserver', 'destination_vserver', 'source_volume', 'destination_volume',
+                          'source_path', 'destination_path', 'source_cluster', 'destination_cluster', 'schedule', 'policy', 'relationship_type',
+                          'max_transfer_rate', 'identity_preserve', 'identity_preservation', 'source_snapshot', 'create_destination', 'quick_resync']
+
 HAS_SF_SDK = netapp_utils.has_sf_sdk()
 try:
     import solidfire.common
@@ -646,6 +695,10 @@ class NetAppONTAPSnapmirror(object):
             quick_resync=dict(required=False, type='bool'),
             time_out=dict(required=False, type='int', default=30),
             wait_for_completion=dict(required=False, type='bool', default=True),
+            wait_for_relationships=dict(required=False, type='dict', options=dict(
+                destination_paths=dict(required=True, type='list', elements='str'),
+                status=dict(type='str', choices=['idle', 'quiesced'], default='idle'),
+            )),
         ))
         self.argument_spec.update(netapp_utils.na_ontap_lambda_argument_spec())
         # Add Lambda support to peer_options
@@ -666,7 +719,7 @@ class NetAppONTAPSnapmirror(object):
                 ('peer_options', 'source_username'),
                 ('peer_options', 'source_password'),
                 ('identity_preserve', 'identity_preservation')
-            ],
+            ] + [('wait_for_relationships', option) for option in WAIT_EXCLUSIVE_OPTIONS],
             required_if=[
                 ['use_lambda', True, ('lambda_config',)]
             ],
@@ -679,6 +732,8 @@ class NetAppONTAPSnapmirror(object):
 
         self.na_helper = NetAppModule()
         self.parameters = self.na_helper.set_parameters(self.module.params)
+        if self.parameters.get('wait_for_relationships') and (self.parameters['state'] == 'absent' or self.parameters['relationship_state'] == 'broken'):
+            self.module.fail_json(msg='Error: wait_for_relationships only waits, it cannot be used with state: absent or relationship_state: broken.')
         self.policy_type = None
         self.new_style = False
         # when deleting, ignore previous errors, but report them if delete fails
@@ -747,6 +802,8 @@ class NetAppONTAPSnapmirror(object):
             self.module.warn("'wait_for_completion' and 'time_out' parameters are only supported when using REST.")
         if self.parameters.get('identity_preservation'):
             self.module.fail_json(msg="Error: The option identity_preservation is supported only with REST.")
+        if self.parameters.get('wait_for_relationships'):
+            self.module.fail_json(msg="Error: The option wait_for_relationships is supported only with REST.")
         if not netapp_utils.has_netapp_lib():
             self.module.fail_json(msg=netapp_utils.netapp_lib_is_required())
         host_options = self.parameters['peer_options'] if self.parameters.get('connection_type') == 'ontap_elementsw' else None
@@ -815,16 +872,79 @@ class NetAppONTAPSnapmirror(object):
             return snap_info
         return None
 
+    def get_wait_intervals(self, increment, time_out):
+        ''' yield the delays between two checks of the relationship state, for a maximum of time_out seconds
+            by default, always wait increment seconds.
+            with snapmirror_wait_initial_interval, start with this delay, then double it up to increment.
+        '''
+        initial_interval = netapp_utils.get_feature(self.module, 'snapmirror_wait_initial_interval')
+        if initial_interval is not None and initial_interval <= 0:
+            self.module.fail_json(msg='Error: snapmirror_wait_initial_interval must be greater than 0, got: %s' % initial_interval)
+        interval = min(initial_interval or increment, increment)
+        waited = 0
+        while waited < time_out:
+            yield interval
+            waited += interval
+            interval = min(interval * 2, increment)
+
+    def snapmirror_get_status_rest(self, destinations):
+        ''' return the mirror state and transfer status for each destination path, using a single query
+            only the fields needed to check for a state change are requested
+        '''
+        api = 'snapmirror/relationships'
+        records, error = rest_generic.get_records_by_keys(self.rest_api, api, 'destination.path', destinations, fields='state,transfer.state')
+        if error:
+            self.module.fail_json(msg="Error getting SnapMirror %s: %s" % (', '.join(destinations), to_native(error)),
+                                  exception=traceback.format_exc())
+        # ONTAP may not report a path with the same case, index the records by the requested paths
+        records = dict((path.lower(), record) for path, record in records.items())
+        return dict((path, self.get_status_from_record(records[path.lower()])) for path in destinations if path.lower() in records)
+
+    def snapmirror_get_status_by_uuid_rest(self, uuid):
+        ''' return the mirror state and transfer status for the relationship with this uuid, or None if it is not found '''
+        api = 'snapmirror/relationships'
+        record, error = rest_generic.get_one_record(self.rest_api, api, {'uuid': uuid, 'fields': 'state,transfer.state'})
+        if error:
+            self.module.fail_json(msg="Error getting SnapMirror %s: %s" % (uuid, to_native(error)),
+                                  exception=traceback.format_exc())
+        return None if record is None else self.get_status_from_record(record)
+
+    def get_status_from_record(self, record):
+        return {'mirror_state': record.get('state'), 'status': self.na_helper.safe_get(record, ['transfer', 'state'])}
+
+    def snapmirror_get_status(self):
+        ''' return the mirror state and transfer status, or None if the relationship is not found '''
+        if not self.use_rest:
+            return self.snapmirror_get()
+        if self.parameters.get('uuid') is not None:
+            # the uuid identifies the relationship, whatever the form of the destination path reported by ONTAP
+            current = self.snapmirror_get_status_by_uuid_rest(self.parameters['uuid'])
+        else:
+            destination = self.parameters.get('destination_path')
+            current = self.snapmirror_get_status_rest([destination]).get(destination)
+        if current is not None:
+            self.parameters['current_mirror_state'] = current['mirror_state']
+            self.parameters['current_transfer_status'] = current['status']
+        return current
+
+    @staticmethod
+    def is_idle(current):
+        return current is not None and current['status'] != 'transferring'
+
+    @staticmethod
+    def is_quiesced(current):
+        return current is not None and (current['status'] == 'quiesced' or current['mirror_state'] == 'paused')
+
     def wait_for_idle_status(self):
         # sleep for a maximum of X seconds (with a default of 5 minutes), in 30 seconds increments
         transferring_time_out = self.parameters['transferring_time_out']
         increment = 30
         if transferring_time_out <= 0:
             return self.snapmirror_get()
-        for __ in range(0, transferring_time_out, increment):
-            time.sleep(increment)
-            current = self.snapmirror_get()
-            if current and current['status'] != 'transferring':
+        for interval in self.get_wait_intervals(increment, transferring_time_out):
+            time.sleep(interval)
+            current = self.snapmirror_get_status()
+            if self.is_idle(current):
                 return current
         self.module.warn('SnapMirror relationship is still transferring after %d seconds.' % transferring_time_out)
         return current
@@ -833,13 +953,49 @@ class NetAppONTAPSnapmirror(object):
         # sleep for a maximum of X seconds (with a default of 5 minutes), in 10 seconds increments
         quiesced_time_out = self.parameters['quiesced_time_out']
         increment = 10
-        for __ in range(0, quiesced_time_out, increment):
-            time.sleep(increment)
-            sm_info = self.snapmirror_get()
-            if sm_info and (sm_info['status'] == 'quiesced' or sm_info['mirror_state'] == 'paused'):
+        for interval in self.get_wait_intervals(increment, quiesced_time_out):
+            time.sleep(interval)
+            if self.is_quiesced(self.snapmirror_get_status()):
                 return
         self.module.fail_json(msg='Taking a long time to quiesce SnapMirror relationship after %d seconds, try again later' % quiesced_time_out)
 
+    def wait_for_deleted_status(self, uuid, time_out):
+        ''' return True if the relationship with this uuid is gone before time_out seconds '''
+        for interval in self.get_wait_intervals(30, time_out):
+            time.sleep(interval)
+            if self.snapmirror_get_status_by_uuid_rest(uuid) is None:
+                return True
+        return False
+
+    def wait_for_relationships_rest(self):
+        ''' wait for all relationships in wait_for_relationships to be idle or quiesced
+            a single query reports the states of all the relationships still pending
+        '''
+        destinations = self.parameters['wait_for_relationships']['destination_paths']
+        quiesced = self.parameters['wait_for_relationships']['status'] == 'quiesced'
+        if quiesced:
+            is_done, increment, time_out = self.is_quiesced, 10, self.parameters['quiesced_time_out']
+        else:
+            is_done, increment, time_out = self.is_idle, 30, self.parameters['transferring_time_out']
+        states = self.snapmirror_get_status_rest(destinations)
+        missing = [path for path in destinations if path not in states]
+        if missing:
+            self.module.fail_json(msg='Error: SnapMirror relationships not found for destination paths: %s' % ', '.join(missing))
+        pending = [path for path in destinations if not is_done(states[path])]
+        for interval in self.get_wait_intervals(increment, time_out):
+            if not pending:
+                break
+            time.sleep(interval)
+            current = self.snapmirror_get_status_rest(pending)
+            states.update(current)
+            pending = [path for path in pending if not is_done(current.get(path))]
+        if pending and quiesced:
+            self.module.fail_json(msg='Taking a long time to quiesce SnapMirror relationships after %d seconds, try again later: %s'
+                                  % (time_out, ', '.join(pending)), relationships=states)
+        if pending:
+            self.module.warn('SnapMirror relationships are still transferring after %d seconds: %s' % (time_out, ', '.join(pending)))
+        return states
+
     def check_if_remote_volume_exists(self):
         """
         Validate existence of source volume
@@ -1564,7 +1720,8 @@ class NetAppONTAPSnapmirror(object):
         while retry > 0:
             dummy, error = rest_generic.delete_async(self.rest_api, api, uuid, query, job_timeout=timeout)
             if error and 'Timeout error: Process still running' in error:
-                time.sleep(120)
+                if self.wait_for_deleted_status(uuid, 120):
+                    return
                 retry -= 1
             elif error:
                 msg = 'Error deleting SnapMirror: %s' % to_native(error)
@@ -1822,6 +1979,8 @@ class NetAppONTAPSnapmirror(object):
         """
         Apply action to SnapMirror
         """
+        if self.parameters.get('wait_for_relationships'):
+            self.module.exit_json(**netapp_utils.add_metrics(dict(changed=False, relationships=self.wait_for_relationships_rest())))
         # source is ElementSW
         if self.parameters['state'] == 'present' and self.parameters.get('connection_type') == 'elementsw_ontap':
             self.check_elementsw_parameters()
@@ -1853,7 +2012,7 @@ class NetAppONTAPSnapmirror(object):
         results = dict(changed=self.na_helper.changed)
         if actions:
             results['actions'] = actions
-        self.module.exit_json(**results)
+        self.module.exit_json(**netapp_utils.add_metrics(results))
 
 
 def main():
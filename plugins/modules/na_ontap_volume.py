@@ -1173,8 +1173,55 @@ import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_ut
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 from ansible_collections.netapp.ontap.plugins.module_utils.rest_application import RestApplication
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_jobs
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_vserver
 
+EFFICIENCY_DISABLED_ERROR = 'You are trying to set the efficiency configuration for the volume, where efficiency is disabled. '\
+                            'Please refer to module na_ontap_volume_efficiency to enable efficiency on the volume first.'
+
+# REST fields always requested, as they drive the module logic: online/offline, backend, unmount before delete, resize.
+REST_BASE_FIELDS = ('uuid', 'state', 'style', 'type', 'nas.path', 'space.size')
+
+# REST fields to request when an option is set, see format_get_volume_rest for the mapping to current.
+REST_FIELDS_FOR_OPTIONS = {
+    'activity_tracking': ('activity_tracking',),
+    'aggregate_name': ('aggregates.name', 'aggregates.uuid'),
+    'analytics': ('analytics',),
+    'anti_ransomware': ('anti_ransomware',),
+    'atime_update': ('access_time_enabled',),
+    'comment': ('comment',),
+    'compression': ('efficiency.compression',),
+    'efficiency_policy': ('efficiency.policy.name',),
+    'encrypt': ('encryption.enabled',),
+    'export_policy': ('nas.export_policy.name',),
+    'granular_data': ('granular_data',),
+    'group_id': ('nas.gid',),
+    'inline_compression': ('efficiency.compression',),
+    'large_size_enabled': ('space.large_size_enabled',),
+    'logical_space_enforcement': ('space.logical_space.enforcement',),
+    'logical_space_reporting': ('space.logical_space.reporting',),
+    'max_files': ('files.maximum',),
+    'nas_application_template': ('aggregates.name', 'aggregates.uuid'),
+    'percent_snapshot_space': ('space.snapshot.reserve_percent',),
+    'qos_adaptive_policy_group': ('qos.policy.name',),
+    'qos_policy_group': ('qos.policy.name',),
+    'snapdir_access': ('snapshot_directory_access_enabled',),
+    'snaplock': ('snaplock',),
+    'snapshot_auto_delete': ('space.snapshot.autodelete',),
+    'snapshot_locking': ('snapshot_locking_enabled',),
+    'snapshot_policy': ('snapshot_policy',),
+    'space_guarantee': ('guarantee.type',),
+    'tags': ('_tags',),
+    'tiering_minimum_cooling_days': ('tiering.min_cooling_days',),
+    'tiering_object_tags': ('tiering.object_tags',),
+    'tiering_policy': ('tiering.policy',),
+    'unix_permissions': ('nas.unix_permissions',),
+    'user_id': ('nas.uid',),
+    'vol_full_threshold_percent': ('space.full_threshold_percent',),
+    'vol_nearly_full_threshold_percent': ('space.nearly_full_threshold_percent',),
+    'volume_security_style': ('nas.security_style',),
+}
+
 
 class NetAppOntapVolume:
     '''Class with volume operations'''
@@ -1330,6 +1377,7 @@ class NetAppOntapVolume:
         self.parameters = self.na_helper.check_and_set_parameters(self.module)
         self.volume_style = None
         self.volume_created = False
+        self.job_tracker = None
         self.issues = []
         self.sis_keys2zapi_get = dict(
             efficiency_policy='policy',
@@ -2681,6 +2729,7 @@ class NetAppOntapVolume:
         return modify
 
     def take_modify_actions(self, modify):
+        self.job_tracker = self.get_job_tracker(modify)
         self.modify_volume(modify)
 
         if any(modify.get(key) is not None for key in self.sis_keys2zapi_get):
@@ -2690,6 +2739,9 @@ class NetAppOntapVolume:
                 efficiency_config_modify = 'sync'
             self.modify_volume_efficiency_config(efficiency_config_modify)
 
+        if self.job_tracker is not None:
+            self.wait_for_modify_jobs()
+
         # offline volume last
         if modify.get('is_online') is False:
             self.change_volume_state()
@@ -2739,60 +2791,7 @@ class NetAppOntapVolume:
         api = 'storage/volumes'
         params = {'name': vol_name,
                   'svm.name': self.parameters['vserver'],
-                  'fields': 'encryption.enabled,'
-                            'tiering.policy,'
-                            'tiering.object_tags,'
-                            'nas.export_policy.name,'
-                            'aggregates.name,'
-                            'aggregates.uuid,'
-                            'uuid,'
-                            'nas.path,'
-                            'style,'
-                            'type,'
-                            'comment,'
-                            'qos.policy.name,'
-                            'nas.security_style,'
-                            'nas.gid,'
-                            'nas.unix_permissions,'
-                            'nas.uid,'
-                            'snapshot_policy,'
-                            'space.snapshot.reserve_percent,'
-                            'space.size,'
-                            'guarantee.type,'
-                            'state,'
-                            'efficiency.compression,'
-                            'snaplock,'
-                            'files.maximum,'
-                            'space.logical_space.enforcement,'
-                            'space.logical_space.reporting,'}
-        if self.parameters.get('efficiency_policy'):
-            params['fields'] += 'efficiency.policy.name,'
-        if self.parameters.get('tiering_minimum_cooling_days'):
-            params['fields'] += 'tiering.min_cooling_days,'
-        if self.parameters.get('analytics'):
-            params['fields'] += 'analytics,'
-        if self.parameters.get('activity_tracking'):
-            params['fields'] += 'activity_tracking,'
-        if self.parameters.get('tags'):
-            params['fields'] += '_tags,'
-        if self.parameters.get('atime_update') is not None:
-            params['fields'] += 'access_time_enabled,'
-        if self.parameters.get('snapdir_access') is not None:
-            params['fields'] += 'snapshot_directory_access_enabled,'
-        if self.parameters.get('snapshot_auto_delete') is not None:
-            params['fields'] += 'space.snapshot.autodelete,'
-        if self.parameters.get('vol_nearly_full_threshold_percent') is not None:
-            params['fields'] += 'space.nearly_full_threshold_percent,'
-        if self.parameters.get('vol_full_threshold_percent') is not None:
-            params['fields'] += 'space.full_threshold_percent,'
-        if self.parameters.get('large_size_enabled') is not None:
-            params['fields'] += 'space.large_size_enabled,'
-        if self.parameters.get('snapshot_locking') is not None:
-            params['fields'] += 'snapshot_locking_enabled,'
-        if self.parameters.get('granular_data') is not None:
-            params['fields'] += 'granular_data,'
-        if self.parameters.get('anti_ransomware') is not None:
-            params['fields'] += 'anti_ransomware,'
+                  'fields': rest_generic.get_fields_for_options(self.parameters, REST_FIELDS_FOR_OPTIONS, REST_BASE_FIELDS)}
 
         record, error = rest_generic.get_one_record(self.rest_api, api, params)
         if error:
@@ -3067,10 +3066,8 @@ class NetAppOntapVolume:
             return
         dummy, error = self.volume_rest_patch(body)
         if error:
-            if "Failed to modify efficiency configuration for volume" in error and "Operation is not enabled" in error \
-                    and "'code': '6881332'" in error:
-                self.module.fail_json(msg=('You are trying to set the efficiency configuration for the volume, where efficiency is disabled. '
-                                           'Please refer to module na_ontap_volume_efficiency to enable efficiency on the volume first.'))
+            if self.is_efficiency_disabled_error(error):
+                self.module.fail_json(msg=EFFICIENCY_DISABLED_ERROR)
             self.module.fail_json(msg='Error setting efficiency for volume %s: %s' % (self.parameters['name'], to_native(error)),
                                   exception=traceback.format_exc())
 
@@ -3113,11 +3110,37 @@ class NetAppOntapVolume:
         if self.parameters.get('wait_for_completion'):
             self.wait_for_volume_move_rest()
 
+    def get_job_tracker(self, modify):
+        ''' with the concurrent_jobs feature flag, the attributes and efficiency PATCH requests are sent without waiting,
+            and their jobs are polled together.
+            Mount, resize, move, and encryption changes depend on the previous changes, they are still run one at a time.
+        '''
+        if not self.use_rest or not netapp_utils.has_feature(self.module, 'concurrent_jobs') \
+                or any(key in modify for key in ('junction_path', 'size', 'aggregate_name', 'encrypt')):
+            return None
+        increment = min(max(self.parameters['time_out'] / 6, 5), 60)
+        return rest_jobs.JobTracker(self.rest_api, timeout=self.parameters['time_out'], increment=increment)
+
+    def wait_for_modify_jobs(self):
+        errors = [error for dummy, error in self.job_tracker.get_errors()]
+        self.job_tracker = None
+        if any(self.is_efficiency_disabled_error(error) for error in errors):
+            self.module.fail_json(msg=EFFICIENCY_DISABLED_ERROR)
+        if errors:
+            self.module.fail_json(msg='Error modifying volume %s: %s' % (self.parameters['name'], ' -- '.join(errors)))
+
+    @staticmethod
+    def is_efficiency_disabled_error(error):
+        return "Failed to modify efficiency configuration for volume" in error and "Operation is not enabled" in error and "'code': '6881332'" in error
+
     def volume_rest_patch(self, body, query=None, uuid=None):
         if not uuid:
             uuid = self.parameters['uuid']
         if not uuid:
             self.module.fail_json(msg='Could not read UUID for volume %s in patch.' % self.parameters['name'])
+        if self.job_tracker is not None:
+            # the job is tracked, errors are reported by wait_for_modify_jobs
+            return None, self.job_tracker.submit(', '.join(sorted(body)), 'PATCH', 'storage/volumes', body, query, uuid)
         return rest_generic.patch_async(self.rest_api, 'storage/volumes', uuid, body, query=query, job_timeout=self.parameters['time_out'])
 
     def get_qos_policy_group(self):
@@ -3367,7 +3390,8 @@ class NetAppOntapVolume:
 
     def apply(self):
         '''Call create/modify/delete operations'''
-        actions, current, modify = self.set_actions()
+        with netapp_utils.TRACER.span('volume.get'):
+            actions, current, modify = self.set_actions()
         is_online = current.get('is_online') if current else None
         response = None
 
@@ -3398,23 +3422,28 @@ class NetAppOntapVolume:
                 for field in ['volume_security_style', 'group_id', 'user_id', 'percent_snapshot_space']:
                     if self.parameters.get(field) is not None:
                         modify[field] = self.parameters[field]
-                self.change_volume_state()
+                with netapp_utils.TRACER.span('volume.online'):
+                    self.change_volume_state()
             if 'rename' in actions:
-                self.rename_volume()
+                with netapp_utils.TRACER.span('volume.rename'):
+                    self.rename_volume()
             if 'rehost' in actions:
                 # REST DOES NOT have a volume-rehost equivalent
                 self.rehost_volume()
             if 'snapshot_restore' in actions:
-                self.snapshot_restore_volume()
+                with netapp_utils.TRACER.span('volume.snapshot_restore'):
+                    self.snapshot_restore_volume()
             if 'create' in actions:
-                response = self.create_volume()
+                with netapp_utils.TRACER.span('volume.create'):
+                    response = self.create_volume()
                 # if we create using ZAPI and modify only options are set (snapdir_access or atime_update), we need to run a modify.
                 # The modify also takes care of efficiency (sis) parameters and snapshot_auto_delete.
                 # If we create using REST application, some options are not available, we may need to run a modify.
                 # If we create using REST and modify only options are set (snapdir_access or atime_update or snapshot_auto_delete), we need to run a modify.
                 # For modify only options to be set after creation wait_for_completion needs to be set.
                 # volume should be online for modify.
-                current = self.get_volume()
+                with netapp_utils.TRACER.span('volume.get'):
+                    current = self.get_volume()
                 if current:
                     self.volume_created = True
                     modify = self.set_modify_dict(current, after_create=True)
@@ -3428,10 +3457,12 @@ class NetAppOntapVolume:
                 self.na_helper.changed = True
             if 'delete' in actions:
                 self.parameters['uuid'] = current['uuid']
-                self.delete_volume(current)
+                with netapp_utils.TRACER.span('volume.delete'):
+                    self.delete_volume(current)
             if 'modify' in actions:
                 self.parameters['uuid'] = current['uuid']
-                self.take_modify_actions(modify)
+                with netapp_utils.TRACER.span('volume.modify', {'ontap.modify': ', '.join(sorted(modify))}):
+                    self.take_modify_actions(modify)
 
         result = netapp_utils.generate_result(self.na_helper.changed, actions, modify, response)
         self.module.exit_json(**result)
@@ -0,0 +1,155 @@
+# Copyright (c) 2026 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils metrics.py, and metrics collection in netapp.py '''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import pytest
+import sys
+
+from ansible.module_utils import basic
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils import metrics
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import create_module, expect_and_capture_ansible_exception
+
+if sys.version_info < (3, 5):
+    pytestmark = pytest.mark.skip('Skipping Unit Tests on python < 3.5')
+
+DEFAULT_ARGS = {
+    'hostname': 'test',
+    'username': 'test_user',
+    'password': 'test_pass!',
+    'feature_flags': {'collect_metrics': True},
+}
+
+UUID = 'fde79888-692a-11ea-80c2-005056b39fe7'
+ZAPI_RESPONSE = b"<netapp version='1.110' xmlns='http://www.netapp.com/filer/admin'><results status='passed'><name>vol1</name></results></netapp>"
+
+
+class MockONTAPModule:
+    def __init__(self):
+        self.module = basic.AnsibleModule(netapp_utils.na_ontap_host_argument_spec())
+
+
+class mockResponse:
+    def __init__(self, json_data, status_code=200):
+        self.json_data = json_data
+        self.status_code = status_code
+        self.content = json_data
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.json_data
+
+
+class mockOpener:
+    def __init__(self, error=None):
+        self.error = error
+
+    def open(self, request, timeout=None):
+        if self.error:
+            raise self.error
+        return io.BytesIO(ZAPI_RESPONSE)
+
+
+def create_restapi_object(module_args=None):
+    module = create_module(MockONTAPModule, DEFAULT_ARGS, module_args)
+    return netapp_utils.OntapRestAPI(module.module)
+
+
+def test_get_endpoint():
+    assert metrics.get_endpoint('/storage/volumes/%s/snapshots?fields=name' % UUID) == 'storage/volumes/{uuid}/snapshots'
+    assert metrics.get_endpoint('cluster') == 'cluster'
+
+
+def test_get_bucket_and_size():
+    assert metrics.get_bucket(0.001) == '0.01'
+    assert metrics.get_bucket(0.3) == '0.5'
+    assert metrics.get_bucket(60) == '+Inf'
+    assert metrics.get_size(None) == 0
+    assert metrics.get_size(b'abc') == 3
+    assert metrics.get_size({'a': 1}) == 8
+    assert metrics.get_size(object()) == 0
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_rest_metrics(mock_request, mock_sleep):
+    mock_request.side_effect = [
+        mockResponse({'records': [{'uuid': UUID}], 'num_records': 1}),
+        mockResponse({'job': {'uuid': UUID, '_links': {'self': {'href': '/api/cluster/jobs/%s' % UUID}}}}, 202),
+        mockResponse({'state': 'running'}),
+        mockResponse({'state': 'running'}),
+        mockResponse({'state': 'success', 'message': 'done'}),
+        mockResponse({'error': {'message': 'Expected error', 'code': 6}}, 400),
+    ]
+    rest_api = create_restapi_object()
+    rest_api.get('storage/volumes', {'name': 'vol1'})
+    message, error = rest_api.patch('storage/volumes/%s' % UUID, {'size': 1024})
+    assert error is None
+    assert rest_api.wait_on_job(message['job'], increment=2) == ('done', None)
+    rest_api.delete('storage/volumes/%s' % UUID)
+    result = netapp_utils.generate_result(True)
+    report = result['metrics']
+    assert report['rest']['calls'] == 6
+    assert report['rest']['errors'] == 1
+    assert report['rest']['bytes_out'] == len('{"size": 1024}')
+    assert sum(report['rest']['latency_histogram'].values()) == 6
+    endpoints = report['rest']['endpoints']
+    assert endpoints['GET storage/volumes']['calls'] == 1
+    assert endpoints['GET storage/volumes']['bytes_in'] > 0
+    assert endpoints['PATCH storage/volumes/{uuid}']['calls'] == 1
+    assert endpoints['GET cluster/jobs/{uuid}']['calls'] == 3
+    assert endpoints['DELETE storage/volumes/{uuid}']['errors'] == 1
+    # 0.1 + 0.2 seconds with the adaptive policy
+    assert report['jobs'] == {'waits': 1, 'polls': 3, 'sleep_time': 0.3}
+    assert 'zapi' not in report
+
+
+@patch('requests.Session.request')
+def test_rest_metrics_with_cache(mock_request, tmp_path):
+    mock_request.return_value = mockResponse({'name': 'cluster1'})
+    rest_api = create_restapi_object({'feature_flags': {'collect_metrics': True, 'rest_cache_dir': str(tmp_path)}})
+    rest_api.get('cluster')
+    rest_api.get('cluster')
+    report = netapp_utils.METRICS.report()
+    assert report['rest']['calls'] == 1
+    assert report['rest']['cache_hits'] == 1
+
+
+@patch('requests.Session.request')
+def test_metrics_are_enabled_per_module(mock_request):
+    mock_request.return_value = mockResponse({'name': 'cluster1'})
+    rest_api = create_restapi_object()
+    rest_api.get('cluster')
+    assert netapp_utils.METRICS.report()['rest']['calls'] == 1
+    # another module, counters are reset when collection is enabled again
+    rest_api = create_restapi_object({'feature_flags': {}})
+    rest_api.get('cluster')
+    assert 'metrics' not in netapp_utils.generate_result(False)
+    rest_api = create_restapi_object()
+    assert 'rest' not in netapp_utils.METRICS.report()
+
+
+@pytest.mark.skipif(not netapp_utils.has_netapp_lib(), reason="skipping as missing required netapp_lib")
+def test_zapi_metrics():
+    module = create_module(MockONTAPModule, DEFAULT_ARGS)
+    server = netapp_utils.setup_na_ontap_zapi(module.module)
+    server._refresh_conn = False
+    server._opener = mockOpener()
+    result = server.invoke_successfully(netapp_utils.zapi.NaElement('volume-get-iter'), True)
+    assert result.get_child_content('name') == 'vol1'
+    server._opener = mockOpener(netapp_utils.zapi.urllib.error.URLError('connection refused'))
+    expect_and_capture_ansible_exception(server.invoke_successfully, netapp_utils.zapi.NaApiError, netapp_utils.zapi.NaElement('volume-get-iter'))
+    report = netapp_utils.generate_result(False)['metrics']
+    assert report['zapi']['calls'] == 2
+    assert report['zapi']['errors'] == 1
+    assert report['zapi']['bytes_in'] == len(ZAPI_RESPONSE)
+    assert report['zapi']['bytes_out'] > 0
+    assert report['zapi']['endpoints']['volume-get-iter']['calls'] == 2
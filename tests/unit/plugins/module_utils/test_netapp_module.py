@@ -7,12 +7,13 @@ import copy
 __metaclass__ = type
 
 import pytest
+import random
 import sys
 
 from ansible.module_utils import basic
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
-from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule as na_helper, cmp as na_cmp
+from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule as na_helper, cmp as na_cmp, get_hashable_key
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
     assert_no_warnings, assert_warning_was_raised, clear_warnings, patch_ansible, create_module, expect_and_capture_ansible_exception
@@ -284,6 +285,91 @@ def test_get_modified_attributes_for_desired_list_with_duplicates_diff():
     assert result == {'schedule': ['hourly', 'daily', 'daily']}
 
 
+def legacy_compare_lists(current, desired, get_list_diff):
+    ''' previous implementation, O(n*m) '''
+    current_copy = copy.deepcopy(current)
+    desired_copy = copy.deepcopy(desired)
+    desired_diff_list = []
+    for item in desired:
+        if item in current_copy:
+            current_copy.remove(item)
+        else:
+            desired_diff_list.append(item)
+    current_diff_list = []
+    for item in current:
+        if item in desired_copy:
+            desired_copy.remove(item)
+        else:
+            current_diff_list.append(item)
+    if desired_diff_list or current_diff_list:
+        return desired_diff_list if get_list_diff else desired
+    return None
+
+
+def test_compare_lists_matches_previous_implementation():
+    rng = random.Random(1234)
+    values = ['a', 'A', 1, 1.0, True, None, (1, 2), [1, 2], {'x': [1, {'y': 2}]}, {'x': [1, {'y': 3}]}, {'x': (1, 2)}, {'x': [1, 2]}, {1, 2}]
+    for dummy in range(500):
+        current = [rng.choice(values) for dummy in range(rng.randint(0, 6))]
+        desired = [rng.choice(values) for dummy in range(rng.randint(0, 6))]
+        for get_list_diff in (True, False):
+            assert na_helper.compare_lists(current, desired, get_list_diff) == legacy_compare_lists(current, desired, get_list_diff)
+
+
+class Unhashable(object):
+    __hash__ = None
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Unhashable) and self.value == other.value
+
+
+def test_compare_lists_with_unhashable_elements():
+    with pytest.raises(TypeError):
+        get_hashable_key([Unhashable(1)])
+    current = [Unhashable(1), Unhashable(2)]
+    assert na_helper.compare_lists(current, [Unhashable(2), Unhashable(1)], True) is None
+    desired = [Unhashable(2), Unhashable(3)]
+    assert na_helper.compare_lists(current, desired, True) == desired[1:]
+    assert na_helper.compare_lists(current, desired, False) == desired
+
+
+def test_get_hashable_key():
+    assert get_hashable_key({'a': [1, {'b': 2}]}) == get_hashable_key({'a': [1, {'b': 2}]})
+    assert get_hashable_key({'a': [1, 2]}) != get_hashable_key({'a': (1, 2)})
+    assert get_hashable_key([1, 2]) != get_hashable_key((1, 2))
+    assert get_hashable_key({'a': 1}) != get_hashable_key(frozenset([('a', 1)]))
+
+
+def compare_lists_by_equality_only(current, desired, get_list_diff):
+    ''' force the fallback path, as if no element could be hashed '''
+    with patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp_module.get_hashable_key', side_effect=TypeError):
+        return na_helper.compare_lists(current, desired, get_list_diff)
+
+
+def test_compare_lists_hash_and_fallback_paths_agree():
+    ''' the hash based path and the fallback path report the same differences, with duplicates and unhashable elements '''
+    rng = random.Random(5678)
+    values = ['a', 'a', 1, (1, 2), [1, 2], {'x': [1, {'y': 2}]}, {'x': [1, {'y': 3}]}, Unhashable(1), Unhashable(2)]
+    for dummy in range(500):
+        current = [rng.choice(values) for dummy in range(rng.randint(0, 6))]
+        desired = [rng.choice(values) for dummy in range(rng.randint(0, 6))]
+        for get_list_diff in (True, False):
+            assert na_helper.compare_lists(current, desired, get_list_diff) == compare_lists_by_equality_only(current, desired, get_list_diff)
+    # initiators or ACLs in reverse order, with a duplicate
+    count = 1000
+    initiators = ['iqn.1998-01.com.vmware:host%05d' % index for index in range(count)]
+    acls = [{'user_or_group': 'user%d' % index, 'access': 'access_allow', 'rights': ['read', 'write']} for index in range(count)]
+    for current in (initiators, acls):
+        desired = list(reversed(current))
+        for compare_lists in (na_helper.compare_lists, compare_lists_by_equality_only):
+            assert compare_lists(current, desired, True) is None
+            assert compare_lists(current, desired[1:] + ['new'], True) == ['new']
+            assert compare_lists(current, desired + current[:1], True) == current[:1]
+
+
 def test_get_modified_attributes_exceptions():
     """ validate exceptions """
     current = {'schedule': {'name': 'weekly'}, 'state': 'present'}
@@ -86,7 +86,7 @@ def create_restapi_object(default_args, module_args=None):
 
 def test_write_to_file():
     ''' check error and debug logs can be written to disk '''
-    rest_api = create_restapi_object(DEFAULT_ARGS)
+    rest_api = create_restapi_object(DEFAULT_ARGS, {'feature_flags': {'debug_buffer_size': 10}})
     # logging an error also add a debug record
     rest_api.log_error(404, '404 error')
     print(rest_api.errors)
@@ -183,7 +183,7 @@ def test_is_rest_false():
     register_responses([
         ('GET', 'cluster', SRR['is_zapi']),
     ])
-    args = {'use_rest': 'auto'}
+    args = {'use_rest': 'auto', 'feature_flags': {'debug_buffer_size': 10}}
     rest_api = create_restapi_object(DEFAULT_ARGS, args)
     is_rest = rest_api.is_rest()
     print(rest_api.errors)
@@ -7,14 +7,17 @@ __metaclass__ = type
 
 import pytest
 import sys
+import threading
+import tracemalloc
 
 from ansible.module_utils import basic
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 
+# pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import \
-    create_module, expect_and_capture_ansible_exception
+    create_module, expect_and_capture_ansible_exception, patch_ansible
 
 if not netapp_utils.HAS_REQUESTS and sys.version_info < (2, 7):
     pytestmark = pytest.mark.skip('Skipping Unit Tests on 2.6 as requests is not available')
@@ -49,8 +52,8 @@ class MockONTAPModule:
         self.module = basic.AnsibleModule(netapp_utils.na_ontap_host_argument_spec())
 
 
-def create_restapi_object(default_args):
-    module = create_module(MockONTAPModule, default_args)
+def create_restapi_object(default_args, module_args=None):
+    module = create_module(MockONTAPModule, default_args, module_args)
     return netapp_utils.OntapRestAPI(module.module)
 
 
@@ -73,7 +76,7 @@ class mockResponse:
         return self.json_data
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_empty_get_sent_bad_json(mock_request):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='anything', status_code=200, raise_action='bad_json')
@@ -85,7 +88,7 @@ def test_empty_get_sent_bad_json(mock_request):
     print('debug:', rest_api.debug_logs)
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_empty_get_sent_bad_but_empty_json(mock_request):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='', status_code=200, raise_action='bad_json')
@@ -105,7 +108,7 @@ def test_wait_on_job_bad_url():
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job_timeout(mock_request, sleep_mock):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='', status_code=200, raise_action='bad_json')
@@ -118,7 +121,7 @@ def test_wait_on_job_timeout(mock_request, sleep_mock):
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job_job_error(mock_request, sleep_mock):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data=dict(error='Job error message'), status_code=200)
@@ -131,7 +134,7 @@ def test_wait_on_job_job_error(mock_request, sleep_mock):
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job_job_failure(mock_request, dont_sleep):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data=dict(error='Job error message', state='failure', message='failure message'), status_code=200)
@@ -145,7 +148,7 @@ def test_wait_on_job_job_failure(mock_request, dont_sleep):
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job_timeout_running(mock_request, sleep_mock):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data=dict(error='Job error message', state='running', message='any message'), status_code=200)
@@ -159,7 +162,7 @@ def test_wait_on_job_timeout_running(mock_request, sleep_mock):
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job(mock_request, dont_sleep):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data=dict(error='Job error message', state='other', message='any message'), status_code=200)
@@ -172,7 +175,7 @@ def test_wait_on_job(mock_request, dont_sleep):
     assert message == 'any message'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_get_auth_single_cert(mock_request):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='', status_code=200)
@@ -185,7 +188,7 @@ def test_get_auth_single_cert(mock_request):
     assert "cert='cert_file'" in str(mock_request.mock_calls[0])
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_get_auth_cert_key(mock_request):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='', status_code=200)
@@ -206,7 +209,7 @@ def test_get_auth_method_keyerror():
     assert expect_and_capture_ansible_exception(my_cx.send_request, KeyError, *args) == 'invalid_method'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_http_error_no_json(mock_request):
     ''' get raises HTTPError '''
     mock_request.return_value = mockResponse(json_data={}, status_code=400)
@@ -216,7 +219,7 @@ def test_http_error_no_json(mock_request):
     assert error == 'status_code: 400'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_http_error_with_json_error_field(mock_request):
     ''' get raises HTTPError '''
     mock_request.return_value = mockResponse(json_data=dict(state='other', message='any message', error='error_message'), status_code=400)
@@ -226,7 +229,7 @@ def test_http_error_with_json_error_field(mock_request):
     assert error == 'error_message'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_http_error_attribute_error(mock_request):
     ''' get raises HTTPError '''
     mock_request.return_value = mockResponse(json_data='bad_data', status_code=400)
@@ -236,7 +239,7 @@ def test_http_error_attribute_error(mock_request):
     assert error == 'status_code: 400'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_connection_error(mock_request):
     ''' get raises HTTPError '''
     mock_request.side_effect = netapp_utils.requests.exceptions.ConnectionError('connection_error')
@@ -248,7 +251,7 @@ def test_connection_error(mock_request):
     # assert False
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_options_allow_in_header(mock_request):
     ''' OPTIONS returns Allow key '''
     mock_request.return_value = mockResponse(json_data={}, headers={'Allow': 'allowed'}, status_code=200)
@@ -259,7 +262,7 @@ def test_options_allow_in_header(mock_request):
     assert message == {'Allow': 'allowed'}
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_formdata_in_response(mock_request):
     ''' GET return formdata '''
     mock_request.return_value = mockResponse(
@@ -269,3 +272,275 @@ def test_formdata_in_response(mock_request):
     message, error = rest_api.get(api)
     assert error is None
     assert message == {'text': 'testme'}
+
+
+def create_restapi_object_with_flags(default_args, feature_flags):
+    module = create_module(MockONTAPModule, default_args, {'feature_flags': feature_flags})
+    return netapp_utils.OntapRestAPI(module.module)
+
+
+def running_then_success(count):
+    running = mockResponse(json_data=dict(state='running', message='running'), status_code=200)
+    success = mockResponse(json_data=dict(state='success', message='success'), status_code=200)
+    return [running] * count + [success]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_adaptive_backoff(mock_request, mock_sleep):
+    ''' delay starts at 0.1 second and doubles up to increment '''
+    mock_request.side_effect = running_then_success(8)
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    job = dict(_links=dict(self=dict(href='api/testme')))
+    message, error = rest_api.wait_on_job(job, increment=5)
+    assert error is None
+    assert message == 'success'
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 5, 5]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_fixed_interval(mock_request, mock_sleep):
+    mock_request.side_effect = running_then_success(3)
+    rest_api = create_restapi_object_with_flags(DEFAULT_ARGS, {'job_poll_policy': 'fixed'})
+    job = dict(_links=dict(self=dict(href='api/testme')))
+    message, error = rest_api.wait_on_job(job, increment=5)
+    assert error is None
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [5, 5, 5]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_adaptive_timeout(mock_request, mock_sleep):
+    ''' the time spent sleeping is used to enforce the timeout '''
+    mock_request.return_value = mockResponse(json_data=dict(state='running', message='running'), status_code=200)
+    rest_api = create_restapi_object_with_flags(DEFAULT_ARGS, {'job_poll_initial_interval': 1})
+    job = dict(_links=dict(self=dict(href='api/testme')))
+    message, error = rest_api.wait_on_job(job, timeout=20, increment=8)
+    assert 'Timeout error: Process still running' in error
+    # 1 + 2 + 4 + 8 + 8 >= 20
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [1, 2, 4, 8, 8]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_retry_after(mock_request, mock_sleep):
+    ''' Retry-After header takes precedence over the poll interval '''
+    running = mockResponse(json_data=dict(state='running', message='running'), status_code=200, headers={'Retry-After': '3'})
+    mock_request.side_effect = [running, running] + running_then_success(0)
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    job = dict(_links=dict(self=dict(href='api/testme')))
+    message, error = rest_api.wait_on_job(job, increment=5)
+    assert error is None
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [3.0, 3.0]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_retry_after_is_capped(mock_request, mock_sleep):
+    ''' Retry-After cannot delay the next poll past the increment, or past the timeout '''
+    running = mockResponse(json_data=dict(state='running', message='running'), status_code=200, headers={'Retry-After': '3600'})
+    mock_request.side_effect = [running, running] + running_then_success(0)
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    job = dict(_links=dict(self=dict(href='api/testme')))
+    message, error = rest_api.wait_on_job(job, timeout=8, increment=5)
+    assert error is None
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [5, 3]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_retry_after_zero(mock_request, mock_sleep):
+    ''' Retry-After: 0 is ignored, the poll intervals are used and the timeout is reached '''
+    mock_request.return_value = mockResponse(json_data=dict(state='running', message='running'), status_code=200, headers={'Retry-After': '0'})
+    rest_api = create_restapi_object_with_flags(DEFAULT_ARGS, {'job_poll_initial_interval': 1})
+    job = dict(_links=dict(self=dict(href='api/testme')))
+    message, error = rest_api.wait_on_job(job, timeout=20, increment=8)
+    assert 'Timeout error: Process still running' in error
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [1, 2, 4, 8, 8]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_error_retries_use_increment(mock_request, mock_sleep):
+    ''' a transient error reading the job status is retried after increment seconds, even with the adaptive policy '''
+    error = mockResponse(json_data=dict(message='service unavailable'), status_code=503)
+    mock_request.side_effect = [error, error, error] + running_then_success(1)
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    job = dict(_links=dict(self=dict(href='api/testme')))
+    message, error = rest_api.wait_on_job(job, increment=5)
+    assert error is None
+    assert message == 'success'
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [5, 5, 5, 0.1]
+
+
+def test_get_retry_after():
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    assert rest_api.get_retry_after() is None
+    rest_api.last_response_headers = {'Retry-After': '2.5'}
+    assert rest_api.get_retry_after() == 2.5
+    rest_api.last_response_headers = {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+    assert rest_api.get_retry_after() is None
+    rest_api.last_response_headers = {}
+    assert rest_api.get_retry_after() is None
+
+
+def test_last_response_headers_are_per_thread():
+    ''' with parallelism or prefetch, a thread must not see the headers of a response received by another thread '''
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    rest_api.last_response_headers = {'Retry-After': '2'}
+    seen = []
+
+    def other_thread():
+        seen.append(rest_api.last_response_headers)
+        rest_api.last_response_headers = {'Retry-After': '7'}
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    thread.join()
+    assert seen == [None]
+    assert rest_api.get_retry_after() == 2
+
+
+def test_wait_on_job_bad_policy():
+    rest_api = create_restapi_object_with_flags(DEFAULT_ARGS, {'job_poll_policy': 'linear'})
+    msg = 'Error: unexpected value for feature flag job_poll_policy, expecting adaptive, fixed, or long_poll, got: linear'
+    assert expect_and_capture_ansible_exception(next, 'fail', rest_api.get_job_poll_intervals(60))['msg'] == msg
+
+
+class JobServer(object):
+    ''' simulate a job completing after duration seconds, and ONTAP holding a GET with return_timeout
+        time is simulated, sleep and the time spent in ONTAP advance the clock
+    '''
+    def __init__(self, duration, hold=True):
+        self.now = 1000.0
+        self.done_at = self.now + duration
+        self.hold = hold
+        self.requests = 0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        return_timeout = (kwargs.get('params') or {}).get('return_timeout')
+        if self.hold and return_timeout:
+            self.now = min(self.done_at, self.now + return_timeout)
+        if self.now >= self.done_at:
+            return mockResponse(json_data=dict(state='success', message='success'), status_code=200)
+        return mockResponse(json_data=dict(state='running', message='running'), status_code=200)
+
+
+def wait_on_simulated_job(server, policy, timeout=600):
+    rest_api = create_restapi_object_with_flags(DEFAULT_ARGS, {'job_poll_policy': policy})
+    job = dict(_links=dict(self=dict(href='api/cluster/jobs/uuid')))
+    with patch('requests.Session.request', side_effect=server.request) as mock_request:
+        with patch('time.sleep', side_effect=server.sleep):
+            with patch('time.time', side_effect=server.time):
+                result = rest_api.wait_on_job(job, timeout=timeout, increment=60)
+    return result, mock_request
+
+
+def test_wait_on_job_long_poll():
+    server = JobServer(37)
+    (message, error), mock_request = wait_on_simulated_job(server, 'long_poll')
+    assert error is None
+    assert message == 'success'
+    # the HTTP timeout is 60 seconds
+    assert mock_request.call_args_list[0][1]['params'] == {'return_timeout': 55, 'fields': 'state,message,code,error'}
+    # completion is observed as soon as the job is done
+    assert server.requests == 1
+    assert server.now == server.done_at
+
+
+def test_wait_on_job_long_poll_chunks_and_timeout():
+    server = JobServer(500)
+    (message, error), mock_request = wait_on_simulated_job(server, 'long_poll', timeout=120)
+    assert 'Timeout error: Process still running' in error
+    # the last request only waits for the remaining time
+    assert [call[1]['params']['return_timeout'] for call in mock_request.call_args_list] == [55, 55, 10]
+    assert server.now == 1120
+
+
+def test_wait_on_job_long_poll_fallback():
+    ''' ONTAP answered immediately, sleep with the adaptive policy '''
+    server = JobServer(1, hold=False)
+    (message, error), mock_request = wait_on_simulated_job(server, 'long_poll')
+    assert error is None
+    # 0.1 + 0.2 + 0.4 + 0.8 >= 1
+    assert server.requests == 5
+
+
+def test_benchmark_wait_on_job_long_poll():
+    ''' number of requests and delay to observe completion, for jobs of various durations '''
+    for duration in (0.5, 7, 37, 300):
+        results = {}
+        for policy in ('adaptive', 'fixed', 'long_poll'):
+            server = JobServer(duration)
+            (message, error), dummy = wait_on_simulated_job(server, policy)
+            assert error is None
+            results[policy] = (server.requests, server.now - server.done_at)
+        report = ['%s: %d requests, completion seen after %.1fs' % (policy, requests, delay) for policy, (requests, delay) in sorted(results.items())]
+        print('job duration %ss: %s' % (duration, ', '.join(report)))
+        assert results['long_poll'][1] == 0
+        assert results['long_poll'][0] <= results['adaptive'][0]
+        assert results['long_poll'][0] <= results['fixed'][0]
+
+
+def large_page(*args, **kwargs):
+    ''' a new 200KB response for each call '''
+    response = mockResponse(json_data={'num_records': 1, 'records': [{'name': 'vol1'}]}, status_code=200)
+    response.content = b'x' * 200000
+    return response
+
+
+def measure_peak_memory(rest_api, count):
+    tracemalloc.start()
+    for dummy in range(count):
+        rest_api.get('storage/volumes', {'fields': 'name'})
+    dummy, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+@patch('requests.Session.request')
+def test_debug_buffer(mock_request):
+    mock_request.side_effect = large_page
+    # no record by default
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    rest_api.get('storage/volumes')
+    assert not rest_api.debug_logs
+    assert not rest_api.is_debug_enabled()
+    # bounded buffer, 2 records for each request
+    rest_api = create_restapi_object(DEFAULT_ARGS, {'feature_flags': {'debug_buffer_size': 4}})
+    for dummy in range(3):
+        rest_api.get('storage/volumes')
+    assert len(rest_api.debug_logs) == 4
+    assert [record[0] for record in rest_api.debug_logs] == ['sending', 200, 'sending', 200]
+    with patch('logging.basicConfig'):
+        rest_api = create_restapi_object(DEFAULT_ARGS, {'feature_flags': {'trace_apis': True}})
+    assert rest_api.debug_logs.maxlen == 100
+
+
+@patch('requests.Session.request')
+def test_benchmark_debug_buffer_memory(mock_request):
+    ''' peak memory for 100 pages of 200KB is flat with the default or a bounded buffer '''
+    mock_request.side_effect = large_page
+    page_size = 200000
+    results = {}
+    for label, flags in (('disabled', None), ('bounded', {'debug_buffer_size': 4}), ('unbounded', {'debug_buffer_size': 1000})):
+        rest_api = create_restapi_object(DEFAULT_ARGS, {'feature_flags': flags} if flags else None)
+        results[label] = (measure_peak_memory(rest_api, 10), measure_peak_memory(rest_api, 100))
+        print('%s: peak memory for 10 pages: %d, for 100 pages: %d' % (label, results[label][0], results[label][1]))
+    # only the current page is kept in memory
+    assert results['disabled'][1] < 3 * page_size
+    # the last 2 pages are kept in memory
+    assert results['bounded'][1] < 5 * page_size
+    # flat, the growth is less than a page (the mock records all calls)
+    assert results['disabled'][1] - results['disabled'][0] < page_size
+    assert results['bounded'][1] - results['bounded'][0] < page_size
+    # the previous behavior, all pages are kept in memory
+    assert results['unbounded'][1] > 90 * page_size
@@ -0,0 +1,150 @@
+# Copyright (c) 2026 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils netapp.py - pooled REST sessions
+
+    The benchmark runs against a local HTTP server that counts incoming connections.
+    Each new connection would require a TLS handshake with ONTAP.
+'''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+import sys
+import threading
+import time
+
+from ansible.module_utils import basic
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import create_module
+
+if sys.version_info < (3, 5):
+    pytestmark = pytest.mark.skip('Skipping Unit Tests on python < 3.5')
+else:
+    from http.server import BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn, TCPServer
+
+DEFAULT_ARGS = {
+    'hostname': '127.0.0.1',
+    'username': 'test_user',
+    'password': 'test_pass!',
+    'validate_certs': False,
+}
+
+
+class MockONTAPModule:
+    def __init__(self):
+        self.module = basic.AnsibleModule(netapp_utils.na_ontap_host_argument_spec())
+
+
+def create_restapi_object(module_args=None):
+    module = create_module(MockONTAPModule, DEFAULT_ARGS, module_args)
+    return netapp_utils.OntapRestAPI(module.module)
+
+
+class CountingServer(object):
+    ''' local HTTP/1.1 server, reporting the number of connections it accepted '''
+
+    def __init__(self):
+        counter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                counter.connections += 1
+                BaseHTTPRequestHandler.setup(self)
+
+            def do_GET(self):
+                counter.requests += 1
+                body = b'{"num_records": 0, "records": []}'
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.connections = 0
+        self.requests = 0
+
+        class Server(ThreadingMixIn, TCPServer):
+            daemon_threads = True
+
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%d/api/' % self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        # close any kept-alive connection before stopping the server
+        for session in netapp_utils.REST_SESSIONS.values():
+            session.close()
+        netapp_utils.REST_SESSIONS.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_gets(rest_api, url, count):
+    rest_api.url = url
+    start = time.time()
+    for dummy in range(count):
+        dummy, error = rest_api.get('storage/volumes')
+        assert error is None
+    return time.time() - start
+
+
+def test_session_is_shared_per_host():
+    netapp_utils.REST_SESSIONS.clear()
+    rest_api_1 = create_restapi_object()
+    rest_api_2 = create_restapi_object()
+    assert rest_api_1.get_session() is rest_api_2.get_session()
+    rest_api_2.url = 'https://other_host/api/'
+    assert rest_api_1.get_session() is not rest_api_2.get_session()
+    adapter = rest_api_1.get_session().get_adapter('https://127.0.0.1/api/')
+    assert adapter._pool_maxsize == 10
+    assert adapter.max_retries.total == 0
+
+
+def test_session_pool_options():
+    netapp_utils.REST_SESSIONS.clear()
+    rest_api = create_restapi_object({'feature_flags': {'rest_pool_maxsize': 4, 'rest_max_retries': 2}})
+    adapter = rest_api.get_session().get_adapter('https://127.0.0.1/api/')
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+    # a module using several threads can ask for a larger pool
+    netapp_utils.REST_SESSIONS.clear()
+    rest_api = netapp_utils.OntapRestAPI(rest_api.module, pool_maxsize=16)
+    assert rest_api.get_session().get_adapter('https://127.0.0.1/api/')._pool_maxsize == 16
+
+
+@patch('requests.request')
+@patch('requests.Session.request')
+def test_session_disabled(mock_session_request, mock_request):
+    rest_api = create_restapi_object({'feature_flags': {'rest_session': False, 'rest_keep_alive': False}})
+    rest_api.get('cluster')
+    mock_session_request.assert_not_called()
+    assert mock_request.call_args[1]['headers']['Connection'] == 'close'
+
+
+def test_benchmark_connection_reuse():
+    ''' count connections (TLS handshakes with ONTAP) and time 50 GET calls, with and without session '''
+    count = 50
+    with CountingServer() as server:
+        elapsed_session = run_gets(create_restapi_object(), server.url, count)
+        connections_with_session = server.connections
+    with CountingServer() as server:
+        elapsed_no_session = run_gets(create_restapi_object({'feature_flags': {'rest_session': False}}), server.url, count)
+        connections_without_session = server.connections
+    print('with session: %d connections in %.3fs' % (connections_with_session, elapsed_session))
+    print('without session: %d connections in %.3fs' % (connections_without_session, elapsed_no_session))
+    assert connections_with_session == 1
+    assert connections_without_session == count
@@ -0,0 +1,179 @@
+# Copyright (c) 2026 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils tracing.py, and span recording in netapp.py '''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import json
+import pytest
+import sys
+
+from ansible.module_utils import basic
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils import tracing
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import create_module
+
+if sys.version_info < (3, 5):
+    pytestmark = pytest.mark.skip('Skipping Unit Tests on python < 3.5')
+
+DEFAULT_ARGS = {
+    'hostname': 'test',
+    'username': 'test_user',
+    'password': 'test_pass!',
+}
+
+UUID = 'fde79888-692a-11ea-80c2-005056b39fe7'
+ZAPI_RESPONSE = b"<netapp version='1.110' xmlns='http://www.netapp.com/filer/admin'>"\
+                b"<results status='passed'><num-records>1</num-records></results></netapp>"
+
+
+class MockONTAPModule:
+    def __init__(self):
+        self.module = basic.AnsibleModule(netapp_utils.na_ontap_host_argument_spec())
+
+
+class mockResponse:
+    def __init__(self, json_data, status_code=200):
+        self.json_data = json_data
+        self.status_code = status_code
+        self.content = json_data
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.json_data
+
+
+class mockOpener:
+    def open(self, request, timeout=None):
+        return io.BytesIO(ZAPI_RESPONSE)
+
+
+def create_tracing_module(trace_file):
+    return create_module(MockONTAPModule, DEFAULT_ARGS, {'feature_flags': {'trace_spans_file': str(trace_file)}})
+
+
+def read_spans(trace_file):
+    ''' return the spans for the last task, indexed by name, and the resource attributes '''
+    netapp_utils.TRACER.flush()
+    with open(str(trace_file)) as lines:
+        request = json.loads(lines.readlines()[-1])
+    resource_spans = request['resourceSpans'][0]
+    spans = resource_spans['scopeSpans'][0]['spans']
+    assert len(set(span['traceId'] for span in spans)) == 1
+    attributes = dict((attribute['key'], attribute['value']) for attribute in resource_spans['resource']['attributes'])
+    return spans, attributes
+
+
+def get_attribute(span, key):
+    for attribute in span['attributes']:
+        if attribute['key'] == key:
+            return list(attribute['value'].values())[0]
+    return None
+
+
+def test_disabled_tracer_returns_noop_span():
+    tracer = tracing.SpanTracer()
+    assert tracer.span('volume.get') is tracing.NOOP_SPAN
+    with tracer.span('volume.get', {'key': 'value'}) as span:
+        span.set_attributes({'other': 1})
+        span.set_error('error')
+    assert not tracer.spans
+
+
+def test_otlp_attributes():
+    assert tracing.otlp_attributes({'b': True, 'a': 3, 'c': 0.5, 'd': 'text', 'e': None}) == [
+        {'key': 'a', 'value': {'intValue': '3'}},
+        {'key': 'b', 'value': {'boolValue': True}},
+        {'key': 'c', 'value': {'doubleValue': 0.5}},
+        {'key': 'd', 'value': {'stringValue': 'text'}},
+    ]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_rest_spans(mock_request, mock_sleep, tmp_path):
+    trace_file = tmp_path / 'spans.json'
+    mock_request.side_effect = [
+        mockResponse({'records': [{'uuid': UUID}], 'num_records': 1}),
+        mockResponse({'state': 'running'}),
+        mockResponse({'state': 'success', 'message': 'done'}),
+        mockResponse({'error': {'message': 'Expected error', 'code': 6}}, 400),
+    ]
+    module = create_tracing_module(trace_file)
+    rest_api = netapp_utils.OntapRestAPI(module.module)
+    with netapp_utils.TRACER.span('volume.get'):
+        rest_api.get('storage/volumes', {'name': 'vol1'})
+    rest_api.wait_on_job({'uuid': UUID, '_links': {'self': {'href': '/api/cluster/jobs/%s' % UUID}}})
+    rest_api.delete('storage/volumes/%s' % UUID)
+    spans, resource = read_spans(trace_file)
+    assert resource['ansible.module'] == {'stringValue': 'basic.py'}
+    names = [span['name'] for span in spans]
+    assert names == ['basic.py', 'GET storage/volumes', 'volume.get', 'GET cluster/jobs/{uuid}', 'GET cluster/jobs/{uuid}', 'wait_on_job',
+                     'DELETE storage/volumes/{uuid}']
+    root, get_volume, phase, poll, dummy, wait, delete = spans
+    assert 'parentSpanId' not in root
+    assert get_volume['parentSpanId'] == phase['spanId']
+    assert phase['parentSpanId'] == root['spanId']
+    assert poll['parentSpanId'] == wait['spanId']
+    assert delete['parentSpanId'] == root['spanId']
+    assert get_volume['kind'] == tracing.SPAN_KIND_CLIENT
+    assert get_attribute(get_volume, 'url.path') == 'storage/volumes'
+    assert get_attribute(get_volume, 'http.response.status_code') == '200'
+    assert get_attribute(get_volume, 'ontap.num_records') == '1'
+    assert int(get_attribute(get_volume, 'ontap.bytes_in')) > 0
+    assert get_attribute(wait, 'ontap.job_uuid') == UUID
+    assert wait['status'] == {}
+    assert delete['status']['code'] == tracing.STATUS_CODE_ERROR
+    assert 'Expected error' in delete['status']['message']
+    assert int(root['endTimeUnixNano']) >= int(delete['endTimeUnixNano'])
+
+
+def test_exception_is_reported_in_span(tmp_path):
+    trace_file = tmp_path / 'spans.json'
+    module = create_tracing_module(trace_file)
+    netapp_utils.TRACER.configure(str(trace_file), module.module)
+    with pytest.raises(KeyError):
+        with netapp_utils.TRACER.span('volume.modify'):
+            raise KeyError('uuid')
+    # exit_json is not an error
+    with pytest.raises(SystemExit):
+        with netapp_utils.TRACER.span('volume.exit'):
+            raise SystemExit(0)
+    spans, dummy = read_spans(trace_file)
+    assert spans[1]['status'] == {'code': tracing.STATUS_CODE_ERROR, 'message': "KeyError('uuid')"}
+    assert spans[2]['status'] == {}
+
+
+@pytest.mark.skipif(not netapp_utils.has_netapp_lib(), reason="skipping as missing required netapp_lib")
+def test_zapi_spans(tmp_path):
+    trace_file = tmp_path / 'spans.json'
+    module = create_tracing_module(trace_file)
+    server = netapp_utils.setup_na_ontap_zapi(module.module)
+    server._refresh_conn = False
+    server._opener = mockOpener()
+    server.invoke_successfully(netapp_utils.zapi.NaElement('volume-get-iter'), True)
+    spans, dummy = read_spans(trace_file)
+    assert [span['name'] for span in spans] == ['basic.py', 'ZAPI volume-get-iter']
+    assert get_attribute(spans[1], 'rpc.method') == 'volume-get-iter'
+    assert get_attribute(spans[1], 'ontap.num_records') == '1'
+    assert get_attribute(spans[1], 'zapi.status') == 'passed'
+    # the raw bytes are measured, the elements are not serialized again
+    assert get_attribute(spans[1], 'ontap.bytes_in') == str(len(ZAPI_RESPONSE))
+    assert int(get_attribute(spans[1], 'ontap.bytes_out')) > 0
+
+
+@patch('requests.Session.request')
+def test_no_span_when_disabled(mock_request, tmp_path):
+    mock_request.return_value = mockResponse({'name': 'cluster1'})
+    module = create_module(MockONTAPModule, DEFAULT_ARGS)
+    rest_api = netapp_utils.OntapRestAPI(module.module)
+    assert not netapp_utils.TRACER.enabled
+    with patch.object(tracing, 'Span') as mock_span:
+        rest_api.get('cluster')
+    mock_span.assert_not_called()
@@ -0,0 +1,200 @@
+# Copyright (c) 2026 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils netapp.py - kept-alive ZAPI connections
+
+    The benchmark runs against a local HTTP server that counts incoming connections.
+    Each new connection would require a TLS handshake with ONTAP.
+    We cannot use the general UT framework as it patches invoke_elem.
+'''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+import sys
+import threading
+import time
+
+from ansible.module_utils import basic
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import create_module, expect_and_capture_ansible_exception
+
+if not netapp_utils.has_netapp_lib():
+    pytestmark = pytest.mark.skip("skipping as missing required netapp_lib")
+elif sys.version_info < (3, 5):
+    pytestmark = pytest.mark.skip('Skipping Unit Tests on python < 3.5')
+else:
+    from http.server import BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn, TCPServer
+
+DEFAULT_ARGS = {
+    'hostname': '127.0.0.1',
+    'username': 'test_user',
+    'password': 'test_pass!',
+    'https': False,
+}
+
+RESPONSE = b"<netapp version='1.110' xmlns='http://www.netapp.com/filer/admin'><results status='passed'><name>vol1</name></results></netapp>"
+
+
+class MockONTAPModule:
+    def __init__(self):
+        self.module = basic.AnsibleModule(netapp_utils.na_ontap_host_argument_spec())
+
+
+class ZAPIServer(object):
+    ''' local HTTP/1.1 server answering any ZAPI request, reporting the number of connections it accepted '''
+
+    def __init__(self, status=200, close_after_response=False, drop_request=None):
+        counter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                counter.connections += 1
+                BaseHTTPRequestHandler.setup(self)
+
+            def do_POST(self):
+                counter.requests += 1
+                counter.headers = self.headers
+                self.rfile.read(int(self.headers['Content-Length']))
+                if counter.requests == drop_request:
+                    # simulate a connection lost after ONTAP received the request
+                    self.close_connection = True
+                    return
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/xml')
+                self.send_header('Content-Length', str(len(RESPONSE)))
+                self.end_headers()
+                self.wfile.write(RESPONSE)
+                # simulate ONTAP closing an idle connection, without telling the client
+                self.close_connection = close_after_response
+
+            def log_message(self, *args):
+                pass
+
+        self.connections = 0
+        self.requests = 0
+        self.headers = None
+
+        class Server(ThreadingMixIn, TCPServer):
+            daemon_threads = True
+
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        # close any kept-alive connection before stopping the server
+        for connection in netapp_utils.ZAPI_CONNECTIONS.values():
+            connection.close()
+        netapp_utils.ZAPI_CONNECTIONS.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def create_zapi_server(port, module_args=None):
+    args = dict(DEFAULT_ARGS, http_port=port)
+    module = create_module(MockONTAPModule, args, module_args)
+    return netapp_utils.setup_na_ontap_zapi(module.module)
+
+
+def run_zapis(server, count, pause=None):
+    start = time.time()
+    for dummy in range(count):
+        result = server.invoke_successfully(netapp_utils.zapi.NaElement('volume-get-iter'), True)
+        assert result.get_child_content('name') == 'vol1'
+        if pause:
+            # let the server close the connection
+            time.sleep(pause)
+    return time.time() - start
+
+
+def test_connection_is_kept_alive():
+    with ZAPIServer() as stub:
+        server = create_zapi_server(stub.port)
+        run_zapis(server, 3)
+        # another task using the same host and credentials
+        run_zapis(create_zapi_server(stub.port), 2)
+        assert stub.connections == 1
+        assert stub.requests == 5
+        assert stub.headers['Authorization'] == 'Basic dGVzdF91c2VyOnRlc3RfcGFzcyE='
+        assert stub.headers['X-Dot-Client-App'] == 'basic.py/%s' % netapp_utils.COLLECTION_VERSION
+
+
+def test_reconnect_when_connection_was_closed():
+    with ZAPIServer(close_after_response=True) as stub:
+        run_zapis(create_zapi_server(stub.port), 3, pause=0.1)
+        assert stub.connections == 3
+        assert stub.requests == 3
+
+
+def test_request_is_not_sent_again_when_response_is_lost():
+    ''' the connection is lost after the request was sent, ONTAP may have processed it '''
+    with ZAPIServer(drop_request=2) as stub:
+        server = create_zapi_server(stub.port)
+        run_zapis(server, 1)
+        expect_and_capture_ansible_exception(server.invoke_successfully, netapp_utils.zapi.NaApiError, netapp_utils.zapi.NaElement('volume-create'))
+        assert stub.requests == 2
+        # the next call uses a new connection
+        run_zapis(server, 1)
+        assert stub.connections == 2
+        assert stub.requests == 3
+
+
+def test_http_error():
+    with ZAPIServer(status=401) as stub:
+        server = create_zapi_server(stub.port)
+        exc = expect_and_capture_ansible_exception(server.invoke_successfully, netapp_utils.zapi.NaApiError, netapp_utils.zapi.NaElement('volume-get-iter'))
+        assert exc.value.code == 401
+        assert exc.value.message == 'Unauthorized'
+
+
+def test_connection_error():
+    with ZAPIServer() as stub:
+        port = stub.port
+    server = create_zapi_server(port)
+    exc = expect_and_capture_ansible_exception(server.invoke_successfully, netapp_utils.zapi.NaApiError, netapp_utils.zapi.NaElement('volume-get-iter'))
+    assert exc.value.code == 'Unable to connect'
+    assert not netapp_utils.ZAPI_CONNECTIONS
+
+
+def test_keep_alive_is_not_used_with_classic_basic_authorization():
+    server = create_zapi_server(80, {'feature_flags': {'classic_basic_authorization': True}})
+    server._build_opener()
+    assert not isinstance(server._opener, netapp_utils.ZAPIKeepAliveOpener)
+    server = create_zapi_server(80)
+    server._build_opener()
+    assert isinstance(server._opener, netapp_utils.ZAPIKeepAliveOpener)
+
+
+def test_keep_alive_is_not_used_with_a_proxy(monkeypatch):
+    monkeypatch.setenv('http_proxy', 'http://proxy:3128')
+    server = create_zapi_server(80)
+    server._build_opener()
+    assert not isinstance(server._opener, netapp_utils.ZAPIKeepAliveOpener)
+    monkeypatch.setenv('no_proxy', '127.0.0.1')
+    server._build_opener()
+    assert isinstance(server._opener, netapp_utils.ZAPIKeepAliveOpener)
+
+
+def test_benchmark_connection_reuse():
+    ''' count connections (TLS handshakes with ONTAP) and time 1000 ZAPI calls, with and without keep-alive '''
+    count = 1000
+    with ZAPIServer() as stub:
+        elapsed_keep_alive = run_zapis(create_zapi_server(stub.port), count)
+        connections_keep_alive = stub.connections
+    with ZAPIServer() as stub:
+        elapsed_no_keep_alive = run_zapis(create_zapi_server(stub.port, {'feature_flags': {'zapi_keep_alive': False}}), count)
+        connections_no_keep_alive = stub.connections
+    print('with keep-alive: %d connections in %.3fs' % (connections_keep_alive, elapsed_keep_alive))
+    print('without keep-alive: %d connections in %.3fs' % (connections_no_keep_alive, elapsed_no_keep_alive))
+    assert connections_keep_alive == 1
+    assert connections_no_keep_alive == count
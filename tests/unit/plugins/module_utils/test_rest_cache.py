@@ -0,0 +1,294 @@
+# Copyright (c) 2026 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils rest_cache.py '''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import multiprocessing
+import os
+import pytest
+import sys
+
+from ansible.module_utils import basic
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_cache
+from ansible_collections.netapp.ontap.plugins.module_utils.rest_cache import RestResponseCache
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import create_module
+
+if not rest_cache.HAS_FCNTL:
+    pytestmark = pytest.mark.skip('Skipping Unit Tests as fcntl is not available')
+
+if sys.version_info < (3, 5):
+    pytestmark = pytest.mark.skip('Skipping Unit Tests on python < 3.5')
+
+DEFAULT_ARGS = {
+    'hostname': 'test',
+    'username': 'test_user',
+    'password': 'test_pass!',
+}
+
+URL = 'https://test/api/'
+TTLS = {'cluster': 300, 'svm/svms': 300}
+
+
+class MockONTAPModule:
+    def __init__(self):
+        self.module = basic.AnsibleModule(netapp_utils.na_ontap_host_argument_spec())
+
+
+class mockResponse:
+    def __init__(self, json_data, status_code=200):
+        self.json_data = json_data
+        self.status_code = status_code
+        self.content = json_data
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.json_data
+
+
+def create_restapi_object(cache_dir, feature_flags=None):
+    flags = {'rest_cache_dir': str(cache_dir)}
+    flags.update(feature_flags or {})
+    module = create_module(MockONTAPModule, DEFAULT_ARGS, {'feature_flags': flags})
+    return netapp_utils.OntapRestAPI(module.module)
+
+
+def test_get_collection():
+    assert rest_cache.get_collection('cluster') == 'cluster'
+    assert rest_cache.get_collection('/svm/svms') == 'svm/svms'
+    assert rest_cache.get_collection('storage/volumes/uuid/snapshots') == 'storage/volumes'
+
+
+def test_put_get_invalidate(tmp_path):
+    cache = RestResponseCache(str(tmp_path), URL, 'user', TTLS)
+    assert cache.get('svm/svms', {'name': 'svm1'}, None) is None
+    cache.put('svm/svms', {'name': 'svm1'}, None, 200, {'records': [{'uuid': 'uuid1'}]})
+    cache.put('cluster', {'fields': ['version']}, None, 200, {'version': {'full': '9.14.1'}})
+    assert cache.get('svm/svms', {'name': 'svm1'}, None) == (200, {'records': [{'uuid': 'uuid1'}]}, None)
+    # the client app header does not change the response, other headers do
+    assert cache.get('svm/svms', {'name': 'svm1'}, {'X-Dot-Client-App': 'other_module'}) is not None
+    assert cache.get('svm/svms', {'name': 'svm1'}, {'X-Dot-SVM-Name': 'svm1'}) is None
+    assert cache.get('svm/svms', {'name': 'svm2'}, None) is None
+    # another user or another cluster does not share the entries
+    assert RestResponseCache(str(tmp_path), URL, 'other_user', TTLS).get('svm/svms', {'name': 'svm1'}, None) is None
+    assert RestResponseCache(str(tmp_path), 'https://other/api/', 'user', TTLS).get('svm/svms', {'name': 'svm1'}, None) is None
+    # any change in the collection invalidates all entries for this collection
+    cache.invalidate('svm/svms/uuid1')
+    assert cache.get('svm/svms', {'name': 'svm1'}, None) is None
+    assert cache.get('cluster', {'fields': ['version']}, None) is not None
+    assert oct(os.stat(cache.path).st_mode & 0o777) == oct(0o600)
+
+
+def test_ttl(tmp_path):
+    cache = RestResponseCache(str(tmp_path), URL, 'user', {'cluster': 10})
+    # not cached, as there is no TTL for this api
+    cache.put('storage/volumes', None, None, 200, {'records': []})
+    assert cache.get('storage/volumes', None, None) is None
+    with patch('time.time', return_value=1000.0):
+        cache.put('cluster', None, None, 200, {'name': 'cluster1'})
+    with patch('time.time', return_value=1009.0):
+        assert cache.get('cluster', None, None) is not None
+    with patch('time.time', return_value=1011.0):
+        assert cache.get('cluster', None, None) is None
+
+
+def test_corrupted_file_is_ignored(tmp_path):
+    cache = RestResponseCache(str(tmp_path), URL, 'user', TTLS)
+    with open(cache.path, 'w') as cache_file:
+        cache_file.write('not json')
+    assert cache.get('cluster', None, None) is None
+    cache.put('cluster', None, None, 200, {'name': 'cluster1'})
+    assert cache.get('cluster', None, None) == (200, {'name': 'cluster1'}, None)
+
+
+def put_entries(cache_dir, index):
+    cache = RestResponseCache(cache_dir, URL, 'user', TTLS)
+    for count in range(20):
+        cache.put('svm/svms', {'name': 'svm_%d_%d' % (index, count)}, None, 200, {'records': []})
+
+
+def test_concurrent_workers(tmp_path):
+    ''' forked workers update the same file, no entry is lost '''
+    workers = [multiprocessing.Process(target=put_entries, args=(str(tmp_path), index)) for index in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    cache = RestResponseCache(str(tmp_path), URL, 'user', TTLS)
+    for index in range(4):
+        for count in range(20):
+            assert cache.get('svm/svms', {'name': 'svm_%d_%d' % (index, count)}, None) is not None
+
+
+@patch('requests.Session.request')
+def test_send_request_uses_cache(mock_request, tmp_path):
+    version = mockResponse({'version': {'full': '9.14.1', 'generation': 9, 'major': 14, 'minor': 1}})
+    mock_request.side_effect = [
+        version,
+        mockResponse({'records': [{'uuid': 'uuid1'}], 'num_records': 1}),
+        version,
+        mockResponse({}),
+        mockResponse({'records': [{'uuid': 'uuid2'}], 'num_records': 1}),
+    ]
+    rest_api = create_restapi_object(tmp_path)
+    assert rest_api.get_ontap_version_using_rest() == 200
+    assert rest_api.get('svm/svms', {'name': 'svm1'})[0]['records'][0]['uuid'] == 'uuid1'
+    # another task, the cache is used once the credentials are accepted
+    rest_api = create_restapi_object(tmp_path)
+    assert rest_api.get_ontap_version_using_rest() == 200
+    assert rest_api.get_ontap_version() == (9, 14, 1)
+    assert rest_api.get('svm/svms', {'name': 'svm1'})[0]['records'][0]['uuid'] == 'uuid1'
+    assert rest_api.get('svm/svms', {'name': 'svm1'})[0]['records'][0]['uuid'] == 'uuid1'
+    assert mock_request.call_count == 3
+    # the SVM is deleted and created again
+    rest_api.delete('svm/svms/uuid1')
+    assert rest_api.get('svm/svms', {'name': 'svm1'})[0]['records'][0]['uuid'] == 'uuid2'
+    assert mock_request.call_count == 5
+
+
+@patch('requests.Session.request')
+def test_cache_requires_authentication(mock_request, tmp_path):
+    mock_request.return_value = mockResponse({'records': [{'uuid': 'uuid1'}], 'num_records': 1})
+    rest_api = create_restapi_object(tmp_path)
+    rest_api.get('svm/svms', {'name': 'svm1'})
+    assert rest_api.authenticated
+    # another task with a wrong password, the cached response is not used
+    mock_request.return_value = mockResponse({'error': {'message': 'not authenticated'}}, 401)
+    rest_api = create_restapi_object(tmp_path)
+    assert not rest_api.authenticated
+    assert rest_api.get('svm/svms', {'name': 'svm1'})[1] is not None
+    assert rest_api.get('svm/svms', {'name': 'svm1'})[1] is not None
+    assert not rest_api.authenticated
+    assert mock_request.call_count == 3
+
+
+def test_cache_identity_with_certificates(tmp_path):
+    args = {'hostname': 'test', 'cert_filepath': 'cert1.pem', 'key_filepath': 'key1.pem', 'feature_flags': {'rest_cache_dir': str(tmp_path)}}
+    module = create_module(MockONTAPModule, args)
+    cache = netapp_utils.OntapRestAPI(module.module).cache
+    assert cache.identity == 'cert1.pem'
+    module = create_module(MockONTAPModule, dict(args, cert_filepath='cert2.pem'))
+    assert cache.get_key('svm/svms', None, None) != netapp_utils.OntapRestAPI(module.module).cache.get_key('svm/svms', None, None)
+
+
+@patch('requests.Session.request')
+def test_send_request_without_cache(mock_request, tmp_path):
+    mock_request.return_value = mockResponse({'name': 'cluster1'})
+    module = create_module(MockONTAPModule, DEFAULT_ARGS)
+    rest_api = netapp_utils.OntapRestAPI(module.module)
+    assert rest_api.cache is None
+    rest_api.get('cluster')
+    rest_api.get('cluster')
+    assert mock_request.call_count == 2
+    # errors are not cached
+    mock_request.return_value = mockResponse({'error': {'message': 'Expected error'}})
+    rest_api = create_restapi_object(tmp_path)
+    rest_api.get('cluster')
+    rest_api.get('cluster')
+    assert mock_request.call_count == 4
+
+
+def test_version_cache(tmp_path):
+    cache = rest_cache.OntapVersionCache(str(tmp_path), 60)
+    assert cache.get(URL) is None
+    version = {'full': '9.14.1', 'generation': 9, 'major': 14, 'minor': 1}
+    with patch('time.time', return_value=1000.0):
+        # the UUID is required
+        cache.put(URL, {'version': version})
+        assert cache.get(URL) is None
+        cache.put(URL, {'version': version, 'uuid': 'cluster_uuid'})
+        cache.put('https://other/api/', {'version': version, 'uuid': 'other_uuid'})
+        cache.put('https://10.10.10.10/api/', {'version': version, 'uuid': 'cluster_uuid'})
+    assert cache.get(URL) is None
+    with patch('time.time', return_value=1059.0):
+        assert cache.get(URL) == {'version': version, 'uuid': 'cluster_uuid'}
+        # the cluster is upgraded, the entries for other URLs or identities are not refreshed, as their credentials were not checked
+        new_version = dict(version, full='9.15.1', major=15)
+        cache.put(URL, {'version': new_version, 'uuid': 'cluster_uuid'}, 'user')
+        assert cache.get(URL, 'user')['version'] == new_version
+        assert cache.get(URL)['version'] == version
+        assert cache.get('https://10.10.10.10/api/')['version'] == version
+        assert cache.get('https://other/api/')['version'] == version
+    with patch('time.time', return_value=1061.0):
+        assert cache.get(URL, 'user')['version'] == new_version
+        assert cache.get('https://10.10.10.10/api/') is None
+
+
+@patch('requests.Session.request')
+def test_version_probe_is_skipped_on_warm_runs(mock_request, tmp_path):
+    mock_request.return_value = mockResponse({'version': {'full': '9.14.1', 'generation': 9, 'major': 14, 'minor': 1}, 'uuid': 'cluster_uuid'})
+    flags = {'ontap_version_cache_ttl': 300, 'rest_cache_dir': str(tmp_path)}
+    module = create_module(MockONTAPModule, DEFAULT_ARGS, {'feature_flags': flags})
+    rest_api = netapp_utils.OntapRestAPI(module.module)
+    assert rest_api.is_rest()
+    assert mock_request.call_args[1]['params'] == {'fields': ['version', 'uuid']}
+    # another task
+    for dummy in range(3):
+        rest_api = netapp_utils.OntapRestAPI(module.module)
+        assert rest_api.is_rest()
+        assert rest_api.meets_rest_minimum_version(True, 9, 14, 1)
+        assert not rest_api.meets_rest_minimum_version(True, 9, 15, 0)
+    rest_api.fail_if_not_rest_minimum_version('module', 9, 12, 1)
+    assert mock_request.call_count == 1
+    # the cache is disabled by default
+    module = create_module(MockONTAPModule, DEFAULT_ARGS)
+    rest_api = netapp_utils.OntapRestAPI(module.module)
+    assert rest_api.version_cache is None
+    assert rest_api.is_rest()
+    assert mock_request.call_args[1]['params'] == {'fields': ['version']}
+    assert mock_request.call_count == 2
+
+
+@patch('requests.Session.request')
+def test_version_cache_is_per_identity_and_invalidated(mock_request, tmp_path, monkeypatch):
+    cluster = mockResponse({'version': {'full': '9.14.1', 'generation': 9, 'major': 14, 'minor': 1}, 'uuid': 'cluster_uuid'})
+    mock_request.return_value = cluster
+    # without rest_cache_dir, so that GET cluster is not cached as a response
+    flags = {'ontap_version_cache_ttl': 300}
+    monkeypatch.setattr(netapp_utils, 'DEFAULT_CACHE_DIR', str(tmp_path))
+    module = create_module(MockONTAPModule, DEFAULT_ARGS, {'feature_flags': flags})
+    other_user = create_module(MockONTAPModule, DEFAULT_ARGS, {'feature_flags': flags, 'username': 'other_user'})
+    assert netapp_utils.OntapRestAPI(module.module).is_rest()
+    assert netapp_utils.OntapRestAPI(module.module).is_rest()
+    assert mock_request.call_count == 1
+    # another user needs its own probe, as the probe checks the user is authorized
+    assert netapp_utils.OntapRestAPI(other_user.module).is_rest()
+    assert mock_request.call_count == 2
+    # credentials are rejected, the next task probes again
+    rest_api = netapp_utils.OntapRestAPI(module.module)
+    assert rest_api.is_rest()
+    mock_request.return_value = mockResponse({'error': {'message': 'not authorized'}}, 401)
+    rest_api.get('storage/volumes')
+    mock_request.return_value = cluster
+    assert netapp_utils.OntapRestAPI(module.module).is_rest()
+    assert mock_request.call_count == 4
+    # the URL now reaches another cluster, the next task probes again
+    rest_api = netapp_utils.OntapRestAPI(module.module)
+    assert rest_api.is_rest()
+    mock_request.return_value = mockResponse({'name': 'other', 'uuid': 'other_uuid'})
+    rest_api.get('cluster')
+    assert rest_api.cached_cluster_uuid is None
+    mock_request.return_value = cluster
+    assert netapp_utils.OntapRestAPI(module.module).is_rest()
+    assert mock_request.call_count == 6
+    # the entry for the other user is still valid
+    assert netapp_utils.OntapRestAPI(other_user.module).is_rest()
+    assert mock_request.call_count == 6
+
+
+@patch('requests.Session.request')
+def test_version_cache_default_dir(mock_request, tmp_path):
+    mock_request.return_value = mockResponse({'error': {'message': 'Expected error'}}, 400)
+    module = create_module(MockONTAPModule, DEFAULT_ARGS, {'feature_flags': {'ontap_version_cache_ttl': 300}})
+    with patch.object(netapp_utils, 'DEFAULT_CACHE_DIR', str(tmp_path / 'default')):
+        rest_api = netapp_utils.OntapRestAPI(module.module)
+    assert rest_api.version_cache.file.cache_dir == str(tmp_path / 'default')
+    # errors are not cached
+    assert rest_api.get_ontap_version_using_rest() == 400
+    assert not os.path.exists(rest_api.version_cache.file.path)
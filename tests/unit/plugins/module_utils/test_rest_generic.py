@@ -12,7 +12,7 @@ from ansible.module_utils import basic
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import patch_ansible, create_module
-from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, register_responses
+from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, register_responses, get_mock_record
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
@@ -48,6 +48,21 @@ SRR = rest_responses({
             'uuid': 'a1b2c3_job',
             '_links': {'self': {'href': 'some_link'}}
         }}, None),
+    'page_1': (200, {
+        'records': [{'name': 'vol1'}, {'name': 'vol2'}],
+        'num_records': 2,
+        '_links': {'next': {'href': '/api/storage/volumes?start.uuid=2&max_records=2'}}
+    }, None),
+    'page_2': (200, {
+        'records': [{'name': 'vol3'}, {'name': 'vol4'}],
+        'num_records': 2,
+        '_links': {'next': {'href': '/api/storage/volumes?start.uuid=4&max_records=2'}}
+    }, None),
+    'page_3': (200, {
+        'records': [{'name': 'vol5'}],
+        'num_records': 1,
+        '_links': {}
+    }, None),
     'job_failed': (200, {
         'state': 'error',
         'message': 'error_message',
@@ -90,6 +105,14 @@ def test_build_query_with_fields():
     assert rest_generic.build_query_with_fields(query={'aaa': 'vvv'}, fields='aaa,bbb') == {'aaa': 'vvv', 'fields': 'aaa,bbb'}
 
 
+def test_get_fields_for_options():
+    fields_map = {'comment': ('comment',), 'size': ('space.size',), 'compression': ('efficiency.compression',), 'inline': ('efficiency.compression',)}
+    assert rest_generic.get_fields_for_options({}, fields_map) == ''
+    assert rest_generic.get_fields_for_options({'comment': 'abc', 'size': None}, fields_map, ['uuid']) == 'comment,uuid'
+    # False is a value, fields are not repeated
+    assert rest_generic.get_fields_for_options({'compression': False, 'inline': True}, fields_map, ('uuid',)) == 'efficiency.compression,uuid'
+
+
 def test_build_query_with_timeout():
     assert rest_generic.build_query_with_timeout(query=None, timeout=30) == {'return_timeout': 30}
 
@@ -490,3 +513,197 @@ def test_error_delete_async_with_job(dont_sleep):
     response, error = rest_generic.delete_async(rest_api, 'cluster', 'uuid')
     assert 'job reported error: Expected error - Expected error - Expected error - Expected error, received' in error
     assert response == SRR['accepted_response'][1]
+
+
+def test_get_next_api():
+    assert rest_generic.get_next_api(SRR['page_1'][1]) == '/storage/volumes?start.uuid=2&max_records=2'
+    assert rest_generic.get_next_api(SRR['page_3'][1]) is None
+    assert rest_generic.get_next_api(None) is None
+    assert rest_generic.get_next_api('some text') is None
+
+
+def test_set_max_records():
+    assert rest_generic.set_max_records('/storage/volumes?start.uuid=2&max_records=2', 500) == '/storage/volumes?start.uuid=2&max_records=500'
+    assert rest_generic.set_max_records('/storage/volumes?max_records=2&fields=name', 10) == '/storage/volumes?max_records=10&fields=name'
+    assert rest_generic.set_max_records('/storage/volumes?start.uuid=2', 10) == '/storage/volumes?start.uuid=2&max_records=10'
+    assert rest_generic.set_max_records('/storage/volumes', 10) == '/storage/volumes?max_records=10'
+
+
+def test_max_records_tuner():
+    tuner = rest_generic.MaxRecordsTuner(1000)
+    # fast page: at most double
+    assert tuner.update(1000, 0.1) == 2000
+    # latency on target: no change
+    assert tuner.update(2000, 2.0) == 2000
+    # slow page: at most halve
+    assert tuner.update(2000, 20.0) == 1000
+    # large page: limit on size
+    assert tuner.update(1000, 1.0, size=32 * 1024 * 1024) == 500
+    # no change for an empty page
+    assert tuner.update(0, 1.0) == 500
+    # bounds
+    tuner = rest_generic.MaxRecordsTuner(8000)
+    assert tuner.update(8000, 0.1) == 10000
+    tuner = rest_generic.MaxRecordsTuner(150)
+    assert tuner.update(150, 10.0) == 100
+
+
+def get_all_pages(prefetch, tuner=None):
+    register_responses([
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['page_2']),
+        ('GET', '/storage/volumes?start.uuid=4&max_records=2', SRR['page_3']),
+    ], 'test_get_next_pages')
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    first_page = dict(SRR['page_1'][1])
+    records = list(first_page['records'])
+    for page, error in rest_generic.get_next_pages(rest_api, first_page, prefetch=prefetch, tuner=tuner):
+        assert error is None
+        records.extend(page['records'])
+    assert [record['name'] for record in records] == ['vol1', 'vol2', 'vol3', 'vol4', 'vol5']
+
+
+def test_get_next_pages():
+    get_all_pages(prefetch=False)
+    get_all_pages(prefetch=True)
+
+
+def test_get_next_pages_with_tuner():
+    register_responses([
+        ('GET', '*', SRR['page_2']),
+        ('GET', '*', SRR['page_3']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    tuner = rest_generic.MaxRecordsTuner(2, min_records=1)
+    pages = list(rest_generic.get_next_pages(rest_api, SRR['page_1'][1], tuner=tuner))
+    assert len(pages) == 2
+    # the link for the 3rd page was updated based on the 2nd page
+    assert get_mock_record().get_request(1)['api'] == '/storage/volumes?start.uuid=4&max_records=%d' % tuner.max_records
+
+
+def test_get_next_pages_error():
+    register_responses([
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['generic_error']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    pages = list(rest_generic.get_next_pages(rest_api, SRR['page_1'][1], prefetch=True))
+    assert pages == [(None, 'Expected error')]
+
+
+def test_get_next_pages_early_exit():
+    register_responses([
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['page_2']),
+        ('GET', '/storage/volumes?start.uuid=4&max_records=2', SRR['page_3']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    pages = rest_generic.get_next_pages(rest_api, SRR['page_1'][1], prefetch=True)
+    page, error = next(pages)
+    assert page['records'][0]['name'] == 'vol3'
+    # the 3rd page was already requested, closing the generator waits for it
+    pages.close()
+
+
+def test_split_values_for_query():
+    assert list(rest_generic.split_values_for_query([])) == []
+    assert list(rest_generic.split_values_for_query(['a', 'b', 'c'])) == [['a', 'b', 'c']]
+    # 4 characters per value, including the encoded separator
+    assert list(rest_generic.split_values_for_query(['a', 'b', 'c', 'd', 'e'], 8)) == [['a', 'b'], ['c', 'd'], ['e']]
+    # encoded length is used
+    assert list(rest_generic.split_values_for_query(['a/', 'b', 'c'], 8)) == [['a/'], ['b', 'c']]
+    # a long value is kept in its own chunk
+    assert list(rest_generic.split_values_for_query(['a' * 20, 'b'], 8)) == [['a' * 20], ['b']]
+
+
+def test_get_records_by_keys():
+    register_responses([
+        ('GET', 'storage/volumes', SRR['page_1']),
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['page_2']),
+        ('GET', '/storage/volumes?start.uuid=4&max_records=2', SRR['page_3']),
+        ('GET', 'storage/volumes', SRR['empty_records']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    names = ['vol%d' % index for index in range(1, 7)]
+    # 7 characters for each name, including the encoded separator
+    records, error = rest_generic.get_records_by_keys(rest_api, 'storage/volumes', 'name', names, {'svm.name': 'svm1'}, 'uuid', max_length=30)
+    assert error is None
+    assert sorted(records) == ['vol1', 'vol2', 'vol3', 'vol4', 'vol5']
+    assert records['vol3'] == {'name': 'vol3'}
+    assert get_mock_record().get_request(0)['params'] == {'svm.name': 'svm1', 'fields': 'uuid,name', 'name': 'vol1|vol2|vol3|vol4'}
+    assert get_mock_record().get_request(3)['params'] == {'svm.name': 'svm1', 'fields': 'uuid,name', 'name': 'vol5|vol6'}
+
+
+def test_get_records_by_keys_dotted_key():
+    register_responses([
+        ('GET', 'network/ethernet/ports', SRR['zero_records']),
+        ('GET', 'network/ethernet/ports', SRR['vservers_with_admin']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    assert rest_generic.get_records_by_keys(rest_api, 'network/ethernet/ports', 'node.name', ['n1']) == ({}, None)
+    records, error = rest_generic.get_records_by_keys(rest_api, 'network/ethernet/ports', 'vserver', ['vserver1', 'cserver'], fields='vserver,type')
+    assert error is None
+    assert records['cserver'] == {'vserver': 'cserver', 'type': 'admin'}
+    assert get_mock_record().get_request(1)['params'] == {'fields': 'vserver,type', 'vserver': 'vserver1|cserver'}
+
+
+def test_get_records_by_keys_unique():
+    two_records = (200, {'records': [{'name': 'lif1', 'svm': {'name': 'svm1'}}, {'name': 'lif1', 'svm': {'name': 'svm2'}}], 'num_records': 2}, None)
+    register_responses([
+        ('GET', 'network/ip/interfaces', two_records),
+        ('GET', 'network/ip/interfaces', two_records),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    records, error = rest_generic.get_records_by_keys(rest_api, 'network/ip/interfaces', 'name', ['lif1'])
+    assert error is None
+    assert records['lif1']['svm']['name'] == 'svm2'
+    error = 'calling: network/ip/interfaces: found more than one record with name: lif1.'
+    assert rest_generic.get_records_by_keys(rest_api, 'network/ip/interfaces', 'name', ['lif1'], unique=True) == (None, error)
+
+
+def test_get_records_by_keys_error():
+    register_responses([
+        ('GET', 'storage/volumes', SRR['generic_error']),
+        ('GET', 'storage/volumes', SRR['page_1']),
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['generic_error']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    assert rest_generic.get_records_by_keys(rest_api, 'storage/volumes', 'name', ['vol1']) == (None, 'calling: storage/volumes: got Expected error.')
+    assert rest_generic.get_records_by_keys(rest_api, 'storage/volumes', 'name', ['vol1']) == (None, 'calling: storage/volumes: got Expected error.')
+
+
+def test_get_0_or_more_records_reads_all_pages():
+    register_responses([
+        ('GET', 'storage/volumes', SRR['page_1']),
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['page_2']),
+        ('GET', '/storage/volumes?start.uuid=4&max_records=2', SRR['page_3']),
+        ('GET', 'storage/volumes', SRR['page_1']),
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['generic_error']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    records, error = rest_generic.get_0_or_more_records(rest_api, 'storage/volumes', {'svm.name': 'svm1'}, 'name', max_records=2)
+    assert error is None
+    assert [record['name'] for record in records] == ['vol1', 'vol2', 'vol3', 'vol4', 'vol5']
+    assert get_mock_record().get_request(0)['params'] == {'svm.name': 'svm1', 'fields': 'name', 'max_records': 2}
+    assert rest_generic.get_0_or_more_records(rest_api, 'storage/volumes') == (None, 'calling: storage/volumes: got Expected error.')
+
+
+def test_get_paged_records():
+    register_responses([
+        ('GET', 'storage/volumes', SRR['page_1']),
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['page_2']),
+        ('GET', 'storage/volumes', SRR['page_1']),
+        ('GET', '/storage/volumes?start.uuid=2&max_records=2', SRR['page_2']),
+        ('GET', 'storage/volumes', SRR['zero_records']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    counters = {}
+    # the 3rd page is not read
+    records = [record for record, dummy in rest_generic.get_paged_records(rest_api, 'storage/volumes', limit=3, counters=counters)]
+    assert [record['name'] for record in records] == ['vol1', 'vol2', 'vol3']
+    assert counters == {'num_records': 3, 'num_pages': 2}
+    # the caller can stop at any time
+    for record, dummy in rest_generic.get_paged_records(rest_api, 'storage/volumes', counters=counters):
+        if record['name'] == 'vol4':
+            break
+    assert counters == {'num_records': 4, 'num_pages': 2}
+    assert list(rest_generic.get_paged_records(rest_api, 'storage/volumes', limit=0)) == []
+    assert list(rest_generic.get_paged_records(rest_api, 'storage/volumes', counters=counters)) == []
+    assert counters == {'num_records': 0, 'num_pages': 1}
@@ -0,0 +1,201 @@
+# Copyright (c) 2026 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils rest_jobs.py - batched job polling '''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+import sys
+
+from ansible.module_utils import basic
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+# pylint: disable=unused-import
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import patch_ansible, create_module
+from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, register_responses, get_mock_record
+from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_jobs
+
+if not netapp_utils.HAS_REQUESTS and sys.version_info < (2, 7):
+    pytestmark = pytest.mark.skip('Skipping Unit Tests on 2.6 as requests is not available')
+
+
+def job(uuid):
+    return (202, {'job': {'uuid': uuid, '_links': {'self': {'href': '/api/cluster/jobs/%s' % uuid}}}}, None)
+
+
+def jobs(*states):
+    ''' one record per job, job1 has the first state, ... '''
+    records = [{'uuid': 'job%d' % index, 'state': state, 'message': 'job%d %s' % (index, state)} for index, state in enumerate(states, 1) if state]
+    return (200, {'records': records, 'num_records': len(records)}, None)
+
+
+SRR = rest_responses({
+    'job1': job('job1'),
+    'job2': job('job2'),
+    'job3': job('job3'),
+    'running_running_success': jobs('running', 'running', 'success'),
+    'success_running': jobs('success', 'running'),
+    'job2_success': jobs(None, 'success'),
+    'failure': jobs(None, 'failure'),
+    'running': jobs('running'),
+})
+
+DEFAULT_ARGS = {
+    'hostname': 'test',
+    'username': 'test_user',
+    'password': 'test_pass!',
+}
+
+
+class MockONTAPModule:
+    def __init__(self):
+        self.module = basic.AnsibleModule(netapp_utils.na_ontap_host_argument_spec())
+
+
+def create_tracker(timeout=600, increment=60, module_args=None):
+    module = create_module(MockONTAPModule, DEFAULT_ARGS, module_args)
+    return rest_jobs.JobTracker(netapp_utils.OntapRestAPI(module.module), timeout, increment)
+
+
+def test_get_jobs():
+    assert rest_jobs.get_jobs(None) == []
+    assert rest_jobs.get_jobs({}) == []
+    assert rest_jobs.get_jobs({'job': {'uuid': 'job1'}}) == [{'uuid': 'job1'}]
+    assert rest_jobs.get_jobs({'jobs': [{'uuid': 'job1'}], 'num_records': 1}) == [{'uuid': 'job1'}]
+    assert rest_jobs.get_jobs({'jobs': [{'uuid': 'job1'}, {'uuid': 'job2'}], 'num_records': 2}) == [{'uuid': 'job1'}, {'uuid': 'job2'}]
+
+
+@patch('time.sleep')
+def test_query_based_request_with_several_jobs(mock_sleep):
+    register_responses([
+        ('DELETE', 'protocols/san/igroups', (202, {'jobs': [{'uuid': 'job1'}, {'uuid': 'job2'}], 'num_records': 2}, None)),
+        ('GET', 'cluster/jobs', jobs('success', 'running')),
+        ('GET', 'cluster/jobs', jobs(None, 'failure')),
+    ])
+    tracker = create_tracker()
+    assert tracker.submit('delete', 'DELETE', 'protocols/san/igroups', query={'uuid': 'uuid1|uuid2'}) is None
+    assert get_mock_record().get_request(0)['params'] == {'uuid': 'uuid1|uuid2', 'return_timeout': 0}
+    results = tracker.wait()
+    assert [key for key, dummy, dummy in results] == ['delete', 'delete']
+    assert results[0][1]['job_response'] == 'job1 success'
+    assert results[0][2] is None
+    assert results[1][2].startswith('job reported error: job2 failure, received')
+    assert get_mock_record().get_request(2)['params']['uuid'] == 'job2'
+
+
+@patch('time.sleep')
+def test_jobs_are_polled_together(mock_sleep):
+    register_responses([
+        ('PATCH', 'storage/volumes/uuid1', SRR['job1']),
+        ('POST', 'storage/volumes', SRR['job2']),
+        ('DELETE', 'storage/volumes/uuid3', SRR['job3']),
+        ('POST', 'storage/luns', SRR['success']),
+        ('GET', 'cluster/jobs', SRR['running_running_success']),
+        ('GET', 'cluster/jobs', SRR['success_running']),
+        ('GET', 'cluster/jobs', SRR['job2_success']),
+    ])
+    tracker = create_tracker()
+    assert tracker.submit('modify', 'PATCH', 'storage/volumes', {'comment': 'x'}, uuid='uuid1') is None
+    assert tracker.submit('create', 'POST', 'storage/volumes', {'name': 'vol2'}) is None
+    assert tracker.submit('delete', 'DELETE', 'storage/volumes', uuid='uuid3') is None
+    # a synchronous response, there is no job to wait for
+    assert tracker.submit('lun', 'POST', 'storage/luns', {'name': 'lun1'}, {'allow_existing': True}) is None
+    results = tracker.wait()
+    assert [(key, error) for key, dummy, error in results] == [('modify', None), ('create', None), ('delete', None), ('lun', None)]
+    assert results[0][1]['job_response'] == 'job1 success'
+    assert results[2][1]['job_response'] == 'job3 success'
+    # two delays between three polls
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [0.1, 0.2]
+    record = get_mock_record()
+    assert record.get_request(0)['params'] == {'return_timeout': 0}
+    assert record.get_request(3)['params'] == {'allow_existing': True, 'return_timeout': 0}
+    assert record.get_request(4)['params'] == {'fields': 'uuid,state,message,code,error', 'uuid': 'job1|job2|job3'}
+    # job3 is complete, it is not polled again
+    assert record.get_request(5)['params']['uuid'] == 'job1|job2'
+    assert record.get_request(6)['params']['uuid'] == 'job2'
+
+
+@patch('time.sleep')
+def test_job_errors(mock_sleep):
+    register_responses([
+        ('PATCH', 'storage/volumes/uuid1', SRR['generic_error']),
+        ('PATCH', 'storage/volumes/uuid2', SRR['job2']),
+        ('GET', 'cluster/jobs', SRR['failure']),
+    ])
+    tracker = create_tracker()
+    assert tracker.submit('modify1', 'PATCH', 'storage/volumes', {}, uuid='uuid1') == 'calling: storage/volumes/uuid1: got Expected error.'
+    assert tracker.submit('modify2', 'PATCH', 'storage/volumes', {}, uuid='uuid2') is None
+    errors = tracker.get_errors()
+    assert errors[0] == ('modify1', 'calling: storage/volumes/uuid1: got Expected error.')
+    assert errors[1][0] == 'modify2'
+    assert errors[1][1].startswith('job reported error: job2 failure, received')
+    mock_sleep.assert_not_called()
+
+
+@patch('time.sleep')
+def test_job_timeout(mock_sleep):
+    register_responses([
+        ('POST', 'storage/volumes', SRR['job1']),
+        ('GET', 'cluster/jobs', SRR['running']),
+        ('GET', 'cluster/jobs', SRR['running']),
+        ('GET', 'cluster/jobs', SRR['running']),
+    ])
+    tracker = create_tracker(timeout=10, increment=5, module_args={'feature_flags': {'job_poll_policy': 'fixed'}})
+    tracker.submit('create', 'POST', 'storage/volumes', {})
+    assert tracker.get_errors()[0][1].startswith('job reported error: Timeout error: Process still running, received')
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [5, 5]
+
+
+@patch('time.sleep')
+def test_poll_errors(mock_sleep):
+    register_responses([
+        ('POST', 'storage/volumes', SRR['job1']),
+        ('GET', 'cluster/jobs', SRR['generic_error']),
+        ('GET', 'cluster/jobs', SRR['generic_error']),
+        ('GET', 'cluster/jobs', SRR['generic_error']),
+        ('GET', 'cluster/jobs', SRR['generic_error']),
+    ])
+    tracker = create_tracker()
+    tracker.submit('create', 'POST', 'storage/volumes', {})
+    error = tracker.get_errors()[0][1]
+    assert error.startswith('job reported error: calling: cluster/jobs: got Expected error. - calling: cluster/jobs')
+    # errors are retried after increment seconds, even with the adaptive policy
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [60, 60, 60]
+
+
+@patch('time.sleep')
+def test_poll_error_then_success(mock_sleep):
+    register_responses([
+        ('POST', 'storage/volumes', SRR['job1']),
+        ('GET', 'cluster/jobs', SRR['generic_error']),
+        ('GET', 'cluster/jobs', SRR['running']),
+        ('GET', 'cluster/jobs', jobs('success')),
+    ])
+    tracker = create_tracker(increment=5)
+    tracker.submit('create', 'POST', 'storage/volumes', {})
+    assert tracker.get_errors() == []
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [5, 0.1]
+
+
+@patch('time.sleep')
+def test_retry_after_is_capped(mock_sleep):
+    ''' Retry-After cannot delay the next poll past the increment, or past the timeout '''
+    register_responses([
+        ('POST', 'storage/volumes', SRR['job1']),
+        ('GET', 'cluster/jobs', SRR['running']),
+        ('GET', 'cluster/jobs', SRR['running']),
+        ('GET', 'cluster/jobs', jobs('success')),
+    ])
+    tracker = create_tracker(timeout=8, increment=5)
+    tracker.submit('create', 'POST', 'storage/volumes', {})
+    with patch.object(tracker.rest_api, 'get_retry_after', return_value=3600):
+        assert tracker.get_errors() == []
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [5, 3]
+
+
+def test_unexpected_method():
+    tracker = create_tracker()
+    with pytest.raises(KeyError):
+        tracker.submit('get', 'GET', 'storage/volumes')
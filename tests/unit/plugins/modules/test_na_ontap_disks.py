@@ -820,3 +820,63 @@ def test_rest_no_action(mock_request, patch_ansible):        # pylint: disable=r
     assert exc.value.args[0]['changed'] is False
     print(mock_request.mock_calls)
     assert len(mock_request.mock_calls) == 4
+
+
+@patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapRestAPI.send_request')
+def test_rest_unassign_parallel(mock_request, patch_ansible):      # pylint: disable=redefined-outer-name,unused-argument
+    ''' remove ownership of 6 disks, 4 at a time, all disks are attempted and errors are reported for each disk '''
+    args = dict(default_args())
+    args['disk_count'] = 13
+    args['parallelism'] = 4
+    set_module_args(args)
+    responses = [
+        SRR['is_rest'],
+        SRR['owned_disk_record'],
+        SRR['unassigned_disk_record'],
+        SRR['home_spare_disk_info_record'],
+    ]
+    removed = []
+
+    def send_request(method, api, params, json=None, headers=None, files=None):
+        if api == 'private/cli/storage/disk/removeowner':
+            removed.append(json['disk'])
+            return SRR['generic_error'] if json['disk'] in ('1.0.9', '1.0.17') else SRR['empty_good']
+        return responses.pop(0) if responses else SRR['end_of_sequence']
+
+    mock_request.side_effect = send_request
+    my_obj = my_module()
+    with pytest.raises(AnsibleFailJson) as exc:
+        my_obj.apply()
+    assert len(removed) == 6
+    assert exc.value.args[0]['msg'] == 'Error removing ownership of 2 of 6 disks: 1.0.9: Expected error, 1.0.17: Expected error'
+    assert exc.value.args[0]['unassign_summary'] == {
+        'requested': 6, 'removed': 4, 'failed': 2, 'errors': {'1.0.9': 'Expected error', '1.0.17': 'Expected error'}}
+
+
+@patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapRestAPI.send_request')
+def test_rest_unassign_summary(mock_request, patch_ansible):      # pylint: disable=redefined-outer-name,unused-argument
+    args = dict(default_args())
+    args['disk_count'] = 17
+    set_module_args(args)
+    mock_request.side_effect = [
+        SRR['is_rest'],
+        SRR['owned_disk_record'],
+        SRR['unassigned_disk_record'],
+        SRR['home_spare_disk_info_record'],
+        SRR['empty_good'],  # unassign
+        SRR['empty_good'],  # unassign
+        SRR['end_of_sequence']
+    ]
+    my_obj = my_module()
+    with pytest.raises(AnsibleExitJson) as exc:
+        my_obj.apply()
+    assert exc.value.args[0]['unassign_summary'] == {'requested': 2, 'removed': 2, 'failed': 0}
+
+
+def test_invalid_parallelism(patch_ansible):
+    args = dict(default_args())
+    args['parallelism'] = 0
+    set_module_args(args)
+    with pytest.raises(AnsibleFailJson) as exc:
+        my_module()
+    assert exc.value.args[0]['msg'] == 'Error: parallelism must be greater than or equal to 1, got: 0.'
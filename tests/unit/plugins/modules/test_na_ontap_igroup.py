@@ -8,10 +8,11 @@ __metaclass__ = type
 import pytest
 import sys
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import set_module_args, \
     AnsibleFailJson, patch_ansible, create_module, create_and_apply, assert_warning_was_raised, assert_no_warnings, print_warnings
-from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, \
+from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import get_mock_record, patch_request_and_invoke, \
     register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_response, zapi_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
@@ -212,7 +213,16 @@ SRR = rest_responses({
              protocol='fcp',
              os_type='aix')
     ], num_records=1), None),
-    'one_record_uuid': (200, dict(records=[dict(uuid='a1b2c3')], num_records=1), None)
+    'one_record_uuid': (200, dict(records=[dict(uuid='a1b2c3')], num_records=1), None),
+    'igroup_with_initiators': (200, dict(records=[
+        dict(uuid='a1b2c3',
+             name='test',
+             svm=dict(name='vserver'),
+             initiators=[{'name': 'init%d' % index, 'comment': 'old'} for index in range(1, 9)],
+             igroups=[{'name': 'ig1', 'uuid': 'ig1_uuid'}, {'name': 'ig2', 'uuid': 'ig2_uuid'}],
+             protocol='fcp',
+             os_type='aix')
+    ], num_records=1), None),
 })
 
 
@@ -307,6 +317,55 @@ def test_successful_modify_igroups_rest():
     assert create_and_apply(igroup, DEFAULT_ARGS_COPY, args)['changed']
 
 
+def test_successful_modify_many_initiators_rest():
+    ''' the number of calls does not depend on the number of initiators to add, remove, or modify '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/san/igroups', SRR['igroup_with_initiators']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/igroups', SRR['success']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/initiators', SRR['success']),
+        ('POST', 'protocols/san/igroups/a1b2c3/initiators', SRR['success']),
+        ('PATCH', 'protocols/san/igroups/a1b2c3/initiators/init4', SRR['success']),
+        ('PATCH', 'protocols/san/igroups/a1b2c3/initiators', SRR['success']),
+        ('PATCH', 'protocols/san/igroups/a1b2c3', SRR['success'])
+    ])
+    DEFAULT_ARGS_COPY = DEFAULT_ARGS.copy()
+    del DEFAULT_ARGS_COPY['initiator_names']
+    DEFAULT_ARGS_COPY['initiator_objects'] = [{'name': 'init%d' % index, 'comment': 'new'} for index in range(1, 4)]
+    DEFAULT_ARGS_COPY['initiator_objects'].append({'name': 'init4', 'comment': 'other'})
+    DEFAULT_ARGS_COPY['initiator_objects'].extend({'name': 'init%d' % index} for index in range(10, 14))
+    args = {
+        'use_rest': 'always',
+        'force_remove_initiator': True
+    }
+    assert create_and_apply(igroup, DEFAULT_ARGS_COPY, args)['changed']
+    record = get_mock_record()
+    assert record.get_request(2)['params'] == {'uuid': 'ig1_uuid|ig2_uuid', 'allow_delete_while_mapped': True, 'return_timeout': 0}
+    assert record.get_request(3)['params'] == {'name': 'init5|init6|init7|init8', 'allow_delete_while_mapped': True, 'return_timeout': 0}
+    assert [item['name'] for item in record.get_request(4)['json']['records']] == ['init10', 'init11', 'init12', 'init13']
+    assert record.get_request(6)['params'] == {'name': 'init1|init2|init3', 'return_timeout': 0}
+    assert record.get_request(6)['json'] == {'comment': 'new'}
+
+
+@patch('time.sleep')
+def test_query_based_requests_with_several_jobs_rest(dont_sleep):
+    ''' a query based DELETE or PATCH matching several records can return a job for each of them '''
+    two_jobs = (202, {'jobs': [{'uuid': 'job1'}, {'uuid': 'job2'}], 'num_records': 2}, None)
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/san/igroups', SRR['igroup_with_initiators']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/igroups', two_jobs),
+        ('GET', 'cluster/jobs', (200, {'records': [{'uuid': 'job1', 'state': 'success'}, {'uuid': 'job2', 'state': 'running'}]}, None)),
+        ('GET', 'cluster/jobs', (200, {'records': [{'uuid': 'job2', 'state': 'success'}]}, None)),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/initiators', two_jobs),
+        ('GET', 'cluster/jobs', (200, {'records': [{'uuid': 'job1', 'state': 'failure', 'message': 'in use'},
+                                                   {'uuid': 'job2', 'state': 'success'}]}, None)),
+    ])
+    error = create_and_apply(igroup, DEFAULT_ARGS, {'use_rest': 'always'}, fail=True)['msg']
+    assert error.startswith('Error: job reported error: in use, received')
+    assert get_mock_record().get_request(5)['params'] == {'name': 'init2|init3|init4|init5|init6|init7|init8', 'return_timeout': 0}
+
+
 def test_9_9_0_no_igroups_rest():
     ''' Test failed to use igroups '''
     register_responses([
@@ -6,18 +6,20 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import json
 import pytest
 import sys
+import xmltodict
 
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 # pylint: disable=unused-import
-from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, register_responses
+from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, register_responses, get_mock_record
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_response, zapi_error_message, zapi_responses
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
     assert_warning_was_raised, expect_and_capture_ansible_exception, call_main, create_module, patch_ansible, print_warnings
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_info import NetAppONTAPGatherInfo as my_module, main as my_main
-from ansible_collections.netapp.ontap.plugins.modules.na_ontap_info import convert_keys as info_convert_keys, __finditem as info_finditem
+from ansible_collections.netapp.ontap.plugins.modules.na_ontap_info import convert_keys as info_convert_keys, __finditem as info_finditem, zapi_to_dict
 
 if not netapp_utils.has_netapp_lib():
     pytestmark = pytest.mark.skip('skipping as missing required netapp_lib')
@@ -162,6 +164,18 @@ def test_main(get_all):
     assert 'test_get_all' in results['ontap_info']
 
 
+@patch('ansible_collections.netapp.ontap.plugins.modules.na_ontap_info.NetAppONTAPGatherInfo.get_all')
+def test_main_with_metrics(get_all):
+    '''test main method - metrics are reported with collect_metrics.'''
+    register_responses([
+    ])
+    get_all.side_effect = [{'test_get_all': {}}]
+    results = call_main(my_main, DEFAULT_ARGS, {'feature_flags': {'collect_metrics': True}})
+    assert 'metrics' in results
+    get_all.side_effect = [{'test_get_all': {}}]
+    assert 'metrics' not in call_main(my_main, DEFAULT_ARGS)
+
+
 @patch('ansible_collections.netapp.ontap.plugins.modules.na_ontap_info.NetAppONTAPGatherInfo.get_all')
 def test_main_with_state(get_all):
     '''test main method with explicit state.'''
@@ -211,8 +225,8 @@ def test_ontapi_error():
     assert error in expect_and_capture_ansible_exception(obj.ontapi, 'fail')['msg']
 
 
-def test_call_api_error():
-    '''test call_api will raise zapi error'''
+def test_get_next_pages_zapi_error():
+    '''test get_next_pages will raise zapi error'''
     register_responses([
         ('ZAPI', 'security-key-manager-key-get-iter', ZRR['error']),
         ('ZAPI', 'lun-get-iter', ZRR['error_missing_api']),
@@ -220,13 +234,13 @@ def test_call_api_error():
     ])
     obj = create_module(my_module, DEFAULT_ARGS)
     # 1 error is ignored
-    assert obj.call_api('security-key-manager-key-get-iter') == (None, None)
+    assert list(obj.get_next_pages('security-key-manager-key-get-iter')) == []
     # 2 missing API (cluster admin API not visible at vserver level)
     error = zapi_error_message('Error invalid API.  Most likely running a cluster level API as vserver', 13005)
-    assert error in expect_and_capture_ansible_exception(obj.call_api, 'fail', 'lun-get-iter')['msg']
+    assert error in expect_and_capture_ansible_exception(list, 'fail', obj.get_next_pages('lun-get-iter'))['msg']
     # 3 API error
     error = zapi_error_message('Error calling API nvme-get-iter')
-    assert error in expect_and_capture_ansible_exception(obj.call_api, 'fail', 'nvme-get-iter')['msg']
+    assert error in expect_and_capture_ansible_exception(list, 'fail', obj.get_next_pages('nvme-get-iter'))['msg']
 
 
 def test_get_generic_get_iter_key_error():
@@ -712,7 +726,35 @@ def test_repeated_get_error():
     module_args = {'query': {}}
     obj = create_module(my_module, DEFAULT_ARGS, module_args)
     error = "'next-tag' is not expected for this API"
-    assert error in expect_and_capture_ansible_exception(obj.call_api, 'fail', 'lun-get-iter', attributes_list_tag=None)['msg']
+    assert error in expect_and_capture_ansible_exception(list, 'fail', obj.get_next_pages('lun-get-iter', attributes_list_tag=None))['msg']
+
+
+def test_get_next_pages_one_page_at_a_time():
+    register_responses([
+        ('ZAPI', 'lun-get-iter', ZRR['lun_info_next_2']),
+        ('ZAPI', 'lun-get-iter', ZRR['lun_info']),
+    ])
+    obj = create_module(my_module, DEFAULT_ARGS)
+    pages = obj.get_next_pages('lun-get-iter')
+    page, error = next(pages)
+    assert error is None
+    assert page.get_child_by_name('attributes-list').get_child_by_name('lun-info').get_child_content('path') == 'p2'
+    # the next page is only read when requested
+    assert len(get_mock_record().requests) == 1
+    page, error = next(pages)
+    assert error is None
+    assert page.get_child_by_name('attributes-list').get_child_by_name('lun-info').get_child_content('path') == 'p1'
+    assert next(pages, None) is None
+    assert get_mock_record().is_text_in_zapi_request('<tag>next_tag</tag>', 1)
+
+
+def test_get_next_pages_error_on_second_page():
+    register_responses([
+        ('ZAPI', 'lun-get-iter', ZRR['lun_info_next_2']),
+        ('ZAPI', 'lun-get-iter', ZRR['error']),
+    ])
+    obj = create_module(my_module, DEFAULT_ARGS, {'continue_on_error': 'always'})
+    assert obj.get_generic_get_iter('lun-get-iter', attribute='lun-info', key_fields='path') == {'error': zapi_error_message('Error calling API lun-get-iter')}
 
 
 def test_attribute_error():
@@ -740,3 +782,60 @@ def test_continue_on_error():
     error = {'error': zapi_error_message('Error calling API license-v2-list-info')}
     assert info is not None
     assert info['ontap_info']['license_info'] == error
+
+
+def synthetic_volume_records(count):
+    response = netapp_utils.zapi.NaElement('results')
+    response.add_attr('status', 'passed')
+    attributes_list = netapp_utils.zapi.NaElement('attributes-list')
+    for index in range(count):
+        record = netapp_utils.zapi.NaElement('volume-attributes')
+        record.translate_struct({
+            'volume-id-attributes': {'name': 'vol_%d' % index, 'owning-vserver-name': 'svm_%d' % (index % 10), 'comment': None},
+            'volume-space-attributes': {'size': str(index * 4096), 'percentage-snapshot-reserve': '5'},
+            'volume-state-attributes': {'state': 'online', 'is-node-root': 'false'},
+        })
+        attributes_list.add_child_elem(record)
+    response.add_child_elem(attributes_list)
+    response.add_new_child('num-records', str(count))
+    return response, 'valid'
+
+
+def legacy_generic_get_iter(attributes_list, key_fields):
+    ''' previous implementation: XML round-trip, JSON round-trip, and a copy of the output dict for each record '''
+    out = {}
+    for child in attributes_list.get_children():
+        dic = xmltodict.parse(child.to_string(), xml_attribs=False)['volume-attributes']
+        info = info_convert_keys(json.loads(json.dumps(dic)))
+        unique_key = ':'.join([info_finditem(dic, el) for el in key_fields])
+        out = out.copy()
+        out.update({unique_key: info})
+    return out
+
+
+def test_generic_get_iter_matches_previous_implementation():
+    ''' the records are converted as with the previous implementation '''
+    count = 1000
+    records = synthetic_volume_records(count)[0]
+    key_fields = ('owning-vserver-name', 'name')
+    register_responses([
+    ])
+    obj = create_module(my_module, DEFAULT_ARGS)
+    with patch.object(my_module, 'get_next_pages', return_value=iter([(records, None)])):
+        result = obj.get_generic_get_iter('volume-get-iter', attribute='volume-attributes', key_fields=key_fields)
+    legacy_result = legacy_generic_get_iter(records.get_child_by_name('attributes-list'), key_fields)
+    assert len(result) == count
+    assert result == legacy_result
+    assert result['svm_3:vol_13']['volume_id_attributes']['comment'] is None
+
+
+def test_zapi_to_dict_matches_xmltodict():
+    xml = b'''<netapp xmlns="http://www.netapp.com/filer/admin" version="1.21"><results status="passed"><attributes-list>
+        <net-port-info><node>node_0</node><port> e0a </port><empty/><blank>  </blank>
+        <vlans><vlan>10</vlan><vlan>20</vlan><vlan/></vlans><mixed>text<child>value</child></mixed></net-port-info>
+        </attributes-list></results></netapp>'''
+    response = netapp_utils.zapi.NaElement(netapp_utils.zapi.etree.XML(xml))
+    record = response.get_child_by_name('results').get_child_by_name('attributes-list').get_children()[0]
+    expected = xmltodict.parse(record.to_string(), xml_attribs=False)['net-port-info']
+    assert zapi_to_dict(record) == json.loads(json.dumps(expected))
+    assert zapi_to_dict(record)['vlans']['vlan'] == ['10', '20', None]
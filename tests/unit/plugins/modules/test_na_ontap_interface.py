@@ -15,7 +15,7 @@ import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_ut
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import assert_no_warnings, \
     assert_warning_was_raised, print_warnings, call_main, create_module, expect_and_capture_ansible_exception, patch_ansible
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import\
-    patch_request_and_invoke, register_responses
+    get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_error_message, rest_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_error, build_zapi_response, zapi_responses
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_interface \
@@ -91,7 +91,10 @@ def test_module_fail_when_required_args_missing():
     }
     error = create_module(interface_module, module_args, fail=True)['msg']
     assert 'missing required arguments:' in error
-    assert 'interface_name' in error
+    assert 'hostname' in error
+    module_args['hostname'] = 'test'
+    error = create_module(interface_module, module_args, fail=True)['msg']
+    assert 'one of the following is required: interface_name, migrate_interfaces' in error
 
 
 @pytest.mark.skipif(not netapp_utils.has_netapp_lib(), reason="skipping as missing required netapp_lib")
@@ -993,6 +996,156 @@ def test_rest_migrate_ip_timeout(sleep_mock):
     assert_warning_was_raised('Failed to confirm interface is migrated after 120 seconds')
 
 
+@patch('time.sleep')
+def test_rest_migrate_ip_fast_confirm(sleep_mock):
+    ''' with lif_migrate_initial_interval, the first check is not delayed by 10 seconds '''
+    modified = copy.deepcopy(SRR['one_record_home_node'])
+    modified[1]['records'][0]['location']['node']['name'] = 'node1'
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', SRR['one_record_home_node']),      # get IP
+        ('GET', 'cluster/nodes', SRR['nodes']),                             # get nodes (for get)
+        ('PATCH', 'network/ip/interfaces/54321', SRR['success']),
+        ('GET', 'network/ip/interfaces', SRR['one_record_home_node']),      # get - no change
+        ('PATCH', 'network/ip/interfaces/54321', SRR['success']),
+        ('GET', 'network/ip/interfaces', SRR['one_record_home_node']),      # get - no change
+        ('PATCH', 'network/ip/interfaces/54321', SRR['success']),
+        ('GET', 'network/ip/interfaces', modified),
+    ])
+    module_args = {
+        'use_rest': 'always',
+        'ipspace': 'cluster',
+        'address': '10.12.12.13',
+        'netmask': '255.255.192.0',
+        'current_node': 'node1',
+        'feature_flags': {'lif_migrate_initial_interval': 0.5},
+    }
+    assert call_main(my_main, DEFAULT_ARGS, module_args)['changed']
+    assert [call[0][0] for call in sleep_mock.call_args_list] == [0.5, 1, 2]
+
+
+def test_migrate_poll_intervals():
+    my_obj = create_module(interface_module, DEFAULT_ARGS, {'use_rest': 'never', 'vserver': 'vserver'})
+    assert list(my_obj.get_migrate_poll_intervals()) == [10] * 12
+    my_obj = create_module(interface_module, DEFAULT_ARGS, {'use_rest': 'never', 'vserver': 'vserver', 'feature_flags': {'lif_migrate_initial_interval': 1}})
+    assert list(my_obj.get_migrate_poll_intervals()) == [1, 2, 4, 8] + [10] * 11
+
+
+def lif_record(name, uuid, node, port='e0c'):
+    return {'name': name, 'uuid': uuid, 'location': {'node': {'name': node}, 'port': {'name': port}}}
+
+
+MIGRATE_ARGS = {
+    'hostname': '10.10.10.10',
+    'username': 'admin',
+    'password': 'password',
+    'use_rest': 'always',
+    'vserver': 'vserver',
+    'migrate_interfaces': [
+        {'interface_name': 'lif1', 'current_node': 'node2'},
+        {'interface_name': 'lif2', 'current_node': 'node2', 'current_port': 'e0d'},
+        {'interface_name': 'lif3', 'current_node': 'node2'},
+    ],
+}
+
+
+@patch('time.sleep')
+def test_rest_migrate_interfaces(sleep_mock):
+    ''' lif3 is already on node2, lif1 and lif2 are confirmed with a single query '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [
+            lif_record('lif1', 'uuid1', 'node1'), lif_record('lif2', 'uuid2', 'node1'), lif_record('lif3', 'uuid3', 'node2')]}, None)),
+        ('PATCH', 'network/ip/interfaces/uuid1', SRR['success']),
+        ('PATCH', 'network/ip/interfaces/uuid2', SRR['success']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [lif_record('lif1', 'uuid1', 'node2'), lif_record('lif2', 'uuid2', 'node2')]}, None)),
+        ('PATCH', 'network/ip/interfaces/uuid2', SRR['success']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [lif_record('lif2', 'uuid2', 'node2', 'e0d')]}, None)),
+    ])
+    result = call_main(my_main, MIGRATE_ARGS)
+    assert result['changed']
+    assert result['migrated_interfaces'] == ['lif1', 'lif2']
+    assert_no_warnings()
+    records = get_mock_record()
+    assert records.get_request(1)['params'] == {'svm.name': 'vserver', 'name': 'lif1|lif2|lif3', 'fields': 'name,uuid,location,svm.name'}
+    assert records.get_request(3)['json'] == {'location': {'port': {'name': 'e0d', 'node': {'name': 'node2'}}}}
+    assert records.get_request(4)['params']['uuid'] == 'uuid1|uuid2'
+    assert records.get_request(6)['params']['uuid'] == 'uuid2'
+
+
+@patch('time.sleep')
+def test_rest_migrate_interfaces_idempotent_and_errors(sleep_mock):
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [
+            lif_record('lif1', 'uuid1', 'node2'), lif_record('lif2', 'uuid2', 'node2', 'e0d'), lif_record('lif3', 'uuid3', 'node2')]}, None)),
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [lif_record('lif1', 'uuid1', 'node1')]}, None)),
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', SRR['generic_error']),
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [
+            lif_record('lif1', 'uuid1', 'node1'), lif_record('lif2', 'uuid2', 'node2', 'e0d'), lif_record('lif3', 'uuid3', 'node2')]}, None)),
+        ('PATCH', 'network/ip/interfaces/uuid1', SRR['generic_error']),
+    ])
+    result = call_main(my_main, MIGRATE_ARGS)
+    assert not result['changed']
+    assert result['migrated_interfaces'] == []
+    assert call_main(my_main, MIGRATE_ARGS, fail=True)['msg'] == 'Error: interfaces to migrate not found: lif2, lif3'
+    assert call_main(my_main, MIGRATE_ARGS, fail=True)['msg'] == 'Error fetching interfaces to migrate: calling: network/ip/interfaces: got Expected error.'
+    assert call_main(my_main, MIGRATE_ARGS, fail=True)['msg'] == 'Error migrating interface lif1: calling: network/ip/interfaces/uuid1: got Expected error.'
+
+
+@patch('time.sleep')
+def test_rest_migrate_interfaces_timeout(sleep_mock):
+    responses = [
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [
+            lif_record('lif1', 'uuid1', 'node1'), lif_record('lif2', 'uuid2', 'node2', 'e0d'), lif_record('lif3', 'uuid3', 'node2')]}, None)),
+    ]
+    for dummy in range(12):
+        responses.append(('PATCH', 'network/ip/interfaces/uuid1', SRR['success']))
+        responses.append(('GET', 'network/ip/interfaces', (200, {'records': [lif_record('lif1', 'uuid1', 'node1')]}, None)))
+    register_responses(responses)
+    assert call_main(my_main, MIGRATE_ARGS)['changed']
+    assert_warning_was_raised('Failed to confirm interfaces are migrated after 120 seconds: lif1')
+
+
+@patch('time.sleep')
+def test_rest_migrate_interfaces_same_name_in_two_svms(sleep_mock):
+    ''' without vserver, the interfaces cannot be told apart '''
+    lif1_svm1 = dict(lif_record('lif1', 'uuid1', 'node1'), svm={'name': 'svm1'})
+    lif1_svm2 = dict(lif_record('lif1', 'uuid2', 'node1'), svm={'name': 'svm2'})
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [lif1_svm1, lif1_svm2], 'num_records': 2}, None)),
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [lif1_svm2], 'num_records': 1}, None)),
+        ('PATCH', 'network/ip/interfaces/uuid2', SRR['success']),
+        ('GET', 'network/ip/interfaces', (200, {'records': [dict(lif_record('lif1', 'uuid2', 'node2'), svm={'name': 'svm2'})]}, None)),
+    ])
+    module_args = dict(MIGRATE_ARGS, migrate_interfaces=[{'interface_name': 'lif1', 'current_node': 'node2'}])
+    del module_args['vserver']
+    msg = 'Error fetching interfaces to migrate: calling: network/ip/interfaces: found more than one record with name: lif1.  '\
+          'Set vserver to select the interfaces.'
+    assert call_main(my_main, module_args, fail=True)['msg'] == msg
+    assert get_mock_record().get_request(1)['params'] == {'name': 'lif1', 'fields': 'name,uuid,location,svm.name'}
+    module_args['vserver'] = 'svm2'
+    assert call_main(my_main, module_args)['migrated_interfaces'] == ['lif1']
+    assert get_mock_record().get_request(3)['params']['svm.name'] == 'svm2'
+
+
+def test_migrate_interfaces_rejects_absent_without_interface_name():
+    module_args = dict(MIGRATE_ARGS, state='absent')
+    msg = 'Error: state: absent requires interface_name, migrate_interfaces only migrates interfaces.'
+    assert call_main(my_main, module_args, fail=True)['msg'] == msg
+
+
+def test_migrate_interfaces_requires_rest():
+    module_args = dict(MIGRATE_ARGS, use_rest='never')
+    assert 'Error option migrate_interfaces requires REST.' == call_main(my_main, module_args, fail=True)['msg']
+
+
 def test_rest_create_migrate_fc_error():
     ''' create cluster '''
     register_responses([
@@ -13,7 +13,7 @@ from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mo
     call_main, create_module, expect_and_capture_ansible_exception, patch_ansible
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import\
-    patch_request_and_invoke, register_responses
+    get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_error, build_zapi_response, zapi_error_message, zapi_responses
 
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_lun import NetAppOntapLUN as my_module, main as my_main  # module under test
@@ -139,6 +139,25 @@ def test_create_rename_idempotency():
     assert not call_main(my_main, DEFAULT_ARGS, module_args)['changed']
 
 
+def test_get_lun_filters_by_path():
+    ''' ONTAP filters LUNs by path, rather than returning every LUN in the volume '''
+    register_responses([
+        ('ZAPI', 'lun-get-iter', ZRR['lun_info']),
+        ('ZAPI', 'lun-get-iter', ZRR['lun_info']),
+    ])
+    module_args = {
+        'use_rest': 'never',
+        'flexvol_name': 'vol_name',
+    }
+    my_obj = create_module(my_module, DEFAULT_ARGS, module_args)
+    assert my_obj.get_lun('lun_name') is not None
+    assert get_mock_record().is_text_in_zapi_request('<path>*/lun_name</path>', 0)
+    assert get_mock_record().is_text_in_zapi_request('<volume>vol_name</volume>', 0)
+    my_obj.get_lun('lun_name', '/vol/vol_name/lun_name')
+    assert get_mock_record().is_text_in_zapi_request('<path>/vol/vol_name/lun_name</path>', 1)
+    assert not get_mock_record().is_text_in_zapi_request('<volume>', 1, present=False)
+
+
 def test_delete_lun():
     ''' Test delete and idempotency '''
     register_responses([
@@ -298,6 +298,39 @@ def test_get_lun_more():
     assert get_results[1]['name'] == '/vol/volume1/qtree1/lun2'
 
 
+def test_get_lun_filters_by_name():
+    ''' ONTAP filters LUNs by name, rather than returning every LUN in the volume '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/luns', SRR['one_lun']),
+        ('GET', 'storage/luns', SRR['one_lun']),
+    ])
+    module_args = {
+        'name': 'lun1',
+        'flexvol_name': 'volume1',
+    }
+    my_obj = create_module(my_module, DEFAULT_ARGS_MIN, module_args)
+    assert my_obj.get_lun('lun1')['path'] == '/vol/volume1/qtree1/lun1'
+    query = get_mock_record().get_request(1)['params']
+    assert query['name'] == '*/lun1'
+    assert query['location.volume.name'] == 'volume1'
+    assert my_obj.get_lun('/vol/volume1/qtree1/lun1')['path'] == '/vol/volume1/qtree1/lun1'
+    assert get_mock_record().get_request(2)['params']['name'] == '/vol/volume1/qtree1/lun1'
+
+
+def test_find_lun_uses_path_and_name_index():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+    ])
+    my_obj = create_module(my_module, DEFAULT_ARGS)
+    luns = [{'path': '/vol/volume1/qtree1/lun1'}, {'path': '/vol/volume1/lun2'}, {'path': '/vol/volume1/qtree2/lun1'}]
+    assert my_obj.find_lun(luns, 'lun1') is luns[0]
+    assert my_obj.find_lun(luns, '/vol/volume1/qtree2/lun1') is luns[2]
+    assert my_obj.find_lun(luns, 'lun1', '/vol/volume1/qtree2/lun1') is luns[2]
+    assert my_obj.find_lun(luns, 'lun3') is None
+    assert my_obj.find_lun(None, 'lun1') is None
+
+
 def test_error_get_lun_with_flexvol():
     register_responses([
         ('GET', 'cluster', SRR['is_rest']),
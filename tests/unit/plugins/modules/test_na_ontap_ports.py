@@ -213,6 +213,20 @@ SRR = {
                 'uuid': 'ea63420b-2ab3-11ec-aa30-005056b3dfc8'
             }]
     }, None),
+    'port_detail_e0b_e0d': (200, {
+        "num_records": 2,
+        "records": [
+            {
+                'name': 'e0b',
+                'node': {'name': 'mohan9cluster2-01'},
+                'uuid': 'ea64c0f2-2ab3-11ec-aa30-005056b3dfc8'
+            },
+            {
+                'name': 'e0d',
+                'node': {'name': 'mohan9cluster2-01'},
+                'uuid': 'ea670505-2ab3-11ec-aa30-005056b3dfc8'
+            }]
+    }, None),
     'port_detail_e0b': (200, {
         "num_records": 1,
         "records": [
@@ -355,23 +369,23 @@ SRR = {
     }, None),
     'lif_svm3_681_1_1': (200, {
         "num_records": 1,
-        "records": [{"uuid": "d229cc03-7797-11ec-95ea-005056b3b297"}]
+        "records": [{"name": "lif_svm3_681_1_1", "uuid": "d229cc03-7797-11ec-95ea-005056b3b297"}]
     }, None),
     'lif_svm3_681_1_2': (200, {
         "num_records": 1,
-        "records": [{"uuid": "d24e03c6-7797-11ec-95ea-005056b3b297"}]
+        "records": [{"name": "lif_svm3_681_1_2", "uuid": "d24e03c6-7797-11ec-95ea-005056b3b297"}]
     }, None),
     'lif_svm3_681_1': (200, {
         "num_records": 1,
-        "records": [{"uuid": "2bf30606-728f-11ec-95ea-005056b3b297"}]
+        "records": [{"name": "lif_svm3_681_1", "uuid": "2bf30606-728f-11ec-95ea-005056b3b297"}]
     }, None),
     'lif_svm3_681_2': (200, {
         "num_records": 1,
-        "records": [{"uuid": "2c373289-728f-11ec-95ea-005056b3b297"}]
+        "records": [{"name": "lif_svm3_681_2", "uuid": "2c373289-728f-11ec-95ea-005056b3b297"}]
     }, None),
     'lif_svm3_856': (200, {
         "num_records": 1,
-        "records": [{"uuid": "6a82e94a-72da-11ec-95ea-005056b3b297"}]
+        "records": [{"name": "lif_svm3_856", "uuid": "6a82e94a-72da-11ec-95ea-005056b3b297"}]
     }, None)
 }
 
@@ -393,8 +407,7 @@ def test_add_broadcast_domain_port_rest(mock_request, patch_ansible):
     set_module_args(args)
     mock_request.side_effect = [
         SRR['is_rest_9_8'],                # get version
-        SRR['port_detail_e0b'],
-        SRR['port_detail_e0d'],
+        SRR['port_detail_e0b_e0d'],        # get e0b and e0d in a single query
         SRR['broadcast_domain_record1'],   # get
         SRR['empty_good'],                 # add e0b
         SRR['empty_good'],                 # add e0d
@@ -429,6 +442,29 @@ def test_add_broadcast_domain_port_rest_idempotent(mock_request, patch_ansible):
     assert_no_warnings()
 
 
+@patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapRestAPI.send_request')
+def test_get_ports_rest_one_query_per_node(mock_request, patch_ansible):
+    ''' ports are fetched with a single query for each node '''
+    args = dict(default_args('broadcast_domain'))
+    args['names'] = ["mohan9cluster2-01:e0b", "mohan9cluster2-02:e0a", "mohan9cluster2-01:e0d"]
+    set_module_args(args)
+
+    def get_ports(method, api, params=None, **kwargs):
+        if api == 'cluster':
+            return SRR['is_rest_9_8']
+        # e0a is not found on node 02
+        return SRR['port_detail_e0b_e0d'] if params['node.name'] == 'mohan9cluster2-01' else SRR['zero_record']
+
+    mock_request.side_effect = get_ports
+    with pytest.raises(AnsibleFailJson) as exc:
+        port_module()
+    assert exc.value.args[0]['msg'] == 'Error: ports: mohan9cluster2-02:e0a not found'
+    queries = [call[0][2] for call in mock_request.call_args_list[1:]]
+    assert len(queries) == 2
+    assert {'node.name': 'mohan9cluster2-02', 'fields': 'name,uuid,node.name', 'name': 'e0a'} in queries
+    assert [query['name'] for query in queries if query['node.name'] == 'mohan9cluster2-01'] in (['e0b|e0d'], ['e0d|e0b'])
+
+
 @patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapRestAPI.send_request')
 def test_remove_broadcast_domain_port_rest(mock_request, patch_ansible):
     ''' test remove broadcast domain port'''
@@ -439,8 +475,7 @@ def test_remove_broadcast_domain_port_rest(mock_request, patch_ansible):
     set_module_args(args)
     mock_request.side_effect = [
         SRR['is_rest_9_8'],                # get version
-        SRR['port_detail_e0b'],
-        SRR['port_detail_e0d'],
+        SRR['port_detail_e0b_e0d'],        # get e0b and e0d in a single query
         SRR['broadcast_domain_record'],    # get
         SRR['empty_good'],                 # remove e0b and e0d
         SRR['end_of_sequence']
@@ -461,8 +496,7 @@ def test_remove_broadcast_domain_port_rest_idempotent(mock_request, patch_ansibl
     set_module_args(args)
     mock_request.side_effect = [
         SRR['is_rest_9_8'],                # get version
-        SRR['port_detail_e0b'],
-        SRR['port_detail_e0d'],
+        SRR['port_detail_e0b_e0d'],        # get e0b and e0d in a single query
         SRR['broadcast_domain_record1'],   # get
         SRR['end_of_sequence']
     ]
@@ -498,8 +532,7 @@ def test_module_error_get_broadcast_domain_ports_rest(mock_request, patch_ansibl
     set_module_args(args)
     mock_request.side_effect = [
         SRR['is_rest_9_8'],            # get version
-        SRR['port_detail_e0b'],
-        SRR['port_detail_e0d'],
+        SRR['port_detail_e0b_e0d'],        # get e0b and e0d in a single query
         SRR['generic_error'],          # Error in getting broadcast domain ports
     ]
     my_obj = port_module()
@@ -518,8 +551,7 @@ def test_module_error_add_broadcast_domain_ports_rest(mock_request, patch_ansibl
     set_module_args(args)
     mock_request.side_effect = [
         SRR['is_rest_9_8'],                # get version
-        SRR['port_detail_e0b'],
-        SRR['port_detail_e0d'],
+        SRR['port_detail_e0b_e0d'],        # get e0b and e0d in a single query
         SRR['broadcast_domain_record1'],   # get
         SRR['generic_error'],              # Error in adding ports
     ]
@@ -540,8 +572,7 @@ def test_module_error_remove_broadcast_domain_ports_rest(mock_request, patch_ans
     set_module_args(args)
     mock_request.side_effect = [
         SRR['is_rest_9_8'],                # get version
-        SRR['port_detail_e0b'],
-        SRR['port_detail_e0d'],
+        SRR['port_detail_e0b_e0d'],        # get e0b and e0d in a single query
         SRR['broadcast_domain_record'],    # get
         SRR['generic_error'],              # Error in removing ports
     ]
@@ -661,10 +692,8 @@ def test_add_portset_port_mixed_rest(mock_request, patch_ansible):
     set_module_args(args)
     mock_request.side_effect = [
         SRR['is_rest'],                    # get version
-        SRR['lif_svm3_856'],               # get lif_svm3_856 in ip
-        SRR['zero_record'],                # lif_svm3_856 not found in fc
-        SRR['zero_record'],                # lif_svm3_681_1 not found in ip
-        SRR['lif_svm3_681_1'],             # get lif_svm3_681_1 in fc
+        SRR['lif_svm3_856'],               # get lif_svm3_856 in ip, lif_svm3_681_1 not found
+        SRR['lif_svm3_681_1'],             # get lif_svm3_681_1 in fc, lif_svm3_856 not found
         SRR['mixedps'],                    # get portset
         SRR['empty_good'],                 # Add both ip and fc to mixed portset
         SRR['end_of_sequence']
@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, print_function)
 
 __metaclass__ = type
 
+import json
 import pytest
 import sys
 
@@ -15,7 +16,7 @@ from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import call_main, create_module, \
     expect_and_capture_ansible_exception, patch_ansible, create_and_apply, assert_warning_was_raised, print_warnings
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import \
-    patch_request_and_invoke, register_responses
+    patch_request_and_invoke, register_responses, get_mock_record
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
 
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_rest_info \
@@ -1334,3 +1335,250 @@ def test_private_cli_fields():
     assert my_obj.private_cli_fields('support/autosupport/check') == 'node,corrective-action,status,error-detail,check-type,check-category'
     my_obj.parameters['fields'] = ['f1', 'f2']
     assert my_obj.private_cli_fields('private/cli/vserver/security/file-directory') == 'f1,f2'
+
+
+def test_parallelism_keeps_subset_order():
+    args = set_default_args()
+    args['gather_subset'] = ['svm/svms', 'storage/volumes', 'cluster/nodes', 'storage/aggregates', 'network/ip/interfaces']
+    args['parallelism'] = 3
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+    ] + [('GET', '*', SRR['get_subset_info'])] * 5)
+    my_obj = create_module(ontap_rest_info_module, args)
+    assert my_obj.rest_api.pool_maxsize == 3
+    info = expect_and_capture_ansible_exception(my_obj.apply, 'exit')
+    assert list(info['ontap_info']) == args['gather_subset']
+    for subset in args['gather_subset']:
+        assert info['ontap_info'][subset]['num_records'] == 3
+
+
+def test_parallelism_error_reported_in_subset_order():
+    args = set_default_args()
+    args['gather_subset'] = ['svm/svms', 'bad/subset', 'storage/volumes']
+    args['parallelism'] = 3
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', '*', SRR['get_subset_info']),
+        ('GET', '*', SRR['get_subset_info']),
+    ])
+    msg = create_and_apply(ontap_rest_info_module, args, fail=True)['msg']
+    assert msg.startswith('Specified subset bad/subset is not found')
+
+
+def test_parallelism_with_ignore_api_errors():
+    args = set_default_args()
+    args['gather_subset'] = ['storage/luns', 'svm/svms']
+    args['parallelism'] = 2
+    args['ignore_api_errors'] = ['Expected error']
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', '*', SRR['error_record']),
+        ('GET', '*', SRR['error_record']),
+    ])
+    info = create_and_apply(ontap_rest_info_module, args)
+    assert info['ontap_info']['storage/luns']['error']['message'] == 'Expected error'
+    assert info['ontap_info']['svm/svms']['error']['message'] == 'Expected error'
+
+
+def test_negative_parallelism():
+    args = set_default_args()
+    args['parallelism'] = 0
+    msg = 'Error: parallelism must be greater than or equal to 1, got: 0.'
+    assert create_module(ontap_rest_info_module, args, fail=True)['msg'] == msg
+
+
+@patch('ansible_collections.netapp.ontap.plugins.modules.na_ontap_rest_info.HAS_FUTURES', False)
+def test_parallelism_without_futures():
+    args = set_default_args()
+    args['parallelism'] = 4
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+    ])
+    my_obj = create_module(ontap_rest_info_module, args)
+    assert my_obj.parameters['parallelism'] == 1
+    assert_warning_was_raised('parallelism requires python 3, fetching subsets one at a time.')
+
+
+def test_metrics_are_reported():
+    args = set_args_get_all_records_for_volume_info_to_check_next_api_call_functionality_pass()
+    args['feature_flags'] = {'collect_metrics': True}
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'storage/volumes', SRR['get_subset_info']),
+    ])
+    assert 'metrics' in create_and_apply(ontap_rest_info_module, args)
+
+
+def test_get_all_records_with_max_records_auto_tune():
+    args = set_args_get_all_records_for_volume_info_to_check_next_api_call_functionality_pass()
+    args['max_records_auto_tune'] = True
+    args['prefetch_next_page'] = False
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'storage/volumes', SRR['get_subset_info_with_next']),
+        ('GET', '/next_record_api', SRR['get_subset_info_with_next']),
+        ('GET', '*', SRR['get_next_record']),
+    ])
+    assert create_and_apply(ontap_rest_info_module, args)['ontap_info']['storage/volumes']['num_records'] == 8
+    # once a page was read, max_records is added to the next link, and is at least 3 (max_records) and at most 6 (2 * max_records)
+    api = get_mock_record('test_get_all_records_with_max_records_auto_tune').get_request(3)['api']
+    assert api.startswith('/next_record_api?max_records=')
+    assert 3 <= int(api.split('=')[1]) <= 6
+
+
+@patch('ansible_collections.netapp.ontap.plugins.module_utils.rest_generic.get_next_pages')
+def test_prefetch_next_page_defaults_to_output_file(mock_get_next_pages):
+    args = set_args_get_all_records_for_volume_info_to_check_next_api_call_functionality_pass()
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+    ])
+    my_obj = create_module(ontap_rest_info_module, args)
+    my_obj.get_next_pages('storage/volumes', {})
+    assert mock_get_next_pages.call_args[1]['prefetch'] is False
+    my_obj.writer = 'writer'
+    my_obj.get_next_pages('storage/volumes', {})
+    assert mock_get_next_pages.call_args[1]['prefetch'] is True
+    my_obj = create_module(ontap_rest_info_module, dict(args, prefetch_next_page=True))
+    my_obj.get_next_pages('storage/volumes', {})
+    assert mock_get_next_pages.call_args[1]['prefetch'] is True
+    my_obj = create_module(ontap_rest_info_module, dict(args, prefetch_next_page=False))
+    my_obj.writer = 'writer'
+    my_obj.get_next_pages('storage/volumes', {})
+    assert mock_get_next_pages.call_args[1]['prefetch'] is False
+
+
+def test_output_file(tmp_path):
+    output_file = str(tmp_path / 'inventory.ndjson')
+    args = set_args_get_all_records_for_volume_info_to_check_next_api_call_functionality_pass()
+    args['gather_subset'] = ['cluster', 'volume_info', 'storage/luns']
+    args['output_file'] = output_file
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'storage/volumes', SRR['get_subset_info_with_next']),
+        ('GET', '/next_record_api', SRR['get_next_record']),
+        ('GET', 'storage/luns', SRR['lun_info']),
+    ])
+    info = create_and_apply(ontap_rest_info_module, args)
+    assert info['output_file'] == output_file
+    # subsets without records are still reported
+    assert info['ontap_info']['cluster']['version']['full'] == 'dummy_9_10_1'
+    assert info['ontap_info']['storage/volumes'] == {'num_records': 5, 'output_file': output_file}
+    assert info['ontap_info']['storage/luns'] == {'num_records': 1, 'output_file': output_file}
+    with open(output_file) as afile:
+        lines = [json.loads(line) for line in afile]
+    assert [line['subset'] for line in lines] == ['storage/volumes'] * 5 + ['storage/luns']
+    assert [line['record']['name'] for line in lines[:5]] == ['dummy_vol1', 'dummy_vol2', 'dummy_vol3', 'dummy_vol1', 'dummy_vol2']
+    assert lines[5]['record']['naa_id'] == 'naa.600a0980' + '7a364363442b534b356d5062'
+
+
+def test_output_file_error_on_next_page(tmp_path):
+    args = set_args_get_all_records_for_volume_info_to_check_next_api_call_functionality_pass()
+    args['output_file'] = str(tmp_path / 'inventory.ndjson')
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'storage/volumes', SRR['get_subset_info_with_next']),
+        ('GET', '/next_record_api', SRR['generic_error']),
+    ])
+    assert create_and_apply(ontap_rest_info_module, args, fail=True)['msg'] == 'Expected error'
+
+
+def test_negative_output_file(tmp_path):
+    args = set_args_get_all_records_for_volume_info_to_check_next_api_call_functionality_pass()
+    args['output_file'] = str(tmp_path / 'no_such_dir' / 'inventory.ndjson')
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+    ])
+    msg = create_and_apply(ontap_rest_info_module, args, fail=True)['msg']
+    assert msg.startswith('Error: cannot open output_file %s: ' % args['output_file'])
+
+
+def test_continue_on_error():
+    args = set_default_args()
+    args['gather_subset'] = ['svm/svms', 'bad/subset', 'storage/volumes', 'cluster/nodes']
+    args['continue_on_error'] = True
+    args['use_python_keys'] = True
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'svm/svms', SRR['get_subset_info']),
+        ('GET', 'storage/volumes', SRR['error_user_is_not_authorized']),
+        ('GET', 'cluster/nodes', SRR['get_subset_info']),
+    ])
+    info = create_and_apply(ontap_rest_info_module, args)
+    assert info['ontap_info']['svm_svms']['num_records'] == 3
+    assert info['ontap_info']['cluster_nodes']['num_records'] == 3
+    assert info['ontap_info']['bad_subset']['error'].startswith('Specified subset bad/subset is not found')
+    assert info['ontap_info']['storage_volumes'] == {'error': 'Error: username user is not authorized to make storage/volumes api call'}
+    status = info['subset_status']
+    assert list(status) == ['svm_svms', 'bad_subset', 'storage_volumes', 'cluster_nodes']
+    assert status['svm_svms']['status'] == 'success'
+    assert status['svm_svms']['num_records'] == 3
+    assert 'elapsed' in status['svm_svms']
+    assert status['bad_subset']['status'] == 'error'
+    assert status['storage_volumes']['error'] == 'Error: username user is not authorized to make storage/volumes api call'
+    assert_warning_was_raised('Errors fetching subsets: bad/subset, storage/volumes.  See subset_status for details.')
+
+
+def test_continue_on_error_with_parallelism_and_ignore_api_errors():
+    args = set_default_args()
+    args['gather_subset'] = ['storage/luns', 'svm/svms']
+    args['parallelism'] = 2
+    args['ignore_api_errors'] = ['Expected error']
+    args['continue_on_error'] = True
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', '*', SRR['error_record']),
+        ('GET', '*', SRR['get_subset_info']),
+    ])
+    info = create_and_apply(ontap_rest_info_module, args)
+    statuses = sorted(status['status'] for status in info['subset_status'].values())
+    assert statuses == ['error', 'success']
+
+
+@patch('ansible_collections.netapp.ontap.plugins.modules.na_ontap_rest_info.time')
+def test_subset_timeout(mock_time):
+    args = set_args_get_all_records_for_volume_info_to_check_next_api_call_functionality_pass()
+    args['gather_subset'] = ['volume_info', 'svm/svms']
+    args['prefetch_next_page'] = False
+    args['subset_timeout'] = 10
+    args['continue_on_error'] = True
+    # start, first next page, second next page, elapsed, then the same for svm/svms
+    mock_time.time.side_effect = [0, 5, 20, 21, 30, 31]
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'storage/volumes', SRR['get_subset_info_with_next']),
+        ('GET', '/next_record_api', SRR['get_subset_info_with_next']),
+        ('GET', '/next_record_api', SRR['get_subset_info_with_next']),
+        ('GET', 'svm/svms', SRR['get_subset_info']),
+    ])
+    my_obj = create_module(ontap_rest_info_module, args)
+    assert my_obj.rest_api.timeout == 10
+    info = expect_and_capture_ansible_exception(my_obj.apply, 'exit')
+    assert info['ontap_info']['storage/volumes'] == {'error': 'Error: timeout after 10 seconds while fetching storage/volumes.'}
+    assert info['subset_status']['storage/volumes'] == {'status': 'timeout', 'elapsed': 21, 'error': info['ontap_info']['storage/volumes']['error']}
+    assert info['subset_status']['svm/svms'] == {'status': 'success', 'elapsed': 1, 'num_records': 3}
+
+
+@patch('ansible_collections.netapp.ontap.plugins.modules.na_ontap_rest_info.time')
+def test_subset_timeout_fails_without_continue_on_error(mock_time):
+    args = set_args_get_all_records_for_volume_info_to_check_next_api_call_functionality_pass()
+    args['prefetch_next_page'] = False
+    args['subset_timeout'] = 10
+    mock_time.time.side_effect = [0, 20]
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'storage/volumes', SRR['get_subset_info_with_next']),
+        ('GET', '/next_record_api', SRR['get_subset_info_with_next']),
+    ])
+    error = create_and_apply(ontap_rest_info_module, args, fail=True)
+    assert error['msg'] == 'Error: timeout after 10 seconds while fetching storage/volumes.'
+    assert error['subset_timeout'] == 10
+
+
+def test_negative_subset_timeout():
+    args = set_default_args()
+    args['subset_timeout'] = 0
+    msg = 'Error: subset_timeout must be greater than or equal to 1, got: 0.'
+    assert create_module(ontap_rest_info_module, args, fail=True)['msg'] == msg
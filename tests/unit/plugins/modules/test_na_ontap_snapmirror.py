@@ -10,7 +10,7 @@ import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_ut
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
     assert_no_warnings, assert_warning_was_raised, expect_and_capture_ansible_exception, call_main, create_module, patch_ansible, print_warnings
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import\
-    patch_request_and_invoke, register_responses
+    get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_error_message, rest_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_response, zapi_responses
 
@@ -44,6 +44,8 @@ DEFAULT_ARGS = {
     "relationship_type": "extended_data_protection"
 }
 
+WAIT_ARGS = dict((key, DEFAULT_ARGS[key]) for key in ('hostname', 'username', 'password', 'https', 'validate_certs'))
+
 
 def sm_rest_info(state, healthy, transfer_state=None, policy_type=None, destination_path=DEFAULT_ARGS['destination_path']):
     record = {
@@ -1866,6 +1868,158 @@ def test_wait_for_quiesced_status(dont_sleep):
     assert 'Taking a long time to quiesce SnapMirror relationship after 60 seconds, try again later' in error['msg']
 
 
+@patch('time.sleep')
+def test_wait_for_idle_status_adaptive(dont_sleep):
+    # only state and transfer state are fetched, the delay is doubled from the initial interval
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_96']),
+        ('GET', 'snapmirror/relationships', SRR['sm_get_uninitialized_xfering']),
+        ('GET', 'snapmirror/relationships', SRR['sm_get_uninitialized_xfering']),
+        ('GET', 'snapmirror/relationships', SRR['sm_get_mirrored']),
+    ])
+    module_args = {
+        "use_rest": "always",
+        "transferring_time_out": 60,
+        "feature_flags": {'snapmirror_wait_initial_interval': 1},
+    }
+    my_obj = create_module(my_module, DEFAULT_ARGS, module_args)
+    assert my_obj.wait_for_idle_status() == {'mirror_state': 'snapmirrored', 'status': 'success'}
+    assert my_obj.parameters['current_mirror_state'] == 'snapmirrored'
+    assert [call[0][0] for call in dont_sleep.call_args_list] == [1, 2, 4]
+    assert get_mock_record().get_request(1)['params'] == {'destination.path': 'svmdst3:voldst1', 'fields': 'state,transfer.state,destination.path'}
+    assert list(my_obj.get_wait_intervals(10, 60)) == [1, 2, 4, 8, 10, 10, 10, 10, 10]
+    my_obj.module.params['feature_flags'] = {}
+    assert list(my_obj.get_wait_intervals(30, 300)) == [30] * 10
+
+
+def sm_rest_records(*records):
+    return (200, {'records': [sm_rest_info(*record)['records'][0] for record in records], 'num_records': len(records)}, None)
+
+
+@patch('time.sleep')
+def test_wait_for_relationships(dont_sleep):
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('paused', True, 'success', None, 'svm:vol1'),
+                                                            ('snapmirrored', True, 'success', None, 'svm:vol2'),
+                                                            ('paused', True, 'success', None, 'svm:vol3'))),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('snapmirrored', True, 'success', None, 'svm:vol2'))),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('paused', True, 'success', None, 'svm:vol2'))),
+    ])
+    module_args = {
+        "use_rest": "always",
+        "wait_for_relationships": {'destination_paths': ['svm:vol1', 'svm:vol2', 'svm:vol3'], 'status': 'quiesced'},
+    }
+    result = call_main(my_main, WAIT_ARGS, module_args)
+    assert not result['changed']
+    assert result['relationships']['svm:vol2'] == {'mirror_state': 'paused', 'status': 'success'}
+    assert get_mock_record().get_request(1)['params']['destination.path'] == 'svm:vol1|svm:vol2|svm:vol3'
+    assert get_mock_record().get_request(3)['params']['destination.path'] == 'svm:vol2'
+    assert dont_sleep.call_count == 2
+
+
+@patch('time.sleep')
+def test_wait_for_relationships_errors(dont_sleep):
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('paused', True, 'success', None, 'svm:vol1'))),
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('snapmirrored', True, 'transferring', None, 'svm:vol1'))),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('snapmirrored', True, 'transferring', None, 'svm:vol1'))),
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('snapmirrored', True, 'success', None, 'svm:vol1'))),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('snapmirrored', True, 'success', None, 'svm:vol1'))),
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', SRR['generic_error']),
+    ])
+    module_args = {
+        "use_rest": "always",
+        "wait_for_relationships": {'destination_paths': ['svm:vol1', 'svm:vol2']},
+    }
+    error = 'Error: SnapMirror relationships not found for destination paths: svm:vol2'
+    assert error == call_main(my_main, WAIT_ARGS, module_args, fail=True)['msg']
+    module_args['wait_for_relationships']['destination_paths'] = ['svm:vol1']
+    module_args['transferring_time_out'] = 30
+    assert call_main(my_main, WAIT_ARGS, module_args)['relationships']['svm:vol1']['status'] == 'transferring'
+    assert_warning_was_raised('SnapMirror relationships are still transferring after 30 seconds: svm:vol1')
+    module_args['wait_for_relationships']['status'] = 'quiesced'
+    module_args['quiesced_time_out'] = 10
+    error = 'Taking a long time to quiesce SnapMirror relationships after 10 seconds, try again later: svm:vol1'
+    assert error == call_main(my_main, WAIT_ARGS, module_args, fail=True)['msg']
+    error = rest_error_message('Error getting SnapMirror svm:vol1', 'snapmirror/relationships')
+    assert error == call_main(my_main, WAIT_ARGS, module_args, fail=True)['msg']
+    module_args['use_rest'] = 'never'
+    error = 'Error: The option wait_for_relationships is supported only with REST.'
+    assert error == call_main(my_main, WAIT_ARGS, module_args, fail=True)['msg']
+
+
+def test_wait_for_relationships_rejects_actions():
+    module_args = {
+        "use_rest": "always",
+        "wait_for_relationships": {'destination_paths': ['svm:vol1']},
+    }
+    error = 'parameters are mutually exclusive: wait_for_relationships|source_path, wait_for_relationships|destination_path'
+    assert error in call_main(my_main, DEFAULT_ARGS, module_args, fail=True)['msg']
+    error = 'Error: wait_for_relationships only waits, it cannot be used with state: absent or relationship_state: broken.'
+    assert error == call_main(my_main, WAIT_ARGS, dict(module_args, state='absent'), fail=True)['msg']
+    assert error == call_main(my_main, WAIT_ARGS, dict(module_args, relationship_state='broken'), fail=True)['msg']
+
+
+@patch('time.sleep')
+def test_wait_for_relationships_path_case(dont_sleep):
+    ''' ONTAP may report the destination path with a different case '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', sm_rest_records(('paused', True, 'success', None, 'SVM:vol1'))),
+    ])
+    module_args = {
+        "use_rest": "always",
+        "wait_for_relationships": {'destination_paths': ['svm:vol1'], 'status': 'quiesced'},
+    }
+    result = call_main(my_main, WAIT_ARGS, module_args)
+    assert result['relationships'] == {'svm:vol1': {'mirror_state': 'paused', 'status': 'success'}}
+    assert dont_sleep.call_count == 0
+
+
+@patch('ansible_collections.netapp.ontap.plugins.module_utils.rest_generic.delete_async')
+@patch('time.sleep')
+def test_rest_snapmirror_delete_timeout(dont_sleep, mock_delete):
+    ''' when the delete job is still running, wait for the relationship to be gone rather than sending the request again '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', SRR['sm_get_mirrored']),
+        ('GET', 'snapmirror/relationships', SRR['zero_records']),
+        ('GET', 'snapmirror/relationships', SRR['generic_error']),
+    ])
+    module_args = {
+        "use_rest": "always",
+        "feature_flags": {'snapmirror_wait_initial_interval': 2},
+    }
+    my_obj = create_module(my_module, DEFAULT_ARGS, module_args)
+    my_obj.parameters['uuid'] = 'b5ee4571-5429-11ec-9779-005056b39a06'
+    mock_delete.return_value = None, 'Timeout error: Process still running'
+    assert my_obj.snapmirror_delete_rest() is None
+    assert mock_delete.call_count == 1
+    assert [call[0][0] for call in dont_sleep.call_args_list] == [2, 4]
+    # the relationship is looked up by uuid, not by destination path
+    assert get_mock_record().get_request(1)['params'] == {'uuid': 'b5ee4571-5429-11ec-9779-005056b39a06', 'fields': 'state,transfer.state'}
+    error = rest_error_message('Error getting SnapMirror b5ee4571-5429-11ec-9779-005056b39a06', 'snapmirror/relationships')
+    assert error == expect_and_capture_ansible_exception(my_obj.wait_for_deleted_status, 'fail', 'b5ee4571-5429-11ec-9779-005056b39a06', 10)['msg']
+
+
+def test_wait_initial_interval_must_be_positive():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+    ])
+    module_args = {
+        "use_rest": "always",
+        "feature_flags": {'snapmirror_wait_initial_interval': 0},
+    }
+    my_obj = create_module(my_module, DEFAULT_ARGS, module_args)
+    error = 'Error: snapmirror_wait_initial_interval must be greater than 0, got: 0'
+    assert error == expect_and_capture_ansible_exception(list, 'fail', my_obj.get_wait_intervals(10, 60))['msg']
+
+
 @pytest.mark.skipif(not netapp_utils.has_netapp_lib(), reason="skipping as missing required netapp_lib")
 def test_dp_to_xdp():
     # with ZAPI, DP is transformed to XDP to match ONTAP behavior
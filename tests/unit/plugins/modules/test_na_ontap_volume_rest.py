@@ -8,6 +8,7 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import copy
+import json
 import pytest
 import sys
 
@@ -18,11 +19,12 @@ from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mo
     assert_no_warnings, assert_warning_was_raised, print_warnings, call_main, create_and_apply, \
     create_module, expect_and_capture_ansible_exception, patch_ansible
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import\
-    patch_request_and_invoke, register_responses
+    get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
 
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_volume \
     import NetAppOntapVolume as volume_module, main as my_main      # module under test
+from ansible_collections.netapp.ontap.plugins.modules.na_ontap_volume import REST_BASE_FIELDS, REST_FIELDS_FOR_OPTIONS
 
 if not netapp_utils.HAS_REQUESTS and sys.version_info < (2, 7):
     pytestmark = pytest.mark.skip('Skipping Unit Tests on 2.6 as requests is not available')
@@ -201,6 +203,12 @@ SRR = rest_responses({
     'get_volume_ar_disable_in_progress': (200, {'records': [volume_info_ar_disable_in_progress]}, None),
     'get_volume_ar_enabled': (200, {'records': [volume_info_ar_enabled]}, None),
     'get_volume_ar_paused': (200, {'records': [volume_info_ar_paused]}, None),
+    'modify_job': (202, {'job': {'uuid': 'job1', '_links': {'self': {'href': '/api/cluster/jobs/job1'}}}}, None),
+    'efficiency_job': (202, {'job': {'uuid': 'job2', '_links': {'self': {'href': '/api/cluster/jobs/job2'}}}}, None),
+    'jobs_running': (200, {'records': [{'uuid': 'job1', 'state': 'success'}, {'uuid': 'job2', 'state': 'running'}], 'num_records': 2}, None),
+    'jobs_success': (200, {'records': [{'uuid': 'job2', 'state': 'success'}], 'num_records': 1}, None),
+    'jobs_failure': (200, {'records': [{'uuid': 'job1', 'state': 'failure', 'message': 'modify failed'},
+                                       {'uuid': 'job2', 'state': 'success'}], 'num_records': 2}, None),
 })
 
 DEFAULT_APP_ARGS = {
@@ -297,6 +305,26 @@ def test_rest_successfully_created():
     assert create_and_apply(volume_module, DEFAULT_APP_ARGS)['changed']
 
 
+def test_rest_successfully_created_with_spans(tmp_path):
+    trace_file = tmp_path / 'spans.json'
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR['no_record']),               # Get Volume
+        ('GET', 'svm/svms', SRR['one_svm_record']),                 # GET svm
+        ('GET', 'application/applications', SRR['no_record']),      # GET application/applications
+        ('POST', 'application/applications', SRR['empty_good']),    # POST application/applications
+        ('GET', 'storage/volumes', SRR['get_volume']),
+    ])
+    module_args = {'feature_flags': {'trace_spans_file': str(trace_file)}}
+    assert create_and_apply(volume_module, DEFAULT_APP_ARGS, module_args)['changed']
+    netapp_utils.TRACER.flush()
+    with open(str(trace_file)) as lines:
+        spans = json.loads(lines.read())['resourceSpans'][0]['scopeSpans'][0]['spans']
+    # send_request is mocked, only the root span and the module phases are recorded
+    assert [span['name'] for span in spans[1:]] == ['volume.get', 'volume.create', 'volume.get']
+    assert all(span['parentSpanId'] == spans[0]['spanId'] for span in spans[1:])
+
+
 def test_rest_create_idempotency():
     register_responses([
         ('GET', 'cluster', SRR['is_rest']),
@@ -341,6 +369,32 @@ def test_rest_successfully_resized():
     assert create_and_apply(volume_module, DEFAULT_APP_ARGS, module_args)['changed']
 
 
+def test_rest_get_volume_minimal_fields():
+    ''' only the fields for the options in the playbook are requested '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR['get_volume']),
+        ('PATCH', 'storage/volumes/7882901a-1aef-11ec-a267-005056b30cfa', SRR['empty_good']),
+    ])
+    module_args = {'comment': 'new comment'}
+    assert create_and_apply(volume_module, DEFAULT_VOLUME_ARGS, module_args)['changed']
+    fields = get_mock_record().get_request(1)['params']['fields'].split(',')
+    assert sorted(fields) == fields
+    assert set(fields) == set(REST_BASE_FIELDS + ('aggregates.name', 'aggregates.uuid', 'comment'))
+
+
+def test_rest_fields_for_options_cover_current():
+    ''' any option reported in current is mapped to the REST fields required to report it '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+    ])
+    my_obj = create_module(volume_module, DEFAULT_VOLUME_ARGS)
+    assert set(REST_FIELDS_FOR_OPTIONS).issubset(my_obj.argument_spec)
+    # these keys are computed from the base fields, or are not options
+    derived = ('aggregates', 'flexgroup_uuid', 'instance_uuid', 'is_online', 'junction_path', 'name', 'size', 'style_extended', 'type', 'uuid')
+    assert set(my_obj.format_get_volume_rest({})) - set(derived) == set(REST_FIELDS_FOR_OPTIONS) - set(['nas_application_template'])
+
+
 def test_rest_volume_create_modify_tags():
     ''' volume create, modify with tags
     '''
@@ -1117,6 +1171,58 @@ def test_rest_successfully_modify_volume_inline_compression():
     assert create_and_apply(volume_module, DEFAULT_VOLUME_ARGS, module_args)['changed']
 
 
+@patch('time.sleep')
+def test_rest_successfully_modify_volume_with_concurrent_jobs(mock_sleep):
+    ''' the attributes and efficiency PATCH requests are sent together, then the jobs are polled together '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR['get_volume_encrypt_off']),                              # Get Volume
+        ('PATCH', 'storage/volumes/7882901a-1aef-11ec-a267-005056b30cfa', SRR['modify_job']),   # Modify
+        ('PATCH', 'storage/volumes/7882901a-1aef-11ec-a267-005056b30cfa', SRR['efficiency_job']),   # efficiency
+        ('GET', 'cluster/jobs', SRR['jobs_running']),
+        ('GET', 'cluster/jobs', SRR['jobs_success']),
+        ('PATCH', 'storage/volumes/7882901a-1aef-11ec-a267-005056b30cfa', SRR['success']),      # offline, after the other changes
+    ])
+    module_args = {
+        'comment': 'carchi8py was here',
+        'efficiency_policy': 'test',
+        'is_online': False,
+        'feature_flags': {'concurrent_jobs': True},
+    }
+    assert create_and_apply(volume_module, DEFAULT_VOLUME_ARGS, module_args)['changed']
+    assert get_mock_record().get_request(4)['params']['uuid'] == 'job1|job2'
+    assert get_mock_record().get_request(5)['params']['uuid'] == 'job2'
+
+
+def test_rest_error_modify_volume_with_concurrent_jobs():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR['get_volume_encrypt_off']),                              # Get Volume
+        ('PATCH', 'storage/volumes/7882901a-1aef-11ec-a267-005056b30cfa', SRR['modify_job']),   # Modify
+        ('PATCH', 'storage/volumes/7882901a-1aef-11ec-a267-005056b30cfa', SRR['efficiency_job']),   # efficiency
+        ('GET', 'cluster/jobs', SRR['jobs_failure']),
+    ])
+    module_args = {
+        'comment': 'carchi8py was here',
+        'efficiency_policy': 'test',
+        'feature_flags': {'concurrent_jobs': True},
+    }
+    msg = 'Error modifying volume test_svm: job reported error: modify failed'
+    assert create_and_apply(volume_module, DEFAULT_VOLUME_ARGS, module_args, fail=True)['msg'].startswith(msg)
+
+
+def test_rest_concurrent_jobs_are_not_used_with_resize():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'cluster', SRR['is_rest']),
+    ])
+    my_obj = create_module(volume_module, DEFAULT_VOLUME_ARGS, {'feature_flags': {'concurrent_jobs': True}})
+    assert my_obj.get_job_tracker({'comment': 'x'}) is not None
+    assert my_obj.get_job_tracker({'comment': 'x', 'size': 10}) is None
+    my_obj = create_module(volume_module, DEFAULT_VOLUME_ARGS)
+    assert my_obj.get_job_tracker({'comment': 'x'}) is None
+
+
 def test_rest_error_modify_volume_efficiency_policy():
     register_responses([
         ('GET', 'cluster', SRR['is_rest']),